@@ -0,0 +1,245 @@
+"""
+Gemini 요청 동시성 자동 조절 (AIMD)
+모든 generate_content 호출이 동시에 진행할 수 있는 요청 수(한도)를 응답 상태에 따라 조절합니다.
+- 응답이 정상 지연 시간 안에 오면 한도를 천천히 올립니다 (한도만큼 성공할 때마다 +1).
+- 429(할당량 초과)나 5xx를 받으면 한도를 절반으로, 지연 시간이 기준의 LATENCY_TOLERANCE배를
+  넘으면 LATENCY_BACKOFF배로 줄입니다. 한 번 줄인 뒤에는 그 이전에 시작한 요청의 결과로 다시 줄이지 않습니다.
+
+기준 지연 시간은 system_instruction(요청 종류)별 최근 지연 시간의 하위 BASELINE_PERCENTILE 백분위입니다.
+생성 요청과 개선 요청처럼 응답 길이가 다른 호출이 서로의 기준을 흐리지 않도록 따로 계산합니다.
+
+429를 받은 요청은 줄어든 한도 아래에서 RETRIES번까지 다시 보냅니다.
+현재 한도와 조절 기록은 stats()/print_stats()로 확인할 수 있습니다.
+"""
+
+import threading
+import time
+from collections import deque
+
+from gemini_pool import error_code
+
+INITIAL_LIMIT = 4
+MIN_LIMIT = 1
+MAX_LIMIT = 16
+BACKOFF = 0.5  # 429/5xx를 받았을 때 한도에 곱하는 값
+LATENCY_BACKOFF = 0.75  # 지연 시간이 급증했을 때 한도에 곱하는 값
+LATENCY_TOLERANCE = 2.0  # 기준 지연 시간의 몇 배부터 급증으로 볼지
+MIN_LATENCY_SPIKE = 0.25  # 급증으로 보려면 기준보다 최소 몇 초 늦어야 하는지 (짧은 호출의 잡음 무시)
+BASELINE_PERCENTILE = 20
+LATENCY_WINDOW = 50
+MIN_SAMPLES = 5  # 종류별 표본이 이만큼 모이기 전에는 지연 시간으로 한도를 줄이지 않음
+DECISION_LOG = 200
+RETRIES = 2
+RETRY_DELAY = 1.0  # 429 재시도 전 대기 시간(초), 재시도마다 늘어남
+SERVER_ERROR_CODES = {500, 502, 503, 504}
+
+
+def percentile(values, pct):
+    """values의 pct 백분위 값 (nearest-rank 방식)"""
+    values = sorted(values)
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+class AdaptiveLimiter:
+    """AIMD 방식으로 동시 요청 한도를 조절하는 세마포어"""
+
+    def __init__(self, initial_limit=INITIAL_LIMIT, min_limit=MIN_LIMIT, max_limit=MAX_LIMIT,
+                 clock=time.monotonic):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._latencies = {}  # 요청 종류 → 최근 지연 시간
+        self._epoch = 0  # 한도를 줄일 때마다 증가
+        self._start = clock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.peak_limit = int(self.limit)
+        self.calls = 0
+        self.increases = 0
+        self.errors = {'throttled': 0, 'server_error': 0}  # 응답 수 (한도를 줄이지 않은 응답 포함)
+        self.decreases = {'throttled': 0, 'server_error': 0, 'latency': 0}
+        self.decisions = deque(maxlen=DECISION_LOG)
+
+    @property
+    def fixed(self):
+        return self.min_limit == self.max_limit
+
+    def acquire(self):
+        """빈 자리가 날 때까지 기다렸다가 요청 하나를 시작합니다. release()에 넘길 토큰을 반환합니다."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            self.calls += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            # 한도를 다 쓰고 있을 때만 한도를 올림 (요청이 적어서 여유가 있는 동안 한도만 커지지 않도록)
+            saturated = self.in_flight >= int(self.limit)
+            return self._epoch, saturated
+
+    def release(self, token, latency=None, kind=None, code=None):
+        """요청 하나를 끝내고 결과에 따라 한도를 조절합니다. 실패한 요청은 latency=None으로 넘깁니다."""
+        epoch, saturated = token
+        with self._cond:
+            self.in_flight -= 1
+            if code == 429 or code in SERVER_ERROR_CODES:
+                reason = 'throttled' if code == 429 else 'server_error'
+                self.errors[reason] += 1
+                self._decrease(epoch, BACKOFF, reason)
+            elif latency is not None:
+                samples = self._latencies.setdefault(kind, deque(maxlen=LATENCY_WINDOW))
+                baseline = percentile(samples, BASELINE_PERCENTILE) if len(samples) >= MIN_SAMPLES else None
+                samples.append(latency)
+                if (baseline is not None and latency > baseline * LATENCY_TOLERANCE
+                        and latency - baseline > MIN_LATENCY_SPIKE):
+                    self._decrease(epoch, LATENCY_BACKOFF, 'latency')
+                elif saturated:
+                    self._increase()
+            self._cond.notify_all()
+
+    def _increase(self):
+        before = int(self.limit)
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        if int(self.limit) > before:
+            self.increases += 1
+            self.peak_limit = max(self.peak_limit, int(self.limit))
+            self._log('increase', 'healthy', before)
+
+    def _decrease(self, epoch, factor, reason):
+        # 한도를 줄이기 전에 시작한 요청은 이미 반영된 혼잡의 결과이므로 무시
+        if epoch != self._epoch:
+            return
+        before = int(self.limit)
+        self.limit = max(self.min_limit, self.limit * factor)
+        if int(self.limit) < before:
+            self._epoch += 1
+            self.decreases[reason] += 1
+            self._log('decrease', reason, before)
+
+    def _log(self, action, reason, before):
+        self.decisions.append({'time': round(self.clock() - self._start, 3), 'action': action,
+                               'reason': reason, 'from': before, 'to': int(self.limit)})
+
+    def baseline(self, kind=None):
+        """요청 종류별 기준 지연 시간(초). 표본이 부족하면 None."""
+        with self._cond:
+            samples = self._latencies.get(kind)
+            if not samples or len(samples) < MIN_SAMPLES:
+                return None
+            return percentile(samples, BASELINE_PERCENTILE)
+
+    def stats(self):
+        """현재 한도, 동시 요청 수, 조절 횟수와 기록을 반환합니다."""
+        with self._cond:
+            return {
+                'limit': int(self.limit),
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'peak_limit': self.peak_limit,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'calls': self.calls,
+                'increases': self.increases,
+                'errors': dict(self.errors),
+                'decreases': dict(self.decreases),
+                'decisions': list(self.decisions),
+            }
+
+
+class AdaptiveModel:
+    """model.generate_content 호출을 AdaptiveLimiter로 제한하는 model 호환 래퍼
+
+    HedgedModel로 감쌀 때는 이 래퍼를 안쪽에 두어 추가 요청도 한도 안에서 보내도록 합니다.
+    """
+
+    def __init__(self, model, limiter=None, retries=RETRIES, retry_delay=RETRY_DELAY):
+        self.model = model
+        self.limiter = limiter or AdaptiveLimiter()
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.retried = 0
+
+    @property
+    def model_name(self):
+        return getattr(self.model, 'model_name', None)
+
+    def generate_content(self, *args, **kwargs):
+        kind = kwargs.get('system_instruction')
+        attempt = 0
+        while True:
+            token = self.limiter.acquire()
+            # 자리를 기다린 시간은 빼고 실제 호출 시간만 잼
+            start = time.perf_counter()
+            try:
+                response = self.model.generate_content(*args, **kwargs)
+            except Exception as e:
+                code = error_code(e)
+                self.limiter.release(token, kind=kind, code=code)
+                if code != 429 or attempt >= self.retries:
+                    raise
+                attempt += 1
+                self.retried += 1
+                time.sleep(self.retry_delay * attempt)
+                continue
+            self.limiter.release(token, latency=time.perf_counter() - start, kind=kind)
+            return response
+
+    def stats(self):
+        return {**self.limiter.stats(), 'retries': self.retried}
+
+    def print_stats(self):
+        s = self.stats()
+        decreases = s['decreases']
+        errors = f"429 응답 {s['errors']['throttled']}회, 서버 오류 {s['errors']['server_error']}회, 429 재시도 {s['retries']}회"
+        if self.limiter.fixed:
+            print(f"\n🚦 동시성: 호출 {s['calls']}회, 고정 한도 {s['limit']}, 동시 요청 최대 {s['max_in_flight']}개, "
+                  f"{errors}")
+        else:
+            print(f"\n🚦 동시성 자동 조절: 호출 {s['calls']}회, 현재 한도 {s['limit']} "
+                  f"(최고 {s['peak_limit']}, 범위 {s['min_limit']}-{s['max_limit']}), 동시 요청 최대 {s['max_in_flight']}개")
+            print(f"  한도 증가 {s['increases']}회, 감소 {sum(decreases.values())}회 "
+                  f"(429 {decreases['throttled']}회, 서버 오류 {decreases['server_error']}회, "
+                  f"지연 급증 {decreases['latency']}회) / {errors}")
+            decisions = s['decisions'][-20:]
+            if decisions:
+                steps = [str(decisions[0]['from'])] + [str(d['to']) for d in decisions]
+                prefix = '… → ' if s['increases'] + sum(decreases.values()) > len(decisions) else ''
+                print(f"  한도 변화: {prefix}{' → '.join(steps)}")
+        if hasattr(self.model, 'print_stats'):
+            self.model.print_stats()
+
+
+def parse_concurrency(value):
+    """--concurrency 값: 'auto'면 None(자동 조절), 숫자면 고정 한도"""
+    if str(value).lower() == 'auto':
+        return None
+    limit = int(value)
+    if limit < 1:
+        raise ValueError("동시 요청 수는 1 이상이어야 합니다.")
+    return limit
+
+
+def wrap_model(model, concurrency=None, max_limit=MAX_LIMIT):
+    """model을 AdaptiveModel로 감쌉니다. concurrency가 숫자면 한도를 그 값으로 고정합니다."""
+    if not model:
+        return model
+    if concurrency:
+        limiter = AdaptiveLimiter(concurrency, concurrency, concurrency)
+    else:
+        limiter = AdaptiveLimiter(min(INITIAL_LIMIT, max_limit), max_limit=max_limit)
+    return AdaptiveModel(model, limiter)
+
+
+def suggested_workers(model, default=1):
+    """model을 감싼 래퍼 중 AdaptiveModel이 있으면 그 한도 상한을, 없으면 default를 반환합니다.
+
+    호출하는 쪽의 스레드 수를 한도 상한에 맞추면 실제 동시 요청 수는 limiter가 정합니다.
+    """
+    for _ in range(10):
+        if isinstance(model, AdaptiveModel):
+            return model.limiter.max_limit
+        model = getattr(model, 'model', None)
+        if model is None:
+            break
+    return default
@@ -1,9 +1,16 @@
 """
 자동으로 slides.json을 사용하여 PPT를 생성하는 스크립트
+
+--watch로 실행하면 프로세스를 띄워 둔 채 slides.json과 images/ 디렉토리를 감시하고,
+바뀐 슬라이드만 다시 만들어 PPT를 곧바로 갱신합니다.
+    python auto_generate_ppt.py --watch
 """
 
+import argparse
 import json
 import os
+import re
+import time
 from pathlib import Path
 from pptx import Presentation
 from pptx.util import Inches, Pt
@@ -11,20 +18,45 @@ from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 from datetime import datetime
 
+import fs_watch
+import pptx_packaging
+
+WATCH_DEBOUNCE = 0.15  # 연속 저장을 한 번의 갱신으로 묶는 시간(초)
+_SLIDE_IMAGE = re.compile(r'slide_(\d+)\.png$')
+
+
+def slides_data_error(data):
+    """슬라이드 데이터의 구조가 올바르지 않으면 그 이유를, 올바르면 None을 반환합니다."""
+    if not isinstance(data, dict):
+        return "최상위 값이 객체가 아닙니다"
+    slides = data.get('slides', [])
+    if not isinstance(slides, list):
+        return "'slides'가 리스트가 아닙니다"
+    for i, slide_data in enumerate(slides, 1):
+        if not isinstance(slide_data, dict) or 'title' not in slide_data:
+            return f"슬라이드 {i}에 'title'이 없습니다"
+        if not isinstance(slide_data.get('content', []), list):
+            return f"슬라이드 {i}의 'content'가 리스트가 아닙니다"
+    return None
+
 
 def load_slides_data(json_path='slides.json'):
     """JSON 파일에서 슬라이드 데이터를 로드합니다."""
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        print(f"✓ JSON 파일 로드 완료: {len(data.get('slides', []))}개 슬라이드")
-        return data
     except FileNotFoundError:
         print(f"❌ 오류: {json_path} 파일을 찾을 수 없습니다.")
         return None
     except json.JSONDecodeError:
         print(f"❌ 오류: {json_path} 파일의 JSON 형식이 올바르지 않습니다.")
         return None
+    error = slides_data_error(data)
+    if error:
+        print(f"❌ 오류: {json_path} 파일의 구조가 올바르지 않습니다: {error}")
+        return None
+    print(f"✓ JSON 파일 로드 완료: {len(data.get('slides', []))}개 슬라이드")
+    return data
 
 
 def create_title_slide(prs, topic):
@@ -121,7 +153,14 @@ def create_content_slide(prs, slide_data, slide_number, images_dir='images'):
     print(f"✓ 슬라이드 {slide_number} 생성 완료: {slide_data['title']}")
 
 
-def generate_presentation(slides_data, output_dir='output'):
+def presentation_path(topic, output_dir='output'):
+    """주제로 PPT 파일 경로를 만듭니다."""
+    safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_', '-')).strip()
+    safe_topic = safe_topic.replace(' ', '_')
+    return os.path.join(output_dir, f'{safe_topic}_presentation.pptx')
+
+
+def generate_presentation(slides_data, output_dir='output', images_dir='images'):
     """전체 프레젠테이션을 생성합니다."""
     # 출력 디렉토리 생성
     Path(output_dir).mkdir(exist_ok=True)
@@ -139,12 +178,10 @@ def generate_presentation(slides_data, output_dir='output'):
     # 콘텐츠 슬라이드 생성
     slides = slides_data.get('slides', [])
     for i, slide_data in enumerate(slides, 1):
-        create_content_slide(prs, slide_data, i)
+        create_content_slide(prs, slide_data, i, images_dir)
     
     # 파일 저장
-    safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_', '-')).strip()
-    safe_topic = safe_topic.replace(' ', '_')
-    output_path = os.path.join(output_dir, f'{safe_topic}_presentation.pptx')
+    output_path = presentation_path(topic, output_dir)
     
     prs.save(output_path)
     print(f"\n{'='*60}")
@@ -157,25 +194,216 @@ def generate_presentation(slides_data, output_dir='output'):
     return output_path
 
 
+class LiveDeck:
+    """메모리에 유지하는 프레젠테이션. 바뀐 슬라이드만 다시 만들어 저장합니다.
+
+    슬라이드를 고칠 때는 새 슬라이드를 만들어 같은 위치에 끼우고 이전 슬라이드를 떼어 냅니다.
+    떼어 낸 슬라이드와 그 슬라이드만 쓰던 이미지는 저장할 때 패키지에서 빠집니다.
+    """
+
+    def __init__(self, json_path='slides.json', images_dir='images', output_dir='output'):
+        self.json_path = json_path
+        self.images_dir = images_dir
+        self.output_dir = output_dir
+        self.slides_data = None
+        self.prs = None
+
+    def build(self):
+        """전체를 새로 만듭니다. JSON을 읽지 못하면 False를 반환하고 이전 상태를 유지합니다."""
+        slides_data = load_slides_data(self.json_path)
+        if not slides_data:
+            return False
+        prs = Presentation()
+        prs.slide_width = Inches(10)
+        prs.slide_height = Inches(7.5)
+        create_title_slide(prs, slides_data.get('topic', '프레젠테이션'))
+        for i, slide_data in enumerate(slides_data.get('slides', []), 1):
+            create_content_slide(prs, slide_data, i, self.images_dir)
+        # 렌더링이 끝까지 성공한 뒤에만 교체
+        self.slides_data, self.prs = slides_data, prs
+        return True
+
+    def reset(self):
+        """렌더링 도중 실패해 덱이 어중간한 상태일 때 호출합니다. 다음 update()는 전체를 다시 만듭니다."""
+        self.prs = None
+
+    def _slide_ids(self):
+        return self.prs.slides._sldIdLst
+
+    def _renumber(self):
+        self.prs.part.rename_slide_parts([sld_id.rId for sld_id in self._slide_ids()])
+
+    def _remove_slide(self, position):
+        sld_id = self._slide_ids()[position]
+        self._slide_ids().remove(sld_id)
+        self.prs.part.drop_rel(sld_id.rId)
+        # add_slide는 슬라이드 개수로 새 파트 이름을 정하므로, 이름이 겹치지 않게 매번 번호를 다시 매김
+        self._renumber()
+
+    def _render_slide(self, position):
+        """position(0은 타이틀)의 슬라이드를 다시 만들어 같은 위치에 둡니다."""
+        if position == 0:
+            create_title_slide(self.prs, self.slides_data.get('topic', '프레젠테이션'))
+        else:
+            create_content_slide(self.prs, self.slides_data['slides'][position - 1], position, self.images_dir)
+        slide_ids = self._slide_ids()
+        new_id = slide_ids[-1]
+        if position < len(slide_ids) - 1:
+            slide_ids.remove(new_id)
+            slide_ids.insert(position + 1, new_id)
+            self._remove_slide(position)
+
+    def update(self, changed):
+        """바뀐 파일(절대 경로 집합)을 반영하고 다시 만든 슬라이드 번호 목록을 반환합니다 (0은 타이틀).
+
+        changed가 RESCAN이면 전체를 다시 만듭니다. JSON을 읽지 못하거나 구조가 올바르지 않으면
+        아무것도 바꾸지 않고 None을 반환합니다. 렌더링 중 예외가 나면 reset() 후 다시 build()해야 합니다.
+        """
+        if changed is fs_watch.RESCAN or self.prs is None:
+            return list(range(len(self.slides_data.get('slides', [])) + 1)) if self.build() else None
+
+        old = self.slides_data
+        new = old
+        positions = set()
+        if os.path.abspath(self.json_path) in changed:
+            new = load_slides_data(self.json_path)
+            if not new:
+                return None
+            if old.get('topic') != new.get('topic'):
+                positions.add(0)
+            old_slides, new_slides = old.get('slides', []), new.get('slides', [])
+            positions.update(i for i in range(1, min(len(old_slides), len(new_slides)) + 1)
+                             if old_slides[i - 1] != new_slides[i - 1])
+            positions.update(range(len(old_slides) + 1, len(new_slides) + 1))
+
+        images_dir = os.path.abspath(self.images_dir)
+        for path in changed:
+            match = _SLIDE_IMAGE.search(path)
+            if os.path.dirname(path) == images_dir and match:
+                positions.add(int(match.group(1)))
+
+        # 새 데이터를 모두 확인한 뒤에만 상태를 바꿈
+        self.slides_data = new
+        for i in range(len(old.get('slides', [])), len(new.get('slides', [])), -1):
+            self._remove_slide(i)  # 뒤에서부터 줄어든 슬라이드 제거
+        positions = sorted(p for p in positions if p <= len(new.get('slides', [])))
+        for position in positions:
+            self._render_slide(position)
+        return positions
+
+    def save(self):
+        Path(self.output_dir).mkdir(exist_ok=True)
+        output_path = presentation_path(self.slides_data.get('topic', '프레젠테이션'), self.output_dir)
+        return pptx_packaging.save_presentation(self.prs, output_path, 'fast')
+
+
+def watch(json_path='slides.json', images_dir='images', output_dir='output',
+          debounce=WATCH_DEBOUNCE, polling=False):
+    """slides.json과 images/를 감시하며 바뀐 슬라이드만 다시 만들어 저장합니다 (Ctrl+C로 종료)."""
+    deck = LiveDeck(json_path, images_dir, output_dir)
+    if not deck.build():
+        return
+    output_path = deck.save()
+    print(f"\n👀 감시 시작: {json_path}, {images_dir}/ → {output_path}")
+
+    # 작업 디렉토리 밖의 경로(절대 경로, ../)도 감시할 수 있도록 두 경로의 공통 상위 디렉토리를 감시 루트로 씀
+    json_abs = os.path.abspath(json_path)
+    images_abs = os.path.abspath(images_dir)
+    root = os.path.commonpath([os.path.dirname(json_abs), images_abs])
+
+    def relative(path):
+        rel = os.path.relpath(path, root).replace(os.sep, '/')
+        return '' if rel == '.' else rel
+
+    json_name = relative(json_abs)
+    json_dir = os.path.dirname(json_name)
+    images_rel = relative(images_abs)
+
+    def on_path(rel_dir, target):
+        # target 자신이거나 target으로 가는 길목의 디렉토리인지
+        return rel_dir == target or target.startswith(rel_dir + '/')
+
+    def skip_dir(rel_dir):
+        # JSON이 있는 디렉토리와 images 디렉토리(및 그 상위 경로)만 내려감
+        return not (on_path(rel_dir, json_dir) or on_path(rel_dir, images_rel))
+
+    def watched(path):
+        return path == json_name or os.path.dirname(path) == images_rel
+
+    watcher = fs_watch.create_watcher(root, skip_dir, polling=polling)
+    try:
+        for changed in fs_watch.iter_changes(watcher, debounce):
+            if changed is not fs_watch.RESCAN:
+                changed = {os.path.join(root, *path.split('/')) for path in changed if watched(path)}
+                if not changed:
+                    continue
+            start = time.perf_counter()
+            try:
+                positions = deck.update(changed)
+                if positions is None:
+                    print("⚠ JSON을 읽지 못해 이전 상태를 유지합니다. 파일을 고치면 다시 반영합니다.")
+                    continue
+                render_ms = (time.perf_counter() - start) * 1000
+                output_path = deck.save()
+            except Exception as e:
+                # 일부만 바뀐 덱을 믿을 수 없으므로 전체를 다시 만듦
+                print(f"⚠ 갱신 중 오류가 발생해 전체를 다시 만듭니다: {e}")
+                deck.reset()
+                try:
+                    if not deck.build():
+                        continue
+                    positions = list(range(len(deck.slides_data.get('slides', [])) + 1))
+                    render_ms = (time.perf_counter() - start) * 1000
+                    output_path = deck.save()
+                except Exception as e:
+                    deck.reset()
+                    print(f"⚠ 전체를 다시 만들지 못했습니다: {e}. 파일을 고치면 다시 반영합니다.")
+                    continue
+            total_ms = (time.perf_counter() - start) * 1000
+            slides = ', '.join('타이틀' if p == 0 else str(p) for p in positions) or '없음'
+            print(f"🔄 {datetime.now():%H:%M:%S} 갱신 완료: 슬라이드 {slides} "
+                  f"(렌더링 {render_ms:.0f}ms, 저장 포함 {total_ms:.0f}ms) → {output_path}")
+    except KeyboardInterrupt:
+        print("\n👋 감시를 종료합니다.")
+    finally:
+        watcher.close()
+
+
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="slides.json으로 PPT 자동 생성")
+    parser.add_argument('--json', default='slides.json', help="슬라이드 JSON 파일 (기본값: slides.json)")
+    parser.add_argument('--images', default='images', help="슬라이드 이미지 디렉토리 (기본값: images)")
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--watch', action='store_true',
+                        help="JSON과 이미지 디렉토리를 감시하며 바뀐 슬라이드만 다시 만들어 저장")
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                        help="연속된 변경을 한 번에 반영하기 위해 기다리는 시간(초, 기본값: %(default)s)")
+    parser.add_argument('--polling', action='store_true', help="inotify 대신 폴링으로 변경 감시")
+    args = parser.parse_args()
+    
     print("\n" + "="*60)
     print("🎨 트렌디 학술 스타일 PPT 자동 생성")
     print("="*60 + "\n")
     
+    # 이미지 디렉토리 확인
+    images_dir = args.images
+    if args.watch:
+        Path(images_dir).mkdir(exist_ok=True)
+        watch(args.json, images_dir, args.output_dir, args.debounce, args.polling)
+        return
+    
     # JSON 데이터 로드
-    slides_data = load_slides_data()
+    slides_data = load_slides_data(args.json)
     if not slides_data:
         return
     
-    # 이미지 디렉토리 확인
-    images_dir = 'images'
     if not os.path.exists(images_dir):
         print(f"⚠ 경고: {images_dir} 디렉토리가 없습니다. 이미지 없이 진행합니다.")
         Path(images_dir).mkdir(exist_ok=True)
     
     # PPT 생성
-    output_path = generate_presentation(slides_data)
+    output_path = generate_presentation(slides_data, args.output_dir, images_dir)
     
     print("✨ 모든 작업이 완료되었습니다!")
 
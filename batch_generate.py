@@ -0,0 +1,348 @@
+"""
+여러 주제의 PPT를 한 번에 생성하는 비대화형 배치 스크립트
+주제 목록이나 YAML/JSON 배치 파일을 받아 생산자-소비자 파이프라인으로 처리합니다.
+Gemini 호출(생성 단계)과 PPT 렌더링(렌더 단계)이 각자의 워커 풀에서 실행되므로
+k번째 주제를 렌더링하는 동안 k+1번째 주제의 콘텐츠 생성이 함께 진행됩니다.
+
+사용 예:
+    python batch_generate.py "양자 컴퓨팅의 미래" "트랜스포머와 GPT" --slides 10
+    python batch_generate.py --batch topics.yaml --gen-workers 2 --render-workers 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import adaptive_concurrency
+import deck_archive
+import generate_ppt
+import hedging
+import image_generation
+import pptx_packaging
+import prompts
+import reproducible_build
+import run_checkpoint
+import size_budget
+import topic_index
+
+DEFAULT_JOB = {'mode': '2', 'num_slides': 10, 'images_dir': 'images', 'include_notes': False, 'max_size': None}
+
+# 여러 작업이 동시에 출력하므로 작업별 요약 줄은 한 번에 찍히도록 잠금 사용
+_print_lock = threading.Lock()
+
+
+def log(message):
+    with _print_lock:
+        print(message, flush=True)
+
+
+def _read_batch_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML 배치 파일을 읽으려면 PyYAML이 필요합니다: pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def normalize_jobs(entries, defaults=None):
+    """주제 문자열이나 작업 딕셔너리 목록을 검증된 작업 목록으로 바꿉니다.
+
+    각 작업은 mode('1': 기존 JSON 렌더링, '2': 주제로 새로 생성, '3': 기존 JSON 개선),
+    topic, num_slides, json_path, images_dir, include_notes, max_size(바이트 또는 '20MB') 키를 가집니다.
+    """
+    jobs = []
+    for index, entry in enumerate(entries, 1):
+        if isinstance(entry, str):
+            entry = {'topic': entry}
+        if not isinstance(entry, dict):
+            raise ValueError(f"작업 {index}: 주제 문자열이나 작업 딕셔너리여야 합니다 (받은 값: {entry!r})")
+        job = {**DEFAULT_JOB, **(defaults or {}), **entry}
+        job['mode'] = str(job['mode'])
+        try:
+            job['num_slides'] = int(job['num_slides'])
+        except (TypeError, ValueError):
+            raise ValueError(f"작업 {index}: num_slides는 정수여야 합니다 (받은 값: {job['num_slides']!r})") from None
+        if job['max_size'] is not None:
+            job['max_size'] = size_budget.parse_size(job['max_size'])
+        if job['mode'] not in ('1', '2', '3'):
+            raise ValueError(f"작업 {index}: 알 수 없는 모드 {job['mode']!r} (1/2/3 중 선택)")
+        if job['mode'] == '2' and not job.get('topic'):
+            raise ValueError(f"작업 {index}: 모드 2에는 topic이 필요합니다.")
+        if job['mode'] in ('1', '3') and not job.get('json_path'):
+            raise ValueError(f"작업 {index}: 모드 {job['mode']}에는 json_path가 필요합니다.")
+        job['name'] = job.get('topic') or job['json_path']
+        jobs.append(job)
+    return jobs
+
+
+def load_batch_file(path, defaults=None):
+    """배치 파일을 읽어 작업 목록을 반환합니다.
+
+    파일은 작업 목록 자체이거나 {'defaults': {...}, 'jobs': [...]} 형태일 수 있습니다.
+    """
+    data = _read_batch_file(path)
+    if isinstance(data, dict):
+        if not isinstance(data.get('defaults') or {}, dict):
+            raise ValueError(f"{path}: defaults는 딕셔너리여야 합니다.")
+        defaults = {**(defaults or {}), **(data.get('defaults') or {})}
+        data = data.get('jobs') or []
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: 작업 목록을 찾을 수 없습니다.")
+    return normalize_jobs(data, defaults)
+
+
+def prepare_slides(job, model):
+    """생성 단계: 작업 하나의 슬라이드 데이터를 준비합니다. 실패하면 None을 반환합니다."""
+    mode = job['mode']
+    if mode == '1':
+        return generate_ppt.load_slides_data(job['json_path'])
+
+    if not model:
+        log(f"❌ [{job['name']}] Gemini API를 사용할 수 없어 모드 {mode}를 실행할 수 없습니다.")
+        return None
+
+    if mode == '2':
+        run_dir = run_checkpoint.create_run_dir(mode, {'topic': job['topic'], 'num_slides': job['num_slides'],
+                                                       'include_notes': job['include_notes']})
+        slides_data = generate_ppt.generate_slides_with_gemini(job['topic'], job['num_slides'], model,
+                                                               run_dir=run_dir,
+                                                               include_notes=job['include_notes'])
+        if not slides_data:
+            generate_ppt.print_resume_hint(run_dir)
+            return None
+        output_json = generate_ppt.save_slides_json(slides_data, 'generated')
+        topic_index.register_deck(slides_data, output_json)
+        run_checkpoint.update_run_meta(run_dir, status='done', output_json=output_json)
+        return slides_data
+
+    slides_data = generate_ppt.load_slides_data(job['json_path'])
+    if not slides_data:
+        return None
+    run_dir = run_checkpoint.create_run_dir(mode, {'json_path': job['json_path']})
+    run_checkpoint.save_json(run_dir, 'source.json', slides_data)
+    failed = generate_ppt.enhance_slides(slides_data, model, run_dir)
+    output_json = generate_ppt.save_slides_json(slides_data, 'enhanced')
+    topic_index.register_deck(slides_data, output_json)
+    if failed:
+        log(f"⚠ [{job['name']}] 개선하지 못한 슬라이드: {', '.join(map(str, failed))}")
+        generate_ppt.print_resume_hint(run_dir)
+        run_checkpoint.update_run_meta(run_dir, output_json=output_json)
+    else:
+        run_checkpoint.update_run_meta(run_dir, status='done', output_json=output_json)
+    return slides_data
+
+
+def job_topic(job):
+    """작업의 덱 주제. 모드 1/3은 슬라이드 데이터를 준비하기 전에 JSON 파일에서 주제만 읽습니다."""
+    if job.get('topic'):
+        return job['topic']
+    try:
+        if job['json_path'].startswith(deck_archive.ARCHIVE_PREFIX):
+            data = deck_archive.load_deck(job['json_path'][len(deck_archive.ARCHIVE_PREFIX):])
+        else:
+            with open(job['json_path'], 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        return data.get('topic') or '프레젠테이션'
+    except (OSError, KeyError, ValueError, AttributeError):
+        # 읽을 수 없는 작업은 생성 단계에서 실패하므로 이름은 기본값으로 둠
+        return '프레젠테이션'
+
+
+def assign_output_names(jobs):
+    """같은 주제의 덱이 여러 개여도 서로 덮어쓰지 않도록 작업 순서대로 출력 파일 이름을 배정합니다.
+
+    렌더링이 끝나는 순서와 상관없이 실행할 때마다 같은 작업이 같은 이름(_2, _3 접미사)을 받습니다.
+    """
+    used = set()
+    names = []
+    for job in jobs:
+        base = generate_ppt.presentation_filename(job_topic(job))
+        stem, ext = os.path.splitext(base)
+        name, suffix = base, 2
+        while name in used:
+            name = f'{stem}_{suffix}{ext}'
+            suffix += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def render_slides(job, slides_data, output_dir, image_backend, image_workers, filename=None,
+                  packaging=pptx_packaging.DEFAULT_PROFILE, reproducible=False, build_date=None):
+    """렌더 단계: 준비된 슬라이드 데이터로 PPT를 만듭니다."""
+    os.makedirs(job['images_dir'], exist_ok=True)
+    return generate_ppt.generate_presentation(slides_data, output_dir=output_dir,
+                                              images_dir=job['images_dir'],
+                                              image_backend=image_backend,
+                                              image_workers=image_workers,
+                                              filename=filename,
+                                              packaging=packaging,
+                                              max_size=job['max_size'],
+                                              reproducible=reproducible,
+                                              build_date=build_date)
+
+
+def run_batch(jobs, model, output_dir='output', gen_workers=2, render_workers=1,
+              image_backend=None, image_workers=4, packaging=pptx_packaging.DEFAULT_PROFILE,
+              reproducible=False, build_date=None):
+    """작업 목록을 파이프라인으로 실행하고 작업별 결과 목록을 반환합니다.
+
+    생성 단계가 끝난 작업은 즉시 렌더 풀에 넘겨지므로, 렌더링과 다음 작업의 Gemini 호출이 겹칩니다.
+    """
+    results = [{'name': job['name'], 'mode': job['mode'], 'output': None, 'error': None,
+                'generate_seconds': None, 'render_seconds': None} for job in jobs]
+    filenames = assign_output_names(jobs)
+
+    def render_stage(index, slides_data):
+        start = time.perf_counter()
+        try:
+            results[index]['output'] = render_slides(jobs[index], slides_data, output_dir,
+                                                     image_backend, image_workers, filenames[index], packaging,
+                                                     reproducible, build_date)
+        except Exception as e:
+            results[index]['error'] = f"렌더링 실패: {e}"
+        results[index]['render_seconds'] = time.perf_counter() - start
+        log(f"🏁 [{index + 1}/{len(jobs)}] {jobs[index]['name']}: 렌더링 종료")
+
+    def generate_stage(index):
+        start = time.perf_counter()
+        try:
+            slides_data = prepare_slides(jobs[index], model)
+        except Exception as e:
+            slides_data = None
+            results[index]['error'] = f"생성 실패: {e}"
+        results[index]['generate_seconds'] = time.perf_counter() - start
+        if not slides_data:
+            results[index]['error'] = results[index]['error'] or "슬라이드 데이터를 준비하지 못했습니다."
+            return None
+        log(f"📦 [{index + 1}/{len(jobs)}] {jobs[index]['name']}: 콘텐츠 준비 완료 → 렌더링 대기")
+        # 생산자가 소비자 풀에 직접 넘겨 렌더링이 생성 순서가 아닌 완료 순서로 시작되게 함
+        return render_pool.submit(render_stage, index, slides_data)
+
+    with ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix='render') as render_pool:
+        with ThreadPoolExecutor(max_workers=gen_workers, thread_name_prefix='generate') as gen_pool:
+            generation = [gen_pool.submit(generate_stage, i) for i in range(len(jobs))]
+            renders = [future.result() for future in generation]
+        for future in renders:
+            if future:
+                future.result()
+    return results
+
+
+def print_summary(results, wall_time):
+    """작업별 결과와 파이프라인 효과를 출력합니다."""
+    print("\n" + "="*60)
+    print("📊 배치 생성 결과")
+    print("="*60)
+    sequential = 0.0
+    for result in results:
+        stages = [t for t in (result['generate_seconds'], result['render_seconds']) if t]
+        sequential += sum(stages)
+        timing = ', '.join(f"{label} {t:.1f}초" for label, t in
+                           (("생성", result['generate_seconds']), ("렌더링", result['render_seconds'])) if t)
+        if result['error']:
+            print(f"❌ {result['name']}: {result['error']} ({timing})")
+        else:
+            print(f"✅ {result['name']}: {result['output']} ({timing})")
+    succeeded = sum(1 for r in results if not r['error'])
+    print(f"\n총 {len(results)}개 중 {succeeded}개 성공, 소요 시간 {wall_time:.1f}초 "
+          f"(단계별 합계 {sequential:.1f}초)")
+    print("="*60 + "\n")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="여러 주제의 PPT를 비대화형으로 일괄 생성")
+    parser.add_argument('topics', nargs='*', help="생성할 프레젠테이션 주제 (모드 2)")
+    parser.add_argument('--batch', metavar='FILE', help="작업 목록 YAML/JSON 파일")
+    parser.add_argument('--slides', type=int, default=DEFAULT_JOB['num_slides'],
+                        help=f"주제별 슬라이드 개수 기본값 (기본: {DEFAULT_JOB['num_slides']})")
+    parser.add_argument('--notes', action='store_true',
+                        help="발표자 노트와 이미지 대체 텍스트를 같은 요청으로 함께 생성")
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--max-size', metavar='SIZE',
+                        help="작업마다 PPTX 파일 크기 한도 (예: 20MB, 배치 파일의 max_size로 작업별 지정 가능)")
+    parser.add_argument('--gen-workers', type=int,
+                        help="동시에 실행할 Gemini 생성 작업 수 (기본: --concurrency 한도 상한, 모드 1만 있으면 2)")
+    parser.add_argument('--concurrency', type=adaptive_concurrency.parse_concurrency, default='auto',
+                        help="모든 작업이 동시에 보낼 Gemini 요청 수 (auto: 지연 시간과 429에 따라 자동 조절, 숫자: 고정, 기본: auto)")
+    parser.add_argument('--render-workers', type=int, default=1, help="동시에 실행할 렌더링 작업 수 (기본: 1)")
+    parser.add_argument('--images', choices=sorted(image_generation.IMAGE_BACKENDS),
+                        default=os.getenv('IMAGE_BACKEND'),
+                        help="image_prompt로 슬라이드 이미지를 생성할 백엔드 (local: 오프라인 대체 이미지)")
+    parser.add_argument('--image-workers', type=int, default=4,
+                        help="덱마다 동시에 실행할 이미지 생성 요청 수 (기본: 4)")
+    parser.add_argument('--package-profile', choices=sorted(pptx_packaging.PROFILES),
+                        default=pptx_packaging.DEFAULT_PROFILE,
+                        help="PPTX 저장 프로필 (fast: 이미지 재압축 생략, small: 최대 압축, 기본: %(default)s)")
+    parser.add_argument('--reproducible', action='store_true',
+                        help="날짜와 저장 순서를 고정해 같은 입력이면 같은 파일을 만들고, 입력이 그대로인 덱은 캐시된 PPT 사용")
+    parser.add_argument('--build-date', type=reproducible_build.parse_build_date, metavar='YYYY-MM-DD',
+                        help="--reproducible에서 모든 덱에 쓸 날짜 (기본: SOURCE_DATE_EPOCH, JSON의 date, 오늘 순)")
+    parser.add_argument('--hedge', action='store_true',
+                        help="응답이 최근 p90보다 늦으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용")
+    parser.add_argument('--hedge-budget', type=float, default=hedging.HEDGE_BUDGET,
+                        help="헤징으로 추가할 수 있는 요청 비율 상한 (기본: %(default)s)")
+    parser.add_argument('--stub', action='store_true', help="Gemini API 대신 로컬 스텁 모델 사용 (오프라인 테스트)")
+    args = parser.parse_args()
+
+    defaults = {'num_slides': args.slides, 'include_notes': args.notes, 'max_size': args.max_size}
+    try:
+        jobs = normalize_jobs(args.topics, defaults)
+        if args.batch:
+            jobs += load_batch_file(args.batch, defaults)
+    except (OSError, ValueError) as e:
+        print(f"❌ 배치 작업을 읽을 수 없습니다: {e}")
+        sys.exit(2)
+    if not jobs:
+        parser.error("주제를 하나 이상 지정하거나 --batch 파일을 지정하세요.")
+
+    if args.stub:
+        import gemini_stub
+
+        model = gemini_stub.StubGenerativeModel()
+        print("🧪 로컬 스텁 모델 사용")
+    elif any(job['mode'] != '1' for job in jobs):
+        model = generate_ppt.initialize_gemini_api()
+    else:
+        model = None
+    model = adaptive_concurrency.wrap_model(model, args.concurrency)
+    # 생성 작업은 요청 한도 상한만큼 띄워 두고, 실제 동시 요청 수는 한도가 조절
+    gen_workers = args.gen_workers or adaptive_concurrency.suggested_workers(model, default=2)
+    if model and args.hedge:
+        # 생성 워커마다 슬라이드 개선 요청을 한도 상한만큼 동시에 보냄
+        hedge_workers = gen_workers * adaptive_concurrency.suggested_workers(model)
+        model = hedging.HedgedModel(model, budget=args.hedge_budget, max_workers=hedge_workers)
+    print("\n" + "="*60)
+    print(f"🎓 배치 PPT 생성 시작: {len(jobs)}개 작업")
+    print(f"   생성 워커 {gen_workers}개 / 렌더 워커 {args.render_workers}개")
+    print("="*60 + "\n")
+
+    image_backend = None
+    if args.images:
+        try:
+            image_backend = image_generation.get_image_backend(args.images)
+        except ValueError as e:
+            print(f"⚠ 이미지 백엔드를 사용할 수 없습니다: {e}")
+
+    start = time.perf_counter()
+    results = run_batch(jobs, model, args.output_dir, gen_workers, args.render_workers,
+                        image_backend, args.image_workers, args.package_profile,
+                        args.reproducible, args.build_date)
+    print_summary(results, time.perf_counter() - start)
+    if hasattr(model, 'print_stats'):
+        model.print_stats()
+    prompts.print_usage(model)
+    if any(result['error'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
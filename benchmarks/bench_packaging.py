@@ -0,0 +1,83 @@
+"""
+PPTX 패키징 프로필 벤치마크
+이미지가 많은 합성 덱을 만들고 prs.save()와 pptx_packaging의 각 프로필로 저장할 때의
+저장 시간과 파일 크기를 비교합니다.
+
+사용법: python benchmarks/bench_packaging.py [--slides 30] [--format png] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+from pptx import Presentation  # noqa: E402
+from pptx.util import Inches  # noqa: E402
+
+import generate_ppt  # noqa: E402
+import pptx_packaging  # noqa: E402
+import theme_renderer  # noqa: E402
+
+
+def build_deck(slides, image_format, image_dir):
+    """슬라이드마다 서로 다른 이미지를 가진 합성 덱을 만듭니다."""
+    prs = Presentation()
+    prs.slide_width = Inches(10)
+    prs.slide_height = Inches(7.5)
+    design_theme = dict(theme_renderer.DEFAULT_THEME)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_ppt.create_title_slide(prs, '패키징 벤치마크', design_theme)
+        for i in range(1, slides + 1):
+            image = Image.open(io.BytesIO(theme_renderer.render_placeholder(design_theme, (1024, 768), seed=i)))
+            image_path = os.path.join(image_dir, f'slide_{i}.{image_format}')
+            image.save(image_path)
+            slide_data = {
+                'title': f'슬라이드 {i}',
+                'content': [f'**핵심 개념 {i}**: 벤치마크용 본문', '재미있는 비유: 마치 압축 파일처럼',
+                            '구체적인 예시와 수치', '**강조할 포인트**: 저장 시간'],
+                'notes': '발표자 노트 ' * 20,
+            }
+            generate_ppt.create_content_slide(prs, slide_data, i, image_path=image_path,
+                                              design_theme=design_theme)
+    return prs
+
+
+def measure(label, save, path, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        save(path)
+        best = min(best, time.perf_counter() - start)
+    Presentation(path)  # 저장한 파일을 다시 열 수 있는지 확인
+    size = os.path.getsize(path)
+    print(f"  {label:<20} {best * 1000:8.1f} ms  {size / (1024 * 1024):8.2f} MB")
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PPTX 패키징 프로필별 저장 시간/크기 비교")
+    parser.add_argument('--slides', type=int, default=30)
+    parser.add_argument('--format', choices=('png', 'jpg'), default='png', help="슬라이드 이미지 형식")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        prs = build_deck(args.slides, args.format, root)
+        print(f"합성 덱: 콘텐츠 슬라이드 {args.slides}장, 이미지 형식 {args.format.upper()}")
+        baseline, _ = measure('prs.save (기존)', prs.save, os.path.join(root, 'baseline.pptx'), args.repeat)
+        for profile in pptx_packaging.PROFILES:
+            elapsed, _ = measure(
+                f'{profile} 프로필',
+                lambda path, profile=profile: pptx_packaging.save_presentation(prs, path, profile),
+                os.path.join(root, f'{profile}.pptx'), args.repeat)
+            print(f"  {'':<20} prs.save 대비 {baseline / elapsed:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
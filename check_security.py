@@ -2,12 +2,34 @@
 🔒 깃허브 업로드 전 보안 체크 스크립트
 
 이 스크립트는 깃허브에 업로드하기 전에 민감한 정보가 노출되지 않는지 확인합니다.
+
+자주 실행한다면 데몬을 띄워 두세요. 데몬은 파일 변경(inotify, 없으면 폴링)을 감시하며
+바뀐 파일만 다시 검사하고, 일반 실행은 로컬 소켓으로 데몬의 최신 결과를 받아 바로 응답합니다.
+    python check_security.py --daemon        # 별도 터미널에서 실행
+    python check_security.py                 # 데몬이 있으면 즉시 응답
+    python check_security.py --daemon-stop
 """
 
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import hmac
+import io
+import json
 import os
 import re
+import secrets
+import socket
+import subprocess
 import sys
-from pathlib import Path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import fs_watch
+import secret_scanner
 
 # 색상 코드
 GREEN = '\033[92m'
@@ -17,6 +39,24 @@ BLUE = '\033[94m'
 RESET = '\033[0m'
 BOLD = '\033[1m'
 
+# 순회 중 아예 내려가지 않는 디렉토리
+IGNORED_DIRS = {
+    '.git', 'venv', '.venv', 'env', 'node_modules', '__pycache__',
+    '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache',
+}
+
+SENSITIVE_PATTERNS = [
+    'config.json',
+    'secrets.json',
+    'credentials.json',
+    '*.pem',
+    '*.key',
+    'id_rsa',
+    'id_dsa'
+]
+
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 def print_header(text):
     """헤더 출력"""
     print(f"\n{BOLD}{BLUE}{'='*60}{RESET}")
@@ -35,6 +75,297 @@ def print_warning(text):
     """경고 메시지 출력"""
     print(f"{YELLOW}⚠️  {text}{RESET}")
 
+def _glob_to_regex(pattern):
+    """gitignore 글롭 패턴을 정규식 문자열로 변환합니다."""
+    i, n = 0, len(pattern)
+    parts = []
+    while i < n:
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            parts.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                parts.append(re.escape('['))
+                i += 1
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f'[{body}]')
+                i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+class GitignoreMatcher:
+    """.gitignore 규칙을 컴파일한 매처
+
+    부정 규칙(!)이 없으면 모든 규칙을 하나의 정규식으로 합쳐 한 번에 검사합니다.
+
+    >>> GitignoreMatcher(['/build/']).match('build', is_dir=True)
+    True
+    >>> GitignoreMatcher(['/build/']).match('sub/build', is_dir=True)
+    False
+    >>> GitignoreMatcher(['build/']).match('sub/build', is_dir=True)
+    True
+    """
+
+    def __init__(self, lines=()):
+        self.rules = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            # 앞쪽 슬래시를 지우기 전에 고정 여부를 정해야 '/build/'가 루트의 build만 가리킴
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            prefix = '^' if anchored else '^(?:.*/)?'
+            regex = re.compile(prefix + _glob_to_regex(line) + '$')
+            self.rules.append((regex, negate, dir_only))
+
+        self._combined = None
+        self._combined_dirs = None
+        if self.rules and not any(negate for _, negate, _ in self.rules):
+            self._combined = re.compile('|'.join(
+                f'(?:{r.pattern})' for r, _, dir_only in self.rules if not dir_only) or '(?!)')
+            self._combined_dirs = re.compile('|'.join(f'(?:{r.pattern})' for r, _, _ in self.rules))
+
+    @classmethod
+    def from_file(cls, path='.gitignore'):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return cls(f.readlines())
+
+    def match(self, rel_path, is_dir=False):
+        """루트 기준 상대 경로(슬래시 구분)가 무시 대상인지 확인합니다."""
+        if self._combined is not None:
+            combined = self._combined_dirs if is_dir else self._combined
+            return combined.match(rel_path) is not None
+        ignored = False
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                ignored = not negate
+        return ignored
+
+def walk_project(root='.', matcher=None):
+    """프로젝트 파일을 한 번만 순회하며 (상대 경로, 전체 경로)를 반환합니다.
+
+    IGNORED_DIRS와 .gitignore에 걸리는 디렉토리는 내려가기 전에 가지치기합니다.
+    """
+    matcher = matcher or GitignoreMatcher()
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        rel_dir = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/') + '/'
+        dirnames[:] = [
+            d for d in dirnames
+            if d not in IGNORED_DIRS and not matcher.match(rel_dir + d, is_dir=True)
+        ]
+        for name in filenames:
+            rel_path = rel_dir + name
+            if not matcher.match(rel_path):
+                yield rel_path, os.path.join(dirpath, name)
+
+_SENSITIVE_NAME = re.compile('|'.join(fnmatch.translate(p) for p in SENSITIVE_PATTERNS))
+
+SCAN_CACHE_FILE = '.security_scan_cache.json'
+# 탐지 규칙이 바뀌면 이전 캐시를 무효화
+SCAN_RULES_VERSION = secret_scanner.RULES_VERSION
+
+def _file_sha256(full_path):
+    hasher = hashlib.sha256()
+    with open(full_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(secret_scanner.CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _scan_file_for_secrets(full_path, cached=None, max_size=secret_scanner.MAX_FILE_SIZE):
+    """파일 하나에서 하드코딩된 비밀 정보를 찾아 캐시 항목으로 반환합니다.
+
+    크기와 수정 시각이 캐시와 같으면 파일을 읽지 않습니다.
+    크기는 같고 수정 시각만 다르면(touch, 체크아웃 등) 해시만 계산해 캐시된 해시와 같을 때 결과를 재사용합니다.
+    그 밖에는 파일을 청크 단위로 한 번만 읽으며 해시 계산과 패턴 검사를 함께 수행합니다.
+    바이너리 파일과 max_size를 넘는 파일은 검사하지 않고 skipped에 이유를 기록합니다.
+    """
+    st = os.stat(full_path)
+    if cached and cached['size'] == st.st_size:
+        if cached['mtime_ns'] == st.st_mtime_ns:
+            return cached, False
+        if cached.get('sha256') and _file_sha256(full_path) == cached['sha256']:
+            return {**cached, 'mtime_ns': st.st_mtime_ns}, False
+
+    hasher = hashlib.sha256()
+    scan = secret_scanner.scan_file(full_path, max_size=max_size, hasher=hasher)
+    digest = hasher.hexdigest() if scan['skipped'] != 'too_large' else None
+    entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest,
+             'findings': scan['findings'], 'skipped': scan['skipped']}
+    return entry, True
+
+def _empty_scan_cache(max_file_size=secret_scanner.MAX_FILE_SIZE):
+    return {'version': SCAN_RULES_VERSION, 'max_file_size': max_file_size,
+            'files': {}, 'sensitive_files': []}
+
+def load_scan_cache(path=SCAN_CACHE_FILE, max_file_size=secret_scanner.MAX_FILE_SIZE):
+    """이전 스캔 결과 캐시를 로드합니다.
+
+    없거나 규칙 버전, 파일 크기 제한이 다르면 빈 캐시를 반환합니다.
+    """
+    empty = _empty_scan_cache(max_file_size)
+    if not os.path.exists(path):
+        return empty
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return empty
+    if cache.get('version') != SCAN_RULES_VERSION or cache.get('max_file_size') != max_file_size:
+        return empty
+    return cache
+
+def save_scan_cache(cache, path=SCAN_CACHE_FILE):
+    """스캔 캐시를 원자적으로 저장합니다."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+def _git_lines(*args):
+    result = subprocess.run(['git', *args], capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return [line for line in result.stdout.splitlines() if line]
+
+def get_changed_paths():
+    """git 기준으로 변경된 파일 목록을 반환합니다. git을 쓸 수 없으면 None을 반환합니다.
+
+    업스트림(없으면 HEAD) 이후 커밋/수정된 파일, 스테이징된 파일, 추적되지 않는 새 파일을 포함합니다.
+    """
+    try:
+        changed = set(_git_lines('diff', '--name-only', '--relative', '--cached'))
+        changed.update(_git_lines('ls-files', '--others', '--exclude-standard'))
+        for base in ('@{upstream}', 'HEAD'):
+            try:
+                changed.update(_git_lines('diff', '--name-only', '--relative', base))
+                break
+            except RuntimeError:
+                continue
+    except (OSError, RuntimeError):
+        return None
+    return changed
+
+def scan_project(root='.', use_cache=True, changed_only=False, max_file_size=secret_scanner.MAX_FILE_SIZE,
+                 changed=None, cache=None):
+    """한 번의 순회로 모든 파일 기반 검사에 필요한 정보를 수집합니다.
+
+    파일 내용 검사는 스레드 풀에서 병렬로 처리되며, 결과는 파일별로 캐시됩니다.
+    확장자와 관계없이 모든 파일을 검사하되 바이너리와 max_file_size를 넘는 파일은 건너뜁니다.
+    changed_only이면 디렉토리를 순회하지 않고 변경 파일(changed, 생략 시 git이 알려준 목록)만
+    다시 검사하고, 나머지 파일은 캐시된 결과를 사용합니다.
+    cache를 주면 파일 대신 그 딕셔너리를 캐시로 사용하고 결과로 갱신합니다 (데몬의 메모리 캐시).
+    """
+    matcher = GitignoreMatcher.from_file(os.path.join(root, '.gitignore'))
+    cache_path = os.path.join(root, SCAN_CACHE_FILE)
+    if cache is None:
+        cache = (load_scan_cache(cache_path, max_file_size) if use_cache
+                 else _empty_scan_cache(max_file_size))
+    cached_files = cache['files']
+    result = {'sensitive_files': [], 'secrets': {}, 'skipped': {}, 'errors': [],
+              'scanned': 0, 'reused': 0}
+
+    if not changed_only:
+        changed = None
+    elif changed is None:
+        changed = get_changed_paths()
+    if changed_only and (changed is None or not cached_files):
+        print_warning("변경 파일 목록이나 이전 캐시가 없어 전체 스캔을 수행합니다.")
+        changed = None
+
+    if changed is None:
+        candidates = walk_project(root, matcher)
+        new_files = {}
+        sensitive = set()
+    else:
+        candidates = [
+            (rel_path, os.path.join(root, rel_path)) for rel_path in sorted(changed)
+            if os.path.isfile(os.path.join(root, rel_path))
+            and not matcher.match(rel_path)
+            and not IGNORED_DIRS.intersection(rel_path.split('/')[:-1])
+        ]
+        new_files = {path: entry for path, entry in cached_files.items() if path not in changed}
+        sensitive = {path for path in cache['sensitive_files'] if path not in changed}
+
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+        futures = []
+        for rel_path, full_path in candidates:
+            name = rel_path.rsplit('/', 1)[-1]
+            if _SENSITIVE_NAME.match(name):
+                sensitive.add(rel_path)
+            if rel_path not in (SCAN_CACHE_FILE, HISTORY_CACHE_FILE, DAEMON_SOCKET, DAEMON_ADDRESS_FILE):
+                futures.append((rel_path, pool.submit(
+                    _scan_file_for_secrets, full_path, cached_files.get(rel_path), max_file_size)))
+
+        for rel_path, future in futures:
+            try:
+                entry, rescanned = future.result()
+            except Exception as e:
+                result['errors'].append((rel_path, e))
+                continue
+            new_files[rel_path] = entry
+            result['scanned' if rescanned else 'reused'] += 1
+
+    for rel_path, entry in new_files.items():
+        if entry['findings']:
+            result['secrets'][rel_path] = entry['findings']
+        if entry.get('skipped'):
+            result['skipped'][rel_path] = entry['skipped']
+    result['sensitive_files'] = sorted(sensitive)
+
+    cache.update(files=new_files, sensitive_files=result['sensitive_files'])
+    if use_cache:
+        save_scan_cache(cache, cache_path)
+    return result
+
+_project_scan = None
+_scan_options = {'use_cache': True, 'changed_only': False,
+                 'max_file_size': secret_scanner.MAX_FILE_SIZE}
+
+def configure_scan(use_cache=True, changed_only=False, max_file_size=secret_scanner.MAX_FILE_SIZE):
+    """이후 get_project_scan()이 사용할 스캔 옵션을 설정합니다."""
+    global _project_scan
+    _scan_options.update(use_cache=use_cache, changed_only=changed_only,
+                         max_file_size=max_file_size)
+    _project_scan = None
+
+def get_project_scan():
+    """프로젝트 스캔 결과를 반환합니다. 한 번 실행한 결과를 모든 검사가 공유합니다."""
+    global _project_scan
+    if _project_scan is None:
+        _project_scan = scan_project(**_scan_options)
+    return _project_scan
+
 def check_gitignore_exists():
     """1. .gitignore 파일 존재 확인"""
     print_header("1. .gitignore 파일 확인")
@@ -70,40 +401,37 @@ def check_env_in_gitignore():
         print(f"   {YELLOW}해결 방법: .gitignore에 '.env'를 추가하세요.{RESET}")
         return False
 
+def print_secret_findings(findings):
+    """발견된 비밀 정보를 규칙 이름, 줄 번호와 함께 출력합니다."""
+    for finding in findings:
+        print(f"   {RED}키 ({finding['rule']}, {finding['line']}행): {finding['secret']}{RESET}")
+
 def check_hardcoded_api_keys():
-    """3. Python 파일에서 하드코딩된 API 키 확인"""
+    """3. 프로젝트 파일에서 하드코딩된 API 키, 토큰, 개인 키 확인"""
     print_header("3. 하드코딩된 API 키 검색")
     
-    # API 키 패턴 (Google API 키는 보통 AIza로 시작)
-    api_key_pattern = re.compile(r'["\']AIza[A-Za-z0-9_-]{35}["\']')
+    scan = get_project_scan()
+    for path, error in scan['errors']:
+        print_warning(f"파일 읽기 실패: {path} - {error}")
+    print(f"   {BLUE}검사한 파일: {scan['scanned']}개 (캐시 재사용: {scan['reused']}개){RESET}")
+    skipped = list(scan['skipped'].values())
+    if skipped:
+        print(f"   {BLUE}건너뛴 파일: 바이너리 {skipped.count('binary')}개, "
+              f"크기 초과 {skipped.count('too_large')}개{RESET}")
+    for path, reason in sorted(scan['skipped'].items()):
+        if reason == 'too_large':
+            print_warning(f"크기 제한을 넘어 검사하지 않음: {path}")
     
-    issues_found = []
-    
-    for py_file in Path('.').rglob('*.py'):
-        # __pycache__ 등 제외
-        if '__pycache__' in str(py_file) or 'venv' in str(py_file):
-            continue
-        
-        try:
-            with open(py_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                matches = api_key_pattern.findall(content)
-                
-                if matches:
-                    issues_found.append({
-                        'file': str(py_file),
-                        'keys': matches
-                    })
-        except Exception as e:
-            print_warning(f"파일 읽기 실패: {py_file} - {e}")
+    issues_found = [
+        {'file': path, 'findings': findings}
+        for path, findings in sorted(scan['secrets'].items())
+    ]
     
     if issues_found:
         print_error(f"하드코딩된 API 키를 {len(issues_found)}개 파일에서 발견했습니다!")
         for issue in issues_found:
             print(f"\n   {RED}파일: {issue['file']}{RESET}")
-            for key in issue['keys']:
-                masked_key = key[:15] + '...' + key[-5:]
-                print(f"   {RED}키: {masked_key}{RESET}")
+            print_secret_findings(issue['findings'])
         print(f"\n   {YELLOW}해결 방법: 모든 API 키를 환경 변수로 변경하세요.{RESET}")
         print(f"   {YELLOW}예시: api_key = os.getenv('GEMINI_API_KEY'){RESET}")
         return False
@@ -148,11 +476,11 @@ def check_env_example_safe():
         content = f.read()
     
     # 실제 API 키 패턴 검색
-    api_key_pattern = re.compile(r'AIza[A-Za-z0-9_-]{35}')
-    matches = api_key_pattern.findall(content)
+    matches = secret_scanner.scan_text(content)
     
     if matches:
         print_error(".env.example에 실제 API 키가 포함되어 있습니다!")
+        print_secret_findings(matches)
         print(f"   {YELLOW}해결 방법: .env.example의 API 키를 'your_api_key_here'로 변경하세요.{RESET}")
         return False
     else:
@@ -169,7 +497,6 @@ def check_git_status():
         return True
     
     # git status 실행
-    import subprocess
     try:
         result = subprocess.run(
             ['git', 'status', '--porcelain'],
@@ -200,22 +527,7 @@ def check_sensitive_files():
     """7. 기타 민감한 파일 확인"""
     print_header("7. 기타 민감한 파일 확인")
     
-    sensitive_patterns = [
-        'config.json',
-        'secrets.json',
-        'credentials.json',
-        '*.pem',
-        '*.key',
-        'id_rsa',
-        'id_dsa'
-    ]
-    
-    found_files = []
-    
-    for pattern in sensitive_patterns:
-        for file in Path('.').rglob(pattern):
-            if '.git' not in str(file) and 'venv' not in str(file):
-                found_files.append(str(file))
+    found_files = get_project_scan()['sensitive_files']
     
     if found_files:
         print_warning(f"민감할 수 있는 파일 {len(found_files)}개를 발견했습니다:")
@@ -227,8 +539,414 @@ def check_sensitive_files():
         print_success("민감한 파일이 발견되지 않았습니다.")
         return True
 
+HISTORY_CACHE_FILE = '.security_history_cache.json'
+# 이보다 큰 블롭은 소스 코드가 아닐 가능성이 높아 히스토리 검사에서 제외
+HISTORY_MAX_BLOB_SIZE = 5 * 1024 * 1024
+
+def load_history_cache(path=HISTORY_CACHE_FILE):
+    """이미 검사한 블롭 SHA와 발견 내역을 로드합니다."""
+    empty = {'version': SCAN_RULES_VERSION, 'scanned': [], 'findings': {}}
+    if not path or not os.path.exists(path):
+        return empty
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return empty
+    return cache if cache.get('version') == SCAN_RULES_VERSION else empty
+
+def list_history_blobs():
+    """모든 ref의 히스토리와 인덱스(스테이징)에 있는 블롭을 {sha: 경로}로 반환합니다."""
+    paths = {}
+    for line in _git_lines('rev-list', '--objects', '--all'):
+        sha, _, path = line.partition(' ')
+        if path and sha not in paths:
+            paths[sha] = path
+    for line in _git_lines('ls-files', '--stage'):
+        meta, _, path = line.partition('\t')
+        sha = meta.split()[1]
+        paths.setdefault(sha, path)
+
+    # 트리 객체도 경로를 가지므로 한 번의 batch-check로 블롭만 골라냄
+    check = subprocess.run(
+        ['git', 'cat-file', '--batch-check=%(objectname) %(objecttype) %(objectsize)'],
+        input=''.join(f'{sha}\n' for sha in paths),
+        capture_output=True, text=True, encoding='utf-8', check=True,
+    )
+    blobs = {}
+    for line in check.stdout.splitlines():
+        fields = line.split()
+        if len(fields) == 3 and fields[1] == 'blob' and int(fields[2]) <= HISTORY_MAX_BLOB_SIZE:
+            blobs[fields[0]] = paths[fields[0]]
+    return blobs
+
+def iter_blob_contents(shas):
+    """하나의 git cat-file --batch 프로세스로 블롭 내용을 스트리밍합니다."""
+    process = subprocess.Popen(['git', 'cat-file', '--batch'],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def feed():
+        try:
+            for sha in shas:
+                process.stdin.write(f'{sha}\n'.encode('ascii'))
+        finally:
+            process.stdin.close()
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        for _ in shas:
+            header = process.stdout.readline().split()
+            if len(header) < 3:  # '<sha> missing'
+                continue
+            size = int(header[2])
+            data = process.stdout.read(size)
+            process.stdout.read(1)  # 내용 뒤의 개행
+            yield header[0].decode('ascii'), data
+    finally:
+        writer.join()
+        process.stdout.close()
+        process.wait()
+
+def scan_git_history(use_cache=True):
+    """히스토리와 스테이징된 블롭 중 아직 검사하지 않은 것만 검사합니다."""
+    cache = load_history_cache(HISTORY_CACHE_FILE if use_cache else None)
+    scanned = set(cache['scanned'])
+    blobs = list_history_blobs()
+    pending = [sha for sha in blobs if sha not in scanned]
+
+    findings = cache['findings']
+    for sha, data in iter_blob_contents(pending):
+        if secret_scanner.is_binary(data[:secret_scanner.BINARY_SNIFF_SIZE]):
+            scanned.add(sha)
+            continue
+        blob_findings = secret_scanner.scan_bytes(data)
+        if blob_findings:
+            findings[sha] = {'path': blobs[sha], 'findings': blob_findings}
+        scanned.add(sha)
+
+    if use_cache:
+        tmp_path = HISTORY_CACHE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SCAN_RULES_VERSION, 'scanned': sorted(scanned),
+                       'findings': findings}, f)
+        os.replace(tmp_path, HISTORY_CACHE_FILE)
+
+    reachable = {sha: info for sha, info in findings.items() if sha in blobs}
+    return {'findings': reachable, 'total': len(blobs), 'scanned': len(pending)}
+
+def check_git_history():
+    """8. Git 히스토리와 스테이징 영역의 API 키 확인"""
+    print_header("8. Git 히스토리 검사")
+    
+    if not os.path.exists('.git'):
+        print_warning("Git 저장소가 초기화되지 않아 히스토리 검사를 건너뜁니다.")
+        return True
+    
+    history = scan_git_history(_scan_options['use_cache'])
+    print(f"   {BLUE}블롭 {history['total']}개 중 {history['scanned']}개 새로 검사{RESET}")
+    
+    if history['findings']:
+        print_error(f"히스토리에 남아 있는 API 키를 {len(history['findings'])}개 블롭에서 발견했습니다!")
+        for sha, info in sorted(history['findings'].items(), key=lambda item: item[1]['path']):
+            print(f"\n   {RED}파일: {info['path']} (블롭 {sha[:10]}){RESET}")
+            print_secret_findings(info['findings'])
+        print(f"\n   {YELLOW}삭제된 파일이라도 히스토리에 남은 키는 노출됩니다.{RESET}")
+        print(f"   {YELLOW}해결 방법: 키를 즉시 폐기/재발급하고 git filter-repo 등으로 히스토리를 정리하세요.{RESET}")
+        return False
+    else:
+        print_success("히스토리와 스테이징 영역에서 API 키가 발견되지 않았습니다.")
+        return True
+
+BASIC_CHECKS = [
+    ("1. .gitignore 존재", check_gitignore_exists),
+    ("2. .env 제외 확인", check_env_in_gitignore),
+    ("3. 하드코딩된 API 키", check_hardcoded_api_keys),
+    ("4. .env 파일 존재", check_env_file_exists),
+    ("5. .env.example 안전성", check_env_example_safe),
+    ("6. Git 상태", check_git_status),
+    ("7. 민감한 파일", check_sensitive_files),
+]
+
+DAEMON_SOCKET = '.security_daemon.sock'
+# 요청마다 확인하는 인증 토큰(과 AF_UNIX가 없는 플랫폼에서는 127.0.0.1 TCP 포트)을 본인만 읽을 수 있게 기록
+DAEMON_ADDRESS_FILE = '.security_daemon.json'
+DAEMON_TIMEOUT = 5.0
+DAEMON_SETTLE = 0.05  # 이벤트가 온 뒤 잇따르는 이벤트를 함께 처리하려고 기다리는 시간(초)
+# 데몬 자신이 쓰는 파일의 변경은 다시 검사할 이유가 아님
+DAEMON_OWN_FILES = {SCAN_CACHE_FILE, SCAN_CACHE_FILE + '.tmp', HISTORY_CACHE_FILE,
+                    HISTORY_CACHE_FILE + '.tmp', DAEMON_SOCKET, DAEMON_ADDRESS_FILE}
+# .git 안에서는 추적 상태(6번 검사)를 바꾸는 파일만 확인
+GIT_STATE_FILES = {'.git/index', '.git/HEAD'}
+
+def run_basic_checks():
+    """1~7번 검사를 실행하고 [(이름, 통과 여부, 출력)]을 반환합니다."""
+    results = []
+    for name, check_func in BASIC_CHECKS:
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            try:
+                result = check_func()
+            except Exception as e:
+                print_error(f"{name} 체크 중 오류 발생: {e}")
+                result = False
+        results.append((name, bool(result), buffer.getvalue()))
+    return results
+
+class SecurityDaemon:
+    """파일 변경을 감시하며 1~7번 검사 결과를 메모리에 최신으로 유지하는 데몬
+
+    바뀐 파일만 다시 검사하고, 질의가 오면 아직 처리하지 않은 변경을 먼저 반영한 뒤 응답합니다.
+    """
+
+    def __init__(self, root='.', max_file_size=secret_scanner.MAX_FILE_SIZE, polling=False):
+        self.root = root
+        self.max_file_size = max_file_size
+        self.polling = polling
+        self.cache = load_scan_cache(os.path.join(root, SCAN_CACHE_FILE), max_file_size)
+        self.checks = []
+        self.updated_at = None
+        self.refreshes = 0
+        self.watcher = None
+        self._token = None  # serve()가 시작할 때 만드는 인증 토큰
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _skip_dir(self, rel_dir):
+        return rel_dir.rsplit('/', 1)[-1] in IGNORED_DIRS or self._matcher.match(rel_dir, is_dir=True)
+
+    def _start_watcher(self):
+        if self.watcher:
+            self.watcher.close()
+        self._matcher = GitignoreMatcher.from_file(os.path.join(self.root, '.gitignore'))
+        self.watcher = fs_watch.create_watcher(self.root, self._skip_dir, extra_dirs=('.git',),
+                                               polling=self.polling)
+
+    def _full_scan(self):
+        """감시를 다시 걸고 전체를 훑습니다. 크기와 수정 시각이 같은 파일은 다시 읽지 않습니다."""
+        global _project_scan
+        self._start_watcher()
+        _project_scan = scan_project(self.root, max_file_size=self.max_file_size, cache=self.cache)
+
+    def refresh(self, changed):
+        """변경된 경로를 반영하고 검사 결과를 갱신합니다. 검사할 변경이 없으면 False를 반환합니다."""
+        global _project_scan
+        if changed is fs_watch.RESCAN:
+            self._full_scan()
+        else:
+            changed = changed - DAEMON_OWN_FILES
+            git_changed = bool(changed & GIT_STATE_FILES)
+            changed = {path for path in changed if not path.startswith('.git/')}
+            if not changed and not git_changed:
+                return False
+            if '.gitignore' in changed:
+                self._full_scan()  # 무시 규칙이 바뀌면 감시 대상과 검사 대상이 모두 바뀜
+            elif changed:
+                _project_scan = scan_project(self.root, changed_only=True, changed=changed,
+                                             max_file_size=self.max_file_size, cache=self.cache)
+        self.checks = run_basic_checks()
+        self.updated_at = datetime.now().isoformat(timespec='seconds')
+        self.refreshes += 1
+        return True
+
+    def _drain(self):
+        """쌓여 있는 변경을 모두 읽어 반영합니다. self._lock을 잡은 상태에서 호출합니다."""
+        changed = set()
+        while True:
+            batch = self.watcher.read(0)
+            if batch is fs_watch.RESCAN:
+                changed = fs_watch.RESCAN
+            elif not batch:
+                break
+            elif changed is not fs_watch.RESCAN:
+                changed |= batch
+            if self.watcher.backend == 'polling':
+                break  # 폴링은 한 번의 비교가 그 시점까지의 모든 변경을 포함
+        if changed is fs_watch.RESCAN or changed:
+            if self.refresh(changed):
+                print(f"🔄 {datetime.now():%H:%M:%S} 검사 결과 갱신 "
+                      f"({'전체 재확인' if changed is fs_watch.RESCAN else f'변경 파일 {len(changed)}개'})")
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'backend': self.watcher.backend,
+            'max_file_size': self.max_file_size,
+            'files': len(self.cache['files']),
+            'refreshes': self.refreshes,
+            'updated_at': self.updated_at,
+        }
+
+    def handle(self, request):
+        command = request.get('command')
+        if command == 'stop':
+            self._stop.set()
+            return {'ok': True}
+        with self._lock:
+            self._drain()
+            if command == 'status':
+                return {'ok': True, **self.status()}
+            if command == 'results':
+                return {'ok': True, **self.status(), 'checks': self.checks}
+        return {'ok': False, 'error': f"알 수 없는 명령: {command}"}
+
+    def _serve_client(self, conn):
+        with conn:
+            try:
+                request = json.loads(conn.makefile('rb').readline() or b'{}')
+                # 결과에 키 일부가 포함되므로 토큰 파일을 읽을 수 있는 사용자의 요청만 처리
+                if not hmac.compare_digest(str(request.get('token', '')), self._token):
+                    response = {'ok': False, 'error': "인증 토큰이 올바르지 않습니다."}
+                else:
+                    response = self.handle(request)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            conn.sendall(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+
+    def _accept_loop(self, server):
+        while not self._stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def serve(self):
+        """소켓을 열고 변경을 감시합니다. Ctrl+C나 stop 명령으로 끝납니다."""
+        if query_daemon('status') is not None:
+            print_error("이미 이 프로젝트의 보안 검사 데몬이 실행 중입니다.")
+            return 1
+        # git status가 인덱스의 stat 정보를 갱신해 쓰면 그 변경이 다시 검사를 부르므로 막음
+        os.environ['GIT_OPTIONAL_LOCKS'] = '0'
+        with self._lock:
+            self._full_scan()
+            self.checks = run_basic_checks()
+            self.updated_at = datetime.now().isoformat(timespec='seconds')
+        self._token = secrets.token_hex(32)
+        server = _daemon_listen(self._token)
+        print_success(f"보안 검사 데몬 시작 (감시 방식: {self.watcher.backend}, "
+                      f"파일 {len(self.cache['files'])}개, pid {os.getpid()})")
+        print(f"   {BLUE}이제 python check_security.py 가 데몬의 결과로 즉시 응답합니다.{RESET}")
+        threading.Thread(target=self._accept_loop, args=(server,), daemon=True).start()
+        try:
+            while not self._stop.is_set():
+                if self.watcher.wait(0.5):
+                    time.sleep(DAEMON_SETTLE)
+                    with self._lock:
+                        self._drain()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            self.watcher.close()
+            save_scan_cache(self.cache, os.path.join(self.root, SCAN_CACHE_FILE))
+            for path in (DAEMON_SOCKET, DAEMON_ADDRESS_FILE):
+                if os.path.exists(path):
+                    os.remove(path)
+        print_success("보안 검사 데몬 종료")
+        return 0
+
+def _write_private_json(path, data):
+    """본인만 읽고 쓸 수 있는 권한(0600)으로 JSON 파일을 만듭니다."""
+    if os.path.exists(path):
+        os.remove(path)  # 이전 데몬이 남긴 파일의 권한을 물려받지 않도록 새로 만듦
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+def _daemon_listen(token):
+    info = {'pid': os.getpid(), 'token': token}
+    if hasattr(socket, 'AF_UNIX'):
+        if os.path.exists(DAEMON_SOCKET):
+            os.remove(DAEMON_SOCKET)  # 비정상 종료한 이전 데몬의 소켓
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(DAEMON_SOCKET)
+        os.chmod(DAEMON_SOCKET, 0o600)  # 검사 결과에 키 일부가 포함되므로 본인만 접근
+    else:
+        # 루프백 포트는 다른 로컬 사용자도 접속할 수 있으므로 토큰으로만 구분됨
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        info['port'] = server.getsockname()[1]
+    _write_private_json(DAEMON_ADDRESS_FILE, info)
+    server.listen()
+    return server
+
+def _daemon_connect(timeout):
+    """데몬에 연결해 (소켓, 인증 토큰)을 반환합니다. 데몬이 없으면 None."""
+    try:
+        with open(DAEMON_ADDRESS_FILE, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if hasattr(socket, 'AF_UNIX'):
+        if not os.path.exists(DAEMON_SOCKET):
+            return None
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = DAEMON_SOCKET
+    else:
+        if 'port' not in info:
+            return None
+        address = ('127.0.0.1', info['port'])
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(address)
+    except OSError:
+        client.close()
+        return None
+    return client, info.get('token', '')
+
+def query_daemon(command='results', timeout=DAEMON_TIMEOUT):
+    """실행 중인 데몬에 명령을 보내고 응답을 반환합니다. 데몬이 없거나 응답이 없으면 None."""
+    connection = _daemon_connect(timeout)
+    if connection is None:
+        return None
+    client, token = connection
+    with client:
+        try:
+            client.sendall(json.dumps({'command': command, 'token': token}).encode('utf-8') + b'\n')
+            response = json.loads(client.makefile('rb').readline() or b'null')
+        except (OSError, ValueError):
+            return None
+    return response if response and response.get('ok') else None
+
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="깃허브 업로드 전 보안 체크")
+    parser.add_argument('--changed-only', action='store_true',
+                        help="git diff/스테이징/새 파일만 다시 검사하고 나머지는 캐시 결과 사용")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"{SCAN_CACHE_FILE} 캐시를 읽거나 쓰지 않음")
+    parser.add_argument('--history', action='store_true',
+                        help="삭제된 파일을 포함한 전체 Git 히스토리와 스테이징된 블롭도 검사")
+    parser.add_argument('--max-file-size', type=float, default=secret_scanner.MAX_FILE_SIZE / (1024 * 1024),
+                        metavar='MB', help="이보다 큰 파일은 내용 검사를 건너뜀 (기본: %(default)gMB)")
+    parser.add_argument('--daemon', action='store_true',
+                        help="파일 변경을 감시하며 검사 결과를 최신으로 유지하는 데몬 실행")
+    parser.add_argument('--polling', action='store_true', help="데몬이 inotify 대신 폴링으로 변경 감시")
+    parser.add_argument('--daemon-status', action='store_true', help="실행 중인 데몬 상태 확인")
+    parser.add_argument('--daemon-stop', action='store_true', help="실행 중인 데몬 종료")
+    parser.add_argument('--no-daemon', action='store_true', help="데몬이 실행 중이어도 직접 검사")
+    args = parser.parse_args()
+    max_file_size = int(args.max_file_size * 1024 * 1024)
+    configure_scan(use_cache=not args.no_cache, changed_only=args.changed_only,
+                   max_file_size=max_file_size)
+    
+    if args.daemon:
+        return SecurityDaemon(max_file_size=max_file_size, polling=args.polling).serve()
+    if args.daemon_status or args.daemon_stop:
+        status = query_daemon('stop' if args.daemon_stop else 'status')
+        if status is None:
+            print_warning("실행 중인 보안 검사 데몬이 없습니다.")
+            return 1
+        if args.daemon_stop:
+            print_success("보안 검사 데몬에 종료를 요청했습니다.")
+        else:
+            print_success(f"데몬 실행 중: pid {status['pid']}, 감시 방식 {status['backend']}, "
+                          f"파일 {status['files']}개, 갱신 {status['refreshes']}회 "
+                          f"(마지막 갱신 {status['updated_at']})")
+        return 0
+    
     print(f"\n{BOLD}{BLUE}")
     print("╔════════════════════════════════════════════════════════════╗")
     print("║                                                            ║")
@@ -237,18 +955,25 @@ def main():
     print("╚════════════════════════════════════════════════════════════╝")
     print(f"{RESET}\n")
     
-    checks = [
-        ("1. .gitignore 존재", check_gitignore_exists),
-        ("2. .env 제외 확인", check_env_in_gitignore),
-        ("3. 하드코딩된 API 키", check_hardcoded_api_keys),
-        ("4. .env 파일 존재", check_env_file_exists),
-        ("5. .env.example 안전성", check_env_example_safe),
-        ("6. Git 상태", check_git_status),
-        ("7. 민감한 파일", check_sensitive_files),
-    ]
-    
+    checks = list(BASIC_CHECKS)
     results = []
     
+    # 같은 설정으로 실행 중인 데몬이 있으면 1~7번은 데몬이 유지하는 최신 결과 사용
+    daemon = None
+    if not (args.no_daemon or args.no_cache):
+        daemon = query_daemon('results')
+        if daemon and daemon['max_file_size'] != max_file_size:
+            daemon = None
+    if daemon:
+        print(f"   {BLUE}⚡ 보안 검사 데몬(pid {daemon['pid']})의 결과 사용 "
+              f"(마지막 갱신 {daemon['updated_at']}){RESET}")
+        for name, result, output in daemon['checks']:
+            print(output, end='')
+            results.append((name, result))
+        checks = []
+    if args.history:
+        checks.append(("8. Git 히스토리", check_git_history))
+    
     for name, check_func in checks:
         try:
             result = check_func()
@@ -279,6 +1004,8 @@ def main():
         results[2][1],  # 하드코딩된 API 키
         results[4][1],  # .env.example 안전성
     ]
+    if args.history:
+        critical_checks.append(results[7][1])  # Git 히스토리
     
     if all(critical_checks):
         print(f"{GREEN}{BOLD}")
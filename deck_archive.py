@@ -0,0 +1,355 @@
+"""
+생성된 덱(slides_*.json)을 위한 내용 주소 기반 압축 보관소
+덱을 슬라이드와 design_theme 단위로 쪼개 내용 해시로 한 번만 저장하고,
+반복되는 이미지 프롬프트 문구 등은 학습한 사전(dictionary)으로 압축합니다.
+zstandard 패키지가 있으면 zstd를, 없으면 zlib 사전 압축을 사용합니다.
+
+덱 ID는 원본 파일 바이트의 SHA-256이며, 꺼낸 결과는 원본 JSON 파일과 바이트 단위로 같습니다.
+load_slides_data('archive:<덱 ID 앞부분>')으로 보관소의 덱을 바로 불러올 수 있습니다.
+
+사용 예:
+    python deck_archive.py add slides_generated_*.json --remove   # 보관 후 원본 삭제
+    python deck_archive.py list
+    python deck_archive.py get 3fa9c2 -o slides.json
+    python deck_archive.py stats
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from collections import Counter
+from datetime import datetime
+
+ARCHIVE_FILE = 'deck_archive.db'
+ARCHIVE_PREFIX = 'archive:'
+DICT_SIZE = 32 * 1024  # zlib 사전 최대 크기 (윈도 크기)
+MIN_TRAINING_SLIDES = 8
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 19
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    dict_id INTEGER REFERENCES dictionaries(id),
+    raw_size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decks (
+    id TEXT PRIMARY KEY,
+    topic TEXT,
+    source_path TEXT,
+    size INTEGER NOT NULL,
+    manifest TEXT NOT NULL,
+    archived_at TEXT
+);
+"""
+
+
+def _canonical(value):
+    """키 순서를 유지한 채 공백 없이 직렬화합니다 (해시와 저장에 사용)."""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _detect_format(text, data):
+    """원본 텍스트를 그대로 다시 만들 수 있는 json.dumps 형식을 찾습니다. 없으면 None."""
+    for indent in (2, 4, None):
+        dumped = json.dumps(data, ensure_ascii=False, indent=indent)
+        for newline in (False, True):
+            if dumped + ('\n' if newline else '') == text:
+                return {'indent': indent, 'newline': newline}
+    return None
+
+
+def train_dictionary(slides, size=DICT_SIZE):
+    """슬라이드 목록에서 자주 반복되는 문구로 압축 사전을 만듭니다.
+
+    이미지 프롬프트는 쉼표 단위 문구로 나눠 빈도를 세고, 자주 나오는 문구일수록
+    사전 끝(압축기가 가장 가깝게 참조하는 위치)에 오도록 배치합니다.
+    """
+    counts = Counter()
+    for slide in slides:
+        for key, value in slide.items():
+            counts[f'"{key}":'] += 1
+            if key == 'image_prompt' and isinstance(value, str):
+                counts.update(phrase.strip() + ', ' for phrase in value.split(','))
+            elif isinstance(value, str):
+                counts[value] += 1
+            elif isinstance(value, list):
+                counts.update(item for item in value if isinstance(item, str))
+    common = [text for text, count in sorted(counts.items(), key=lambda kv: kv[1]) if count > 1]
+    data = ''.join(common).encode('utf-8')
+    return data[-size:]
+
+
+class DeckArchive:
+    """덱 보관소 (SQLite 파일 하나)"""
+
+    def __init__(self, path=ARCHIVE_FILE, codec=None):
+        self.path = path
+        self.codec = codec or ('zstd' if zstandard else 'zlib')
+        if self.codec == 'zstd' and zstandard is None:
+            raise ValueError("zstd 압축을 사용하려면 zstandard 패키지가 필요합니다: pip install zstandard")
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._dicts = {}
+
+    def close(self):
+        self.conn.close()
+
+    # --- 압축 ---------------------------------------------------------
+
+    def _dictionary(self, dict_id):
+        if dict_id not in self._dicts:
+            row = self.conn.execute('SELECT data FROM dictionaries WHERE id = ?', (dict_id,)).fetchone()
+            self._dicts[dict_id] = row[0]
+        return self._dicts[dict_id]
+
+    def _current_dict_id(self):
+        row = self.conn.execute('SELECT MAX(id) FROM dictionaries WHERE codec = ?', (self.codec,)).fetchone()
+        return row[0]
+
+    def _compress(self, data, dict_id):
+        zdict = self._dictionary(dict_id) if dict_id else None
+        if self.codec == 'zstd':
+            params = {'level': ZSTD_LEVEL}
+            if zdict:
+                params['dict_data'] = zstandard.ZstdCompressionDict(zdict)
+            return zstandard.ZstdCompressor(**params).compress(data)
+        compressor = zlib.compressobj(ZLIB_LEVEL, zdict=zdict) if zdict else zlib.compressobj(ZLIB_LEVEL)
+        return compressor.compress(data) + compressor.flush()
+
+    def _decompress(self, codec, dict_id, data):
+        zdict = self._dictionary(dict_id) if dict_id else None
+        if codec == 'zstd':
+            if zstandard is None:
+                raise ValueError("zstd로 압축된 항목을 읽으려면 zstandard 패키지가 필요합니다.")
+            params = {'dict_data': zstandard.ZstdCompressionDict(zdict)} if zdict else {}
+            return zstandard.ZstdDecompressor(**params).decompress(data)
+        decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def _put_blob(self, data):
+        """내용 해시로 블롭을 저장합니다. 이미 있으면 다시 저장하지 않습니다."""
+        digest = _hash(data)
+        if self.conn.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone():
+            return digest
+        dict_id = self._current_dict_id()
+        self.conn.execute('INSERT INTO blobs (hash, codec, dict_id, raw_size, data) VALUES (?, ?, ?, ?, ?)',
+                          (digest, self.codec, dict_id, len(data), self._compress(data, dict_id)))
+        return digest
+
+    def _get_blob(self, digest):
+        row = self.conn.execute('SELECT codec, dict_id, data FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        if row is None:
+            raise KeyError(f"보관소에 없는 블롭: {digest}")
+        return self._decompress(*row)
+
+    def train(self, slides):
+        """슬라이드 표본으로 새 압축 사전을 학습해 이후 저장하는 블롭에 사용합니다."""
+        data = train_dictionary(slides)
+        if self.codec == 'zstd':
+            samples = [_canonical(slide) for slide in slides]
+            try:
+                data = zstandard.train_dictionary(DICT_SIZE, samples).as_bytes()
+            except zstandard.ZstdError:
+                pass  # 표본이 적으면 zstd 학습이 실패하므로 빈도 기반 사전을 그대로 사용
+        if not data:
+            return None
+        dict_id = self.conn.execute('INSERT INTO dictionaries (codec, data, created_at) VALUES (?, ?, ?)',
+                                    (self.codec, data, datetime.now().isoformat(timespec='seconds'))).lastrowid
+        return dict_id
+
+    def repack(self):
+        """모든 블롭을 최신 사전으로 다시 압축하고 쓰지 않는 사전을 지웁니다."""
+        dict_id = self._current_dict_id()
+        with self.conn:
+            for digest, codec, old_dict, data in self.conn.execute(
+                    'SELECT hash, codec, dict_id, data FROM blobs').fetchall():
+                if codec == self.codec and old_dict == dict_id:
+                    continue
+                raw = self._decompress(codec, old_dict, data)
+                self.conn.execute('UPDATE blobs SET codec = ?, dict_id = ?, data = ? WHERE hash = ?',
+                                  (self.codec, dict_id, self._compress(raw, dict_id), digest))
+            self.conn.execute('DELETE FROM dictionaries WHERE id NOT IN '
+                              '(SELECT DISTINCT dict_id FROM blobs WHERE dict_id IS NOT NULL)')
+        self.conn.execute('VACUUM')
+
+    # --- 덱 ------------------------------------------------------------
+
+    def add(self, path):
+        """JSON 파일 하나를 보관하고 (덱 ID, 새로 추가했는지)를 반환합니다."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        deck_id = _hash(raw)
+        if self.conn.execute('SELECT 1 FROM decks WHERE id = ?', (deck_id,)).fetchone():
+            return deck_id, False
+
+        text = raw.decode('utf-8')
+        data = json.loads(text)
+        slides = data.get('slides', []) if isinstance(data, dict) else []
+        with self.conn:
+            if self._current_dict_id() is None and len(slides) >= MIN_TRAINING_SLIDES:
+                self.train(slides)
+
+            fmt = _detect_format(text, data) if isinstance(data, dict) else None
+            if fmt is None:
+                # 알 수 없는 서식이면 원본 바이트를 통째로 보관해 정확한 복원을 보장
+                manifest = {'raw': self._put_blob(raw)}
+            else:
+                fields = []
+                for key, value in data.items():
+                    if key == 'slides' and isinstance(value, list):
+                        fields.append([key, 'slides', [self._put_blob(_canonical(s)) for s in value]])
+                    elif isinstance(value, (dict, list)):
+                        fields.append([key, 'ref', self._put_blob(_canonical(value))])
+                    else:
+                        fields.append([key, 'value', value])
+                manifest = {'format': fmt, 'fields': fields}
+            self.conn.execute(
+                'INSERT INTO decks (id, topic, source_path, size, manifest, archived_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (deck_id, data.get('topic') if isinstance(data, dict) else None, path, len(raw),
+                 json.dumps(manifest, ensure_ascii=False), datetime.now().isoformat(timespec='seconds')),
+            )
+        return deck_id, True
+
+    def resolve(self, deck_id):
+        """덱 ID나 그 앞부분으로 전체 덱 ID를 찾습니다."""
+        rows = self.conn.execute('SELECT id FROM decks WHERE id LIKE ?', (deck_id + '%',)).fetchall()
+        if not rows:
+            raise KeyError(f"보관소에 없는 덱: {deck_id}")
+        if len(rows) > 1:
+            raise KeyError(f"덱 ID가 모호합니다: {deck_id} ({len(rows)}개 일치)")
+        return rows[0][0]
+
+    def get_bytes(self, deck_id):
+        """보관한 덱의 원본 JSON 바이트를 그대로 복원합니다."""
+        deck_id = self.resolve(deck_id)
+        row = self.conn.execute('SELECT manifest FROM decks WHERE id = ?', (deck_id,)).fetchone()
+        manifest = json.loads(row[0])
+        if 'raw' in manifest:
+            return self._get_blob(manifest['raw'])
+
+        data = {}
+        for key, kind, value in manifest['fields']:
+            if kind == 'slides':
+                data[key] = [json.loads(self._get_blob(digest)) for digest in value]
+            elif kind == 'ref':
+                data[key] = json.loads(self._get_blob(value))
+            else:
+                data[key] = value
+        fmt = manifest['format']
+        text = json.dumps(data, ensure_ascii=False, indent=fmt['indent']) + ('\n' if fmt['newline'] else '')
+        return text.encode('utf-8')
+
+    def get(self, deck_id):
+        """보관한 덱을 슬라이드 데이터(dict)로 반환합니다."""
+        return json.loads(self.get_bytes(deck_id))
+
+    def list(self):
+        return self.conn.execute(
+            'SELECT id, topic, source_path, size, archived_at FROM decks ORDER BY archived_at').fetchall()
+
+    def stats(self):
+        decks, original = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM decks').fetchone()
+        blobs, raw, stored = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs').fetchone()
+        dict_size = self.conn.execute('SELECT COALESCE(SUM(LENGTH(data)), 0) FROM dictionaries').fetchone()[0]
+        return {'decks': decks, 'original_bytes': original, 'blobs': blobs, 'unique_bytes': raw,
+                'stored_bytes': stored, 'dictionary_bytes': dict_size, 'codec': self.codec}
+
+
+def load_deck(deck_id, path=ARCHIVE_FILE):
+    """보관소에서 덱 하나를 꺼내 슬라이드 데이터로 반환합니다."""
+    if not os.path.exists(path):
+        raise KeyError(f"덱 보관소가 없습니다: {path}")
+    archive = DeckArchive(path)
+    try:
+        return archive.get(deck_id)
+    finally:
+        archive.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="생성된 덱 압축 보관소")
+    parser.add_argument('--db', default=ARCHIVE_FILE, help=f"보관소 경로 (기본: {ARCHIVE_FILE})")
+    parser.add_argument('--codec', choices=('zstd', 'zlib'), help="압축 방식 (기본: zstandard가 있으면 zstd)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add_parser = commands.add_parser('add', help="JSON 파일 보관")
+    add_parser.add_argument('paths', nargs='*', help="보관할 파일 (생략 시 slides_generated/enhanced_*.json)")
+    add_parser.add_argument('--remove', action='store_true', help="복원 결과가 원본과 같으면 원본 파일 삭제")
+    get_parser = commands.add_parser('get', help="덱 꺼내기")
+    get_parser.add_argument('deck_id')
+    get_parser.add_argument('-o', '--output', help="저장할 경로 (생략 시 표준 출력)")
+    commands.add_parser('list', help="보관한 덱 목록")
+    commands.add_parser('stats', help="저장 공간 통계")
+    commands.add_parser('repack', help="보관한 슬라이드로 사전을 다시 학습하고 전체 재압축")
+    args = parser.parse_args()
+
+    archive = DeckArchive(args.db, args.codec)
+    if args.command == 'add':
+        paths = args.paths or sorted(glob.glob('slides_generated_*.json') + glob.glob('slides_enhanced_*.json'))
+        added = 0
+        for path in paths:
+            try:
+                deck_id, is_new = archive.add(path)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠ 보관 실패: {path} - {e}")
+                continue
+            added += is_new
+            print(f"{'✓' if is_new else '='} {deck_id[:12]}  {path}")
+            if args.remove:
+                with open(path, 'rb') as f:
+                    if f.read() == archive.get_bytes(deck_id):
+                        os.remove(path)
+        print(f"\n✓ {len(paths)}개 중 {added}개 새로 보관")
+    elif args.command == 'get':
+        data = archive.get_bytes(args.deck_id)
+        if args.output:
+            with open(args.output, 'wb') as f:
+                f.write(data)
+            print(f"✓ 저장: {args.output}")
+        else:
+            print(data.decode('utf-8'))
+    elif args.command == 'list':
+        for deck_id, topic, source_path, size, archived_at in archive.list():
+            print(f"{deck_id[:12]}  {archived_at}  {size:>8,}B  {topic}  ({source_path})")
+    elif args.command == 'repack':
+        slides = []
+        for (deck_id,) in archive.conn.execute('SELECT id FROM decks').fetchall():
+            data = archive.get(deck_id)
+            slides.extend(data.get('slides', []) if isinstance(data, dict) else [])
+        with archive.conn:
+            archive.train(slides)
+        archive.repack()
+        print("✓ 사전 재학습 및 재압축 완료")
+    if args.command in ('stats', 'repack'):
+        s = archive.stats()
+        ratio = s['original_bytes'] / max(1, s['stored_bytes'] + s['dictionary_bytes'])
+        print(f"덱 {s['decks']}개, 고유 블롭 {s['blobs']}개 ({s['codec']})")
+        print(f"원본 {s['original_bytes']:,}B → 중복 제거 {s['unique_bytes']:,}B → "
+              f"압축 {s['stored_bytes']:,}B + 사전 {s['dictionary_bytes']:,}B ({ratio:.1f}배)")
+    archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+"""
+다국어 덱 변형(variant) 생성 스크립트
+원본 덱은 한 번만 생성하고, 제목과 본문만 여러 언어로 동시에 번역해 언어별 PPT를 만듭니다.
+번역은 언어마다 고유 문자열을 모아 묶음 단위로 요청하므로, 슬라이드마다 반복되는 문구나
+이전 실행에서 이미 번역한 문자열(.cache/translations.json)은 다시 요청하지 않습니다.
+
+design_theme 값과 image_prompt는 렌더러와 이미지 캐시가 키로 쓰는 값이라 번역하지 않습니다.
+덕분에 원본 덱에서 생성한 이미지를 모든 언어 변형이 그대로 재사용합니다.
+
+사용 예:
+    python deck_variants.py "트랜스포머와 GPT" --languages en ja --slides 10 --images local
+    python deck_variants.py --source slides.json --languages en ja zh
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import adaptive_concurrency
+import generate_ppt
+import hedging
+import image_generation
+import prompts
+import run_checkpoint
+
+TRANSLATION_CACHE_FILE = os.path.join('.cache', 'translations.json')
+TRANSLATION_CACHE_VERSION = 1
+TRANSLATION_BATCH = 60  # 요청 하나에 담을 최대 문자열 수
+SOURCE_LANGUAGE = 'ko'
+
+LANGUAGES = {
+    'ko': '한국어',
+    'en': '영어 (English)',
+    'ja': '일본어 (日本語)',
+    'zh': '중국어 간체 (简体中文)',
+    'es': '스페인어 (Español)',
+    'fr': '프랑스어 (Français)',
+    'de': '독일어 (Deutsch)',
+}
+
+
+def _usage_tokens(response):
+    """응답의 usage_metadata에서 (입력 토큰, 출력 토큰)을 꺼냅니다. 없으면 (0, 0)."""
+    usage = getattr(response, 'usage_metadata', None)
+    return (getattr(usage, 'prompt_token_count', 0) or 0,
+            getattr(usage, 'candidates_token_count', 0) or 0)
+
+
+class TokenCounter:
+    """model 호환 래퍼: 감싼 모델이 사용한 토큰 수를 셉니다."""
+
+    def __init__(self, model):
+        self.model = model
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    @property
+    def model_name(self):
+        return getattr(self.model, 'model_name', None)
+
+    def generate_content(self, *args, **kwargs):
+        response = self.model.generate_content(*args, **kwargs)
+        prompt_tokens, output_tokens = _usage_tokens(response)
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+        return response
+
+    def print_stats(self):
+        if hasattr(self.model, 'print_stats'):
+            self.model.print_stats()
+
+
+class TranslationCache:
+    """언어별 {원문: 번역문} 캐시. 여러 번역 작업이 동시에 갱신할 수 있습니다."""
+
+    def __init__(self, path=TRANSLATION_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == TRANSLATION_CACHE_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, json.JSONDecodeError):
+                pass
+
+    def get(self, language, text):
+        with self._lock:
+            return self.entries.get(language, {}).get(text)
+
+    def update(self, language, pairs):
+        with self._lock:
+            self.entries.setdefault(language, {}).update(pairs)
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with self._lock, open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': TRANSLATION_CACHE_VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def translatable_strings(slides_data):
+    """번역할 고유 문자열 목록 (주제, 제목, 본문, 발표자 노트, 대체 텍스트). 처음 나온 순서를 유지합니다."""
+    strings = [slides_data.get('topic', '')]
+    for slide in slides_data.get('slides', []):
+        strings.append(slide.get('title', ''))
+        strings.extend(slide.get('content', []))
+        strings.extend(slide.get(key) or '' for key in ('notes', 'alt_text'))
+    return list(dict.fromkeys(s for s in strings if s and s.strip()))
+
+
+def build_translation_prompt(strings, language):
+    """번역 요청 프롬프트. 요구사항은 prompts.TRANSLATE_SYSTEM_INSTRUCTION으로 따로 보냅니다."""
+    return prompts.build_translate_prompt(strings, language, LANGUAGES.get(language, language))
+
+
+class Translator:
+    """캐시에 없는 문자열만 묶어서 번역 요청을 보내고 언어별 사용량을 기록합니다."""
+
+    def __init__(self, model, cache, batch_size=TRANSLATION_BATCH):
+        self.model = model
+        self.cache = cache
+        self.batch_size = batch_size
+        self.usage = {}  # 언어 → {'requests', 'cached', 'translated', 'prompt_tokens', 'output_tokens', 'seconds'}
+        self._lock = threading.Lock()
+
+    def _record(self, language, **counts):
+        with self._lock:
+            entry = self.usage.setdefault(language, {'requests': 0, 'cached': 0, 'translated': 0,
+                                                     'failed': 0, 'prompt_tokens': 0,
+                                                     'output_tokens': 0, 'seconds': 0.0})
+            for key, value in counts.items():
+                entry[key] += value
+
+    def missing(self, strings, language):
+        """캐시에 없는 문자열을 batch_size개씩 나눈 묶음 목록"""
+        todo = [s for s in strings if self.cache.get(language, s) is None]
+        self._record(language, cached=len(strings) - len(todo))
+        return [todo[i:i + self.batch_size] for i in range(0, len(todo), self.batch_size)]
+
+    def translate_batch(self, strings, language):
+        """문자열 묶음 하나를 번역해 캐시에 넣습니다. 실패하면 원문을 유지합니다."""
+        start = time.perf_counter()
+        try:
+            response = self.model.generate_content(
+                build_translation_prompt(strings, language),
+                system_instruction=prompts.TRANSLATE_SYSTEM_INSTRUCTION,
+                generation_config=generate_ppt.genai.types.GenerationConfig(
+                    temperature=0.2,  # 번역은 일관성이 중요
+                    max_output_tokens=8192,
+                )
+            )
+            prompt_tokens, output_tokens = _usage_tokens(response)
+            prompts.record_usage('translate', response)
+            translated = generate_ppt.parse_json_response(response.text)
+            if not isinstance(translated, list) or len(translated) != len(strings):
+                raise ValueError(f"문자열 {len(strings)}개를 보냈는데 {len(translated)}개가 돌아왔습니다")
+        except Exception as e:
+            print(f"  ⚠ [{language}] 번역 실패 ({len(strings)}개 문자열은 원문 유지): {e}")
+            self._record(language, requests=1, failed=len(strings), seconds=time.perf_counter() - start)
+            return
+        self.cache.update(language, dict(zip(strings, map(str, translated))))
+        self._record(language, requests=1, translated=len(strings), prompt_tokens=prompt_tokens,
+                     output_tokens=output_tokens, seconds=time.perf_counter() - start)
+
+    def apply(self, slides_data, language):
+        """캐시의 번역으로 변형 덱을 만듭니다. 번역이 없는 문자열은 원문을 사용합니다."""
+        def tr(text):
+            return self.cache.get(language, text) or text
+
+        variant = {**slides_data, 'topic': tr(slides_data.get('topic', '')), 'language': language}
+        variant['slides'] = []
+        for slide in slides_data.get('slides', []):
+            translated = {**slide, 'title': tr(slide.get('title', '')),
+                          'content': [tr(point) for point in slide.get('content', [])]}
+            for key in ('notes', 'alt_text'):
+                if slide.get(key):
+                    translated[key] = tr(slide[key])
+            variant['slides'].append(translated)
+        return variant
+
+
+def translate_variants(slides_data, languages, translator, workers=4):
+    """모든 언어의 번역 묶음 요청을 바로 시작하고, 번역이 끝난 언어부터 (언어, 변형 덱)을 내놓는 반복자를 반환합니다.
+
+    요청은 반환 즉시 백그라운드에서 진행되므로 그동안 원본 덱을 렌더링할 수 있습니다.
+    """
+    strings = translatable_strings(slides_data)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translate')
+    pending = {}
+    for language in languages:
+        batches = translator.missing(strings, language)
+        pending[language] = {executor.submit(translator.translate_batch, batch, language) for batch in batches}
+        todo = sum(map(len, batches))
+        print(f"🌐 [{language}] 번역할 문자열 {todo}개 (요청 {len(batches)}회, 캐시 사용 {len(strings) - todo}개)")
+    owner = {future: language for language, futures in pending.items() for future in futures}
+
+    def finished():
+        try:
+            for language in [lang for lang, futures in pending.items() if not futures]:
+                yield language, translator.apply(slides_data, language)
+            for future in as_completed(owner):
+                language = owner[future]
+                pending[language].discard(future)
+                if not pending[language]:
+                    yield language, translator.apply(slides_data, language)
+        finally:
+            executor.shutdown()
+
+    return finished()
+
+
+def variant_filename(slides_data, language):
+    stem, ext = os.path.splitext(generate_ppt.presentation_filename(slides_data.get('topic', '프레젠테이션')))
+    return f'{stem}_{language}{ext}'
+
+
+def print_report(source_seconds, source_tokens, translator, render_seconds):
+    print("\n" + "="*60)
+    print("📊 언어 변형 생성 결과")
+    print("="*60)
+    if source_seconds is not None:
+        print(f"원본 생성: {source_seconds:.1f}초, 토큰 {sum(source_tokens):,}개 "
+              f"(입력 {source_tokens[0]:,} / 출력 {source_tokens[1]:,})")
+    for language, u in translator.usage.items():
+        tokens = u['prompt_tokens'] + u['output_tokens']
+        share = f" (원본 생성 대비 {tokens / sum(source_tokens):.0%})" if source_seconds and sum(source_tokens) else ""
+        failed = f", 실패 {u['failed']}개" if u['failed'] else ""
+        print(f"[{language}] 번역 {u['translated']}개 + 캐시 {u['cached']}개{failed}, "
+              f"요청 {u['requests']}회, 토큰 {tokens:,}개{share}, 요청 시간 합계 {u['seconds']:.1f}초, "
+              f"렌더링 {render_seconds.get(language, 0):.1f}초")
+    print("="*60 + "\n")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="원본 덱을 한 번 생성하고 여러 언어 변형 PPT 만들기")
+    parser.add_argument('topic', nargs='?', help="생성할 프레젠테이션 주제")
+    parser.add_argument('--source', metavar='JSON', help="주제 대신 기존 슬라이드 JSON 사용 (archive:<ID> 가능)")
+    parser.add_argument('--languages', nargs='+', required=True, metavar='LANG',
+                        help=f"번역할 언어 코드 ({', '.join(LANGUAGES)} 등)")
+    parser.add_argument('--source-language', default=SOURCE_LANGUAGE,
+                        help=f"원본 덱의 언어 (기본: {SOURCE_LANGUAGE})")
+    parser.add_argument('--slides', type=int, default=10, help="생성할 슬라이드 개수 (기본: 10)")
+    parser.add_argument('--notes', action='store_true',
+                        help="원본 덱에 발표자 노트와 이미지 대체 텍스트를 함께 생성 (언어별로 함께 번역)")
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--workers', type=int, help="번역 스레드 수 (기본: --concurrency 한도 상한)")
+    parser.add_argument('--concurrency', type=adaptive_concurrency.parse_concurrency, default='auto',
+                        help="동시에 보낼 Gemini 요청 수 (auto: 지연 시간과 429에 따라 자동 조절, 숫자: 고정, 기본: auto)")
+    parser.add_argument('--images', choices=sorted(image_generation.IMAGE_BACKENDS),
+                        default=os.getenv('IMAGE_BACKEND'),
+                        help="image_prompt로 슬라이드 이미지를 생성할 백엔드 (모든 언어가 같은 이미지 사용)")
+    parser.add_argument('--image-workers', type=int, default=4)
+    parser.add_argument('--no-cache', action='store_true', help="번역 캐시를 읽거나 저장하지 않음")
+    parser.add_argument('--hedge', action='store_true',
+                        help="응답이 최근 p90보다 늦으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용")
+    parser.add_argument('--hedge-budget', type=float, default=hedging.HEDGE_BUDGET)
+    parser.add_argument('--stub', action='store_true', help="Gemini API 대신 로컬 스텁 모델 사용 (오프라인 테스트)")
+    args = parser.parse_args()
+    if not args.topic and not args.source:
+        parser.error("주제나 --source 중 하나를 지정하세요.")
+
+    if args.stub:
+        import gemini_stub
+
+        model = gemini_stub.StubGenerativeModel()
+        print("🧪 로컬 스텁 모델 사용")
+    else:
+        model = generate_ppt.initialize_gemini_api()
+    if not model:
+        sys.exit(1)
+    model = adaptive_concurrency.wrap_model(model, args.concurrency)
+    if args.hedge:
+        hedge_workers = max(args.workers or 0, adaptive_concurrency.suggested_workers(model))
+        model = hedging.HedgedModel(model, budget=args.hedge_budget, max_workers=hedge_workers)
+    counter = TokenCounter(model)
+
+    source_seconds, source_tokens = None, (0, 0)
+    if args.source:
+        slides_data = generate_ppt.load_slides_data(args.source)
+    else:
+        start = time.perf_counter()
+        run_dir = run_checkpoint.create_run_dir('variants', {'topic': args.topic, 'num_slides': args.slides,
+                                                             'include_notes': args.notes})
+        slides_data = generate_ppt.generate_slides_with_gemini(args.topic, args.slides, counter, run_dir=run_dir,
+                                                               include_notes=args.notes)
+        source_seconds = time.perf_counter() - start
+        source_tokens = (counter.prompt_tokens, counter.output_tokens)
+        if slides_data:
+            output_json = generate_ppt.save_slides_json(slides_data, 'generated')
+            run_checkpoint.update_run_meta(run_dir, status='done', output_json=output_json)
+            print(f"✓ 원본 슬라이드 데이터 저장: {output_json}")
+        else:
+            generate_ppt.print_resume_hint(run_dir)
+    if not slides_data:
+        sys.exit(1)
+
+    image_backend = None
+    if args.images:
+        try:
+            image_backend = image_generation.get_image_backend(args.images)
+        except ValueError as e:
+            print(f"⚠ 이미지 백엔드를 사용할 수 없습니다: {e}")
+
+    languages = [lang for lang in dict.fromkeys(args.languages) if lang != args.source_language]
+    cache = TranslationCache(None if args.no_cache else TRANSLATION_CACHE_FILE)
+    translator = Translator(counter, cache)
+    render_seconds = {}
+
+    def render(language, deck):
+        start = time.perf_counter()
+        generate_ppt.generate_presentation(deck, output_dir=args.output_dir, image_backend=image_backend,
+                                           image_workers=args.image_workers,
+                                           filename=variant_filename(slides_data, language))
+        render_seconds[language] = time.perf_counter() - start
+
+    variants = translate_variants(slides_data, languages, translator,
+                                  args.workers or adaptive_concurrency.suggested_workers(model))
+    # 번역이 진행되는 동안 원본 덱을 먼저 렌더링해 이미지 캐시를 채움
+    render(args.source_language, slides_data)
+    for language, variant in variants:
+        output_json = generate_ppt.save_slides_json(variant, f'variant_{language}')
+        print(f"✓ [{language}] 슬라이드 데이터 저장: {output_json}")
+        render(language, variant)
+    cache.save()
+
+    print_report(source_seconds, source_tokens, translator, render_seconds)
+    if hasattr(model, 'print_stats'):
+        model.print_stats()
+    prompts.print_usage(model)
+
+
+if __name__ == '__main__':
+    main()
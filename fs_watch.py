@@ -0,0 +1,277 @@
+"""
+파일 시스템 변경 감시
+리눅스에서는 ctypes로 inotify를 직접 사용하고, inotify를 쓸 수 없으면(다른 OS, 감시 개수 한도 초과 등)
+주기적으로 크기와 수정 시각을 비교하는 폴링 방식으로 대신합니다.
+
+두 감시자는 같은 인터페이스를 가집니다.
+    watcher = create_watcher('.', skip_dir=lambda rel_dir: rel_dir.startswith('output'))
+    for changed in iter_changes(watcher):
+        ...  # changed: 바뀐 파일의 상대 경로 집합, None이면 전체를 다시 확인해야 함
+
+경로는 root 기준의 '/' 구분 상대 경로입니다.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+POLL_INTERVAL = 1.0  # 폴링 감시 주기(초)
+DEFAULT_DEBOUNCE = 0.2  # 마지막 변경 후 이만큼 조용하면 한 묶음으로 처리(초)
+
+# 전체를 다시 확인해야 할 때 read()가 반환하는 값 (이벤트 큐 넘침, 디렉토리 이동)
+RESCAN = None
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK if hasattr(os, 'O_NONBLOCK') else 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+
+def _join(rel_dir, name):
+    return f'{rel_dir}/{name}' if rel_dir else name
+
+
+def _walk(root, rel_dir, skip_dir):
+    """rel_dir 아래에서 skip_dir로 가지치기하며 (디렉토리 목록, 파일 목록)을 모읍니다."""
+    dirs, files = [rel_dir], []
+    stack = [rel_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(root, current) if current else root))
+        except OSError:
+            continue
+        for entry in entries:
+            rel_path = _join(current, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                if not (skip_dir and skip_dir(rel_path)):
+                    dirs.append(rel_path)
+                    stack.append(rel_path)
+            else:
+                files.append((rel_path, entry))
+    return dirs, files
+
+
+class InotifyWatcher:
+    """inotify 기반 감시자. 디렉토리마다 감시를 걸고 새로 생긴 디렉토리에도 자동으로 추가합니다.
+
+    extra_dirs는 하위 디렉토리 없이 그 디렉토리만 감시합니다 (예: .git의 index 변경 감지).
+    """
+
+    backend = 'inotify'
+
+    def __init__(self, root='.', skip_dir=None, extra_dirs=()):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify는 리눅스에서만 사용할 수 있습니다")
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.root = root
+        self.skip_dir = skip_dir
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._dirs = {}  # wd → 상대 디렉토리 경로
+        try:
+            self._add_tree('')
+            for rel_dir in extra_dirs:
+                if os.path.isdir(os.path.join(root, rel_dir)):
+                    self._add_watch(rel_dir)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, rel_dir):
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return  # 감시를 거는 사이 사라졌거나 읽을 수 없는 디렉토리
+            # ENOSPC: fs.inotify.max_user_watches 한도 초과 → 호출한 쪽에서 폴링으로 전환
+            raise OSError(err, f"inotify 감시 추가 실패: {path}: {os.strerror(err)}")
+        self._dirs[wd] = rel_dir
+
+    def _add_tree(self, rel_dir):
+        """rel_dir과 하위 디렉토리를 모두 감시하고, 그 안의 파일 목록을 반환합니다."""
+        dirs, files = _walk(self.root, rel_dir, self.skip_dir)
+        for d in dirs:
+            self._add_watch(d)
+        return {rel_path for rel_path, _ in files}
+
+    def wait(self, timeout=None):
+        """이벤트가 생길 때까지 최대 timeout초 기다립니다. 이벤트가 있으면 True."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        return bool(ready)
+
+    def read(self, timeout=0):
+        """쌓인 이벤트를 읽어 바뀐 파일 경로 집합을 반환합니다 (전체 재확인이 필요하면 RESCAN)."""
+        changed = set()
+        if not self.wait(timeout):
+            return changed
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed = RESCAN
+                    continue
+                rel_dir = self._dirs.get(wd)
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if rel_dir is None or changed is RESCAN:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    if not rel_dir:
+                        changed = RESCAN  # 감시 중인 루트 자체가 사라짐
+                    continue
+                rel_path = _join(rel_dir, os.fsdecode(name))
+                if not mask & IN_ISDIR:
+                    changed.add(rel_path)
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    if not (self.skip_dir and self.skip_dir(rel_path)):
+                        changed.update(self._add_tree(rel_path))
+                elif mask & IN_MOVED_FROM:
+                    # 디렉토리가 통째로 옮겨지면 안의 파일 이벤트가 오지 않으므로 전체 재확인
+                    changed = RESCAN
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """주기적으로 파일의 크기와 수정 시각을 비교하는 감시자
+
+    wait()와 read()를 서로 다른 스레드에서 호출해도 안전합니다.
+    """
+
+    backend = 'polling'
+
+    def __init__(self, root='.', skip_dir=None, extra_dirs=(), interval=POLL_INTERVAL):
+        self.root = root
+        self.skip_dir = skip_dir
+        self.extra_dirs = tuple(extra_dirs)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + interval
+        self._pending = set()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        _, files = _walk(self.root, '', self.skip_dir)
+        for rel_dir in self.extra_dirs:
+            try:
+                entries = os.scandir(os.path.join(self.root, rel_dir))
+                files.extend((_join(rel_dir, e.name), e) for e in entries
+                             if not e.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+        for rel_path, entry in files:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            snapshot[rel_path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def _poll(self):
+        with self._lock:
+            snapshot = self._take_snapshot()
+            old = self._snapshot
+            self._snapshot = snapshot
+            self._next_poll = time.monotonic() + self.interval
+            self._pending |= {path for path in snapshot.keys() | old.keys()
+                              if snapshot.get(path) != old.get(path)}
+
+    def wait(self, timeout=None):
+        """다음 폴링 시각까지 (최대 timeout초) 기다렸다가 비교합니다. 변경이 있으면 True."""
+        if not self._pending:
+            delay = max(0.0, self._next_poll - time.monotonic())
+            if timeout is not None and timeout < delay:
+                time.sleep(timeout)
+                return False
+            time.sleep(delay)
+            self._poll()
+        return bool(self._pending)
+
+    def read(self, timeout=0):
+        """바뀐 파일 경로 집합을 반환합니다. timeout=0이면 주기와 관계없이 바로 비교합니다."""
+        if timeout == 0:
+            self._poll()
+        else:
+            self.wait(timeout)
+        with self._lock:
+            changed, self._pending = self._pending, set()
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(root='.', skip_dir=None, extra_dirs=(), polling=False, interval=POLL_INTERVAL):
+    """가능하면 inotify 감시자를, 아니면 폴링 감시자를 만듭니다."""
+    if not polling:
+        try:
+            return InotifyWatcher(root, skip_dir, extra_dirs)
+        except (OSError, AttributeError) as e:
+            print(f"⚠ inotify를 사용할 수 없어 폴링으로 감시합니다 ({interval:g}초 간격): {e}")
+    return PollingWatcher(root, skip_dir, extra_dirs, interval)
+
+
+def iter_changes(watcher, debounce=DEFAULT_DEBOUNCE, stop=None):
+    """변경을 묶음 단위로 내놓습니다.
+
+    변경이 시작되면 debounce초 동안 더 이상 변경이 없을 때까지 모아서 한 번에 내놓으므로,
+    편집기가 저장하면서 만드는 여러 이벤트가 한 묶음으로 처리됩니다.
+    stop(threading.Event)이 설정되면 끝납니다.
+    """
+    while not (stop and stop.is_set()):
+        if not watcher.wait(0.5):
+            continue
+        batch = watcher.read(0)
+        while batch is not RESCAN:
+            more = watcher.read(debounce)
+            if more is RESCAN:
+                batch = RESCAN
+            elif not more:
+                break
+            else:
+                batch |= more
+        if batch is RESCAN:
+            # 남은 이벤트는 전체 재확인에 포함되므로 비움
+            while watcher.read(debounce) != set():
+                pass
+        if batch is RESCAN or batch:
+            yield batch
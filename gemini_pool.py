@@ -0,0 +1,262 @@
+"""
+여러 API 키와 모델을 묶어 쓰는 Gemini 요청 풀
+키 하나의 할당량에 처리량이 묶이지 않도록 (키, 모델) 조합마다 요청을 분산합니다.
+- 남은 분당 할당량과 최근 오류율로 점수를 매겨 가장 여유 있는 조합으로 보냅니다.
+- 429나 5xx를 돌려준 조합은 서킷 브레이커로 일정 시간 쉬게 하고 다른 조합으로 재시도합니다.
+풀은 generate_content를 제공하므로 genai.GenerativeModel 대신 그대로 넘겨 쓸 수 있습니다.
+
+설정 방법 (우선순위 순):
+1. GEMINI_POOL_CONFIG 환경 변수가 가리키는 JSON 파일, 또는 현재 디렉토리의 gemini_pool.json
+2. GEMINI_API_KEYS(쉼표 구분), GEMINI_MODELS(쉼표 구분), GEMINI_RPM 환경 변수
+둘 다 없으면 기존처럼 GEMINI_API_KEY 하나로 단일 모델을 사용합니다.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+POOL_CONFIG_FILE = 'gemini_pool.json'
+DEFAULT_MODEL = 'gemini-pro'
+DEFAULT_COOLDOWN = 30.0  # 첫 실패 후 쉬는 시간(초), 연속 실패마다 두 배
+MAX_COOLDOWN = 300.0
+MAX_WAIT = 120.0  # 모든 조합이 쉬는 중일 때 기다릴 최대 시간(초)
+ERROR_WINDOW = 20  # 오류율을 계산할 최근 요청 수
+RATE_WINDOW = 60.0  # 분당 할당량 계산 구간(초)
+
+# 서킷 브레이커를 여는 상태 코드 (할당량 초과, 서버 오류)
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+
+def error_code(error):
+    """google.api_core 예외나 스텁 예외에서 HTTP 상태 코드를 꺼냅니다. 없으면 None."""
+    code = getattr(error, 'code', None)
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def _mask_key(api_key):
+    return f"{api_key[:6]}...{api_key[-4:]}" if len(api_key) > 12 else '***'
+
+
+class PoolMember:
+    """(API 키, 모델) 조합 하나의 상태"""
+
+    def __init__(self, label, model, model_name, rpm=None):
+        self.label = label
+        self.model = model
+        self.model_name = model_name
+        self.rpm = rpm
+        self.in_flight = 0
+        self.sent = deque()  # 최근 RATE_WINDOW초 동안 보낸 요청 시각
+        self.outcomes = deque(maxlen=ERROR_WINDOW)  # 최근 요청 성공 여부
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.circuit_opens = 0
+
+    def _expire(self, now):
+        while self.sent and self.sent[0] <= now - RATE_WINDOW:
+            self.sent.popleft()
+
+    def remaining_quota(self, now):
+        self._expire(now)
+        return None if self.rpm is None else self.rpm - len(self.sent)
+
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def ready_at(self, now):
+        """이 조합으로 다음 요청을 보낼 수 있는 시각"""
+        ready = max(now, self.cooldown_until)
+        remaining = self.remaining_quota(now)
+        if remaining is not None and remaining <= 0:
+            ready = max(ready, self.sent[0] + RATE_WINDOW)
+        return ready
+
+    def score(self, now):
+        """남은 할당량 비율 × 성공률 ÷ (진행 중 요청 + 1). 클수록 여유 있는 조합입니다."""
+        remaining = self.remaining_quota(now)
+        quota = 1.0 if remaining is None else remaining / self.rpm
+        return quota * (1.0 - self.error_rate()) / (self.in_flight + 1)
+
+
+def attach_client(model, client):
+    """genai.GenerativeModel이 client(glm.GenerativeServiceClient)로 요청을 보내도록 연결합니다.
+
+    google-generativeai에는 모델별 클라이언트를 넘기는 공개 인자가 없어 모델의 _client 속성에 넣습니다.
+    requirements.txt는 이 속성이 있는 버전으로 고정하며, 속성이 없는 버전이면 조용히 전역 키로
+    요청하지 않도록 바로 오류를 냅니다.
+    """
+    if not hasattr(model, '_client'):
+        import google.generativeai as genai
+
+        raise RuntimeError(f"google-generativeai {getattr(genai, '__version__', '?')}에서는 키별 클라이언트를 "
+                           "연결할 수 없습니다. requirements.txt의 버전으로 설치하세요: "
+                           "pip install -r requirements.txt")
+    model._client = client
+
+
+def _genai_model_factory(api_key, model_name):
+    """키마다 별도 클라이언트를 가진 GenerativeModel을 만듭니다.
+
+    genai.configure는 프로세스 전역 설정이므로, 공개 API인 glm.GenerativeServiceClient로
+    키별 클라이언트를 만들어 모델에 직접 연결합니다.
+    system_instruction 인자를 받을 수 있도록 SystemInstructionModel로 감싸고, 같은 클라이언트를 넘깁니다.
+    """
+    import google.generativeai as genai
+    from google.ai import generativelanguage as glm
+
+    import prompts
+
+    client = glm.GenerativeServiceClient(client_options={'api_key': api_key})
+    model = genai.GenerativeModel(model_name)
+    attach_client(model, client)
+    return prompts.SystemInstructionModel(model, client)
+
+
+class GeminiPool:
+    """여러 (키, 모델) 조합에 요청을 나눠 보내는 model 호환 객체"""
+
+    def __init__(self, members, cooldown=DEFAULT_COOLDOWN, max_cooldown=MAX_COOLDOWN,
+                 max_wait=MAX_WAIT, clock=time.monotonic):
+        if not members:
+            raise ValueError("풀에 API 키가 하나 이상 필요합니다.")
+        self.members = members
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_wait = max_wait
+        self.clock = clock
+        self._cond = threading.Condition()
+
+    @property
+    def model_name(self):
+        return self.members[0].model_name
+
+    @classmethod
+    def from_config(cls, config, model_factory=None):
+        """설정 딕셔너리로 풀을 만듭니다.
+
+        config = {
+            'models': ['gemini-pro'],
+            'cooldown_seconds': 30,
+            'keys': [{'env': 'GEMINI_API_KEY', 'rpm': 15}, {'api_key': '...', 'models': [...]}],
+        }
+        """
+        model_factory = model_factory or _genai_model_factory
+        default_models = config.get('models') or [DEFAULT_MODEL]
+        members = []
+        for index, entry in enumerate(config.get('keys', []), 1):
+            if isinstance(entry, str):
+                entry = {'api_key': entry}
+            api_key = entry.get('api_key') or os.getenv(entry.get('env', ''))
+            if not api_key:
+                print(f"  ⚠ API 키를 찾을 수 없어 건너뜁니다: {entry.get('env') or f'{index}번째 키'}")
+                continue
+            label = entry.get('env') or f"key{index}({_mask_key(api_key)})"
+            for model_name in entry.get('models') or default_models:
+                members.append(PoolMember(f"{label}/{model_name}", model_factory(api_key, model_name),
+                                          model_name, entry.get('rpm', config.get('rpm'))))
+        return cls(members, cooldown=config.get('cooldown_seconds', DEFAULT_COOLDOWN),
+                   max_cooldown=config.get('max_cooldown_seconds', MAX_COOLDOWN),
+                   max_wait=config.get('max_wait_seconds', MAX_WAIT))
+
+    def _acquire(self, tried):
+        """아직 시도하지 않은 조합 중 가장 여유 있는 것을 고릅니다. 없으면 None을 반환합니다."""
+        deadline = self.clock() + self.max_wait
+        with self._cond:
+            while True:
+                now = self.clock()
+                untried = [m for m in self.members if m not in tried]
+                if not untried:
+                    return None
+                ready = [m for m in untried if m.ready_at(now) <= now]
+                if ready:
+                    member = max(ready, key=lambda m: m.score(now))
+                    member.in_flight += 1
+                    member.requests += 1
+                    member.sent.append(now)
+                    return member
+                wake = min(m.ready_at(now) for m in untried)
+                if wake > deadline:
+                    return None
+                self._cond.wait(wake - now)
+
+    def _release(self, member, ok):
+        with self._cond:
+            member.in_flight -= 1
+            member.outcomes.append(ok)
+            if ok:
+                member.consecutive_failures = 0
+            else:
+                member.failures += 1
+                member.consecutive_failures += 1
+                member.circuit_opens += 1
+                delay = min(self.max_cooldown, self.cooldown * 2 ** (member.consecutive_failures - 1))
+                member.cooldown_until = self.clock() + delay
+                print(f"  ⚠ {member.label}: 일시적 오류로 {delay:.0f}초 동안 제외합니다.")
+            self._cond.notify_all()
+
+    def generate_content(self, *args, **kwargs):
+        """가장 여유 있는 조합으로 요청을 보내고, 429/5xx면 다른 조합으로 재시도합니다."""
+        tried = set()
+        last_error = None
+        while True:
+            member = self._acquire(tried)
+            if member is None:
+                if last_error:
+                    raise last_error
+                raise RuntimeError("사용 가능한 Gemini API 키가 없습니다 (모두 할당량 초과 또는 대기 중).")
+            tried.add(member)
+            try:
+                response = member.model.generate_content(*args, **kwargs)
+            except Exception as e:
+                if error_code(e) not in RETRYABLE_CODES:
+                    # 잘못된 요청 등은 키를 바꿔도 같으므로 키의 오류로 치지 않고 바로 전달
+                    self._release(member, True)
+                    raise
+                self._release(member, False)
+                last_error = e
+                continue
+            self._release(member, True)
+            return response
+
+    def stats(self):
+        """조합별 요청 수, 실패 수, 서킷 브레이커 작동 횟수를 반환합니다."""
+        with self._cond:
+            now = self.clock()
+            return [{
+                'member': m.label,
+                'requests': m.requests,
+                'failures': m.failures,
+                'circuit_opens': m.circuit_opens,
+                'cooling_down': m.cooldown_until > now,
+                'remaining_quota': m.remaining_quota(now),
+            } for m in self.members]
+
+    def print_stats(self):
+        print("\n🔑 API 키 풀 사용 현황")
+        for s in self.stats():
+            state = "대기 중" if s['cooling_down'] else "정상"
+            print(f"  {s['member']}: 요청 {s['requests']}회, 실패 {s['failures']}회, "
+                  f"차단 {s['circuit_opens']}회 ({state})")
+
+
+def load_pool_config(path=None):
+    """풀 설정을 파일이나 환경 변수에서 읽습니다. 풀이 설정되지 않았으면 None을 반환합니다."""
+    path = path or os.getenv('GEMINI_POOL_CONFIG') or POOL_CONFIG_FILE
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    keys = [k.strip() for k in os.getenv('GEMINI_API_KEYS', '').split(',') if k.strip()]
+    if not keys:
+        return None
+    models = [m.strip() for m in os.getenv('GEMINI_MODELS', '').split(',') if m.strip()]
+    rpm = os.getenv('GEMINI_RPM')
+    return {'keys': keys, 'models': models or [DEFAULT_MODEL], 'rpm': int(rpm) if rpm else None}
+
@@ -0,0 +1,291 @@
+"""
+오프라인 테스트용 Gemini 스텁 백엔드
+API 키 없이 생성 파이프라인과 부하 측정을 돌려볼 수 있도록 두 가지 형태를 제공합니다.
+- StubGenerativeModel: genai.GenerativeModel과 같은 generate_content 인터페이스의 인프로세스 모델
+- 스텁 서버: Gemini REST 엔드포인트(generateContent / streamGenerateContent)를 흉내내는 로컬 HTTP 서버
+지연 시간, 토큰 생성 속도, 오류 비율을 조절해 실제 API와 비슷한 부하 특성을 재현합니다.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from prompts import estimate_tokens
+
+DEFAULT_TTFT = 0.3  # 첫 토큰까지의 평균 지연(초)
+DEFAULT_TOKENS_PER_SECOND = 200.0
+DEFAULT_JITTER = 0.3  # 지연 시간의 로그정규 분포 표준편차
+STREAM_CHUNK_TOKENS = 20
+
+# 오류 코드별 상대 비율과 Gemini API의 상태 문자열
+ERROR_WEIGHTS = {429: 0.6, 500: 0.2, 503: 0.2}
+ERROR_STATUS = {429: 'RESOURCE_EXHAUSTED', 500: 'INTERNAL', 503: 'UNAVAILABLE'}
+
+_SLIDE_COUNT = re.compile(r'(\d+)\s*(?:개의 슬라이드|장의 슬라이드|slides)')
+_TOPIC = re.compile(r'주제:\s*(.+)')
+_TITLE = re.compile(r'제목:\s*(.+)')
+_TARGET_LANGUAGE = re.compile(r'대상 언어:\s*(\S+)')
+TRANSLATION_MARKER = '번역할 문자열:'
+
+STUB_THEME = {
+    'primary_color': '#667eea',
+    'secondary_color': '#764ba2',
+    'accent_color': '#f093fb',
+    'style': 'glassmorphism',
+}
+
+
+class StubAPIError(Exception):
+    """스텁이 흉내내는 API 오류. google.api_core 예외처럼 HTTP 상태 코드를 code로 가집니다."""
+
+    def __init__(self, code, message=None):
+        self.code = code
+        super().__init__(f"{code} {message or ERROR_STATUS.get(code, 'ERROR')}")
+
+
+def prompt_text(prompt):
+    """문자열이나 parts 리스트 형태의 프롬프트를 하나의 문자열로 합칩니다."""
+    if isinstance(prompt, str):
+        return prompt
+    return '\n'.join(part if isinstance(part, str) else str(part) for part in prompt)
+
+
+def stub_response_text(prompt):
+    """프롬프트 종류에 맞는 결정적인 응답 텍스트를 만듭니다.
+
+    슬라이드 생성 프롬프트에는 slides JSON(요청하면 notes/alt_text 포함), 개선 프롬프트에는 title/content JSON,
+    번역 프롬프트에는 각 문자열 앞에 언어 코드를 붙인 배열,
+    그 밖의 프롬프트에는 짧은 인사말을 돌려줍니다.
+    """
+    if TRANSLATION_MARKER in prompt:
+        language_match = _TARGET_LANGUAGE.search(prompt)
+        language = language_match.group(1) if language_match else 'xx'
+        strings = json.loads(prompt.split(TRANSLATION_MARKER, 1)[1].strip())
+        return json.dumps([f'[{language}] {text}' for text in strings], ensure_ascii=False)
+
+    if '"slides"' in prompt:
+        match = _SLIDE_COUNT.search(prompt)
+        count = int(match.group(1)) if match else 5
+        topic_match = _TOPIC.search(prompt)
+        topic = topic_match.group(1).strip() if topic_match else '스텁 주제'
+        slides = [{
+            'title': f'{topic} {i}',
+            'content': [
+                f'**핵심 개념 {i}**: {topic}의 {i}번째 주제',
+                '재미있는 비유: 마치 스텁 서버처럼 항상 같은 답을 줍니다',
+                f'구체적인 예시와 수치: {i * 10}%',
+                '**강조할 포인트**: 오프라인 테스트용 콘텐츠',
+            ],
+            'image_prompt': f'modern glassmorphism style, gradient background with purple and blue tones, '
+                            f'diagram of {topic} part {i}',
+        } for i in range(1, count + 1)]
+        if '"notes"' in prompt:
+            for i, slide in enumerate(slides, 1):
+                slide['notes'] = f'{topic}의 {i}번째 내용을 설명합니다. 스텁 발표자 노트입니다.'
+                slide['alt_text'] = f'{topic} {i}번째 개념을 보여주는 글라스모피즘 다이어그램'
+        return json.dumps({'topic': topic, 'design_theme': STUB_THEME, 'slides': slides},
+                          ensure_ascii=False, indent=2)
+
+    if '개선된 제목' in prompt:
+        title_match = _TITLE.search(prompt)
+        title = title_match.group(1).strip() if title_match else '슬라이드'
+        return json.dumps({
+            'title': f'{title} (개선)',
+            'content': ['개선된 포인트 1', '개선된 포인트 2', '개선된 포인트 3'],
+        }, ensure_ascii=False, indent=2)
+
+    return '안녕하세요! 스텁 백엔드입니다. 실제 API 대신 로컬에서 응답하고 있어요.'
+
+
+class StubBehavior:
+    """지연 시간과 오류를 샘플링하는 스텁의 부하 특성"""
+
+    def __init__(self, ttft=DEFAULT_TTFT, tokens_per_second=DEFAULT_TOKENS_PER_SECOND,
+                 jitter=DEFAULT_JITTER, error_rate=0.0, seed=None):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self):
+        """(첫 토큰 지연, 오류 코드 또는 None)을 샘플링합니다."""
+        with self._lock:
+            ttft = self.ttft * self._rng.lognormvariate(0.0, self.jitter) if self.ttft else 0.0
+            error = None
+            if self._rng.random() < self.error_rate:
+                codes = list(ERROR_WEIGHTS)
+                error = self._rng.choices(codes, weights=[ERROR_WEIGHTS[c] for c in codes])[0]
+        return ttft, error
+
+    def token_delay(self, tokens):
+        """tokens개를 생성하는 데 걸리는 시간(초)"""
+        return tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+
+def _usage(prompt, text):
+    prompt_tokens = estimate_tokens(prompt)
+    output_tokens = estimate_tokens(text)
+    return prompt_tokens, output_tokens
+
+
+def _split_text(text, chunk_tokens=STREAM_CHUNK_TOKENS):
+    step = chunk_tokens * 4
+    return [text[i:i + step] for i in range(0, len(text), step)] or ['']
+
+
+class StubGenerativeModel:
+    """genai.GenerativeModel 대신 쓸 수 있는 인프로세스 스텁 모델
+
+    기본값은 지연 없이 즉시 응답하며, ttft/tokens_per_second/error_rate로 실제 API의 부하 특성을 흉내냅니다.
+    """
+
+    def __init__(self, model_name='stub', ttft=0.0, tokens_per_second=None, jitter=0.0,
+                 error_rate=0.0, seed=None):
+        self.model_name = model_name
+        self.behavior = StubBehavior(ttft, tokens_per_second, jitter, error_rate, seed)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, contents, generation_config=None, stream=False, system_instruction=None,
+                         **kwargs):
+        with self._lock:
+            self.calls += 1
+        # 실제 API처럼 system instruction도 입력 토큰에 포함
+        prompt = prompt_text(contents)
+        if system_instruction:
+            prompt = f"{system_instruction}\n\n{prompt}"
+        ttft, error = self.behavior.sample()
+        time.sleep(ttft)
+        if error:
+            raise StubAPIError(error)
+
+        text = stub_response_text(prompt)
+        prompt_tokens, output_tokens = _usage(prompt, text)
+        usage = SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens,
+                                total_token_count=prompt_tokens + output_tokens)
+        if stream:
+            return self._stream(text, usage)
+        time.sleep(self.behavior.token_delay(output_tokens))
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def _stream(self, text, usage):
+        for part in _split_text(text):
+            time.sleep(self.behavior.token_delay(estimate_tokens(part)))
+            yield SimpleNamespace(text=part, usage_metadata=usage)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Gemini REST API의 generateContent / streamGenerateContent 요청을 처리합니다."""
+
+    path_pattern = re.compile(r'^/v1beta/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)')
+
+    def log_message(self, format, *args):
+        pass  # 부하 측정 중 요청마다 로그가 찍히지 않게 함
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        match = self.path_pattern.match(self.path)
+        if not match:
+            self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b'{}')
+        system_instruction = request.get('systemInstruction') or request.get('system_instruction') or {}
+        prompt = '\n'.join(part.get('text', '') for content in [system_instruction, *request.get('contents', [])]
+                           for part in content.get('parts', []))
+        behavior = self.server.behavior
+        ttft, error = behavior.sample()
+        time.sleep(ttft)
+        if error:
+            self._send_json(error, {'error': {'code': error, 'message': 'stub error',
+                                              'status': ERROR_STATUS[error]}})
+            return
+
+        text = stub_response_text(prompt)
+        max_tokens = (request.get('generationConfig') or {}).get('maxOutputTokens')
+        if max_tokens:
+            text = text[:max_tokens * 4]
+        prompt_tokens, output_tokens = _usage(prompt, text)
+        usage = {'promptTokenCount': prompt_tokens, 'candidatesTokenCount': output_tokens,
+                 'totalTokenCount': prompt_tokens + output_tokens}
+
+        if match.group('method') == 'generateContent':
+            time.sleep(behavior.token_delay(output_tokens))
+            self._send_json(200, {'candidates': [_candidate(text, 'STOP')], 'usageMetadata': usage})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        parts = _split_text(text)
+        for i, part in enumerate(parts):
+            if i:
+                time.sleep(behavior.token_delay(estimate_tokens(part)))
+            last = i == len(parts) - 1
+            chunk = {'candidates': [_candidate(part, 'STOP' if last else None)]}
+            if last:
+                chunk['usageMetadata'] = usage
+            self.wfile.write(b'data: ' + json.dumps(chunk, ensure_ascii=False).encode('utf-8') + b'\r\n\r\n')
+            self.wfile.flush()
+
+
+def _candidate(text, finish_reason):
+    candidate = {'content': {'role': 'model', 'parts': [{'text': text}]}}
+    if finish_reason:
+        candidate['finishReason'] = finish_reason
+    return candidate
+
+
+def start_stub_server(host='127.0.0.1', port=0, **behavior):
+    """백그라운드 스레드에서 스텁 서버를 시작하고 (서버, 기본 URL)을 반환합니다.
+
+    port=0이면 비어 있는 포트를 자동으로 고릅니다. 종료할 때는 server.shutdown()을 호출하세요.
+    """
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.behavior = StubBehavior(**behavior)
+    threading.Thread(target=server.serve_forever, name='gemini-stub', daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/v1beta'
+
+
+def main():
+    """스텁 서버를 포그라운드에서 실행합니다."""
+    parser = argparse.ArgumentParser(description="Gemini REST API 스텁 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ttft', type=float, default=DEFAULT_TTFT, help="첫 토큰까지의 평균 지연(초)")
+    parser.add_argument('--tokens-per-second', type=float, default=DEFAULT_TOKENS_PER_SECOND)
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER, help="지연 시간 분산 (로그정규 σ)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="429/5xx 오류를 돌려줄 비율 (0~1)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.host, args.port, ttft=args.ttft,
+                                         tokens_per_second=args.tokens_per_second,
+                                         jitter=args.jitter, error_rate=args.error_rate, seed=args.seed)
+    print(f"🧪 Gemini 스텁 서버 실행 중: {base_url}")
+    print("   중지하려면 Ctrl+C를 누르세요.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n스텁 서버를 종료했습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,22 +4,59 @@ slides.json 파일을 읽어 이미지가 포함된 PPT를 생성합니다.
 Google Gemini API를 활용하여 고품질 콘텐츠를 자동 생성합니다.
 """
 
+import argparse
+import io
 import json
 import os
 from pathlib import Path
+import numpy as np
+import PIL
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+import adaptive_concurrency
+import deck_archive
+import gemini_pool
+import hedging
+import html_export
+import image_generation
+import pptx_packaging
+import prompts
+import reproducible_build
+import run_checkpoint
+import size_budget
+import theme_renderer
+import topic_index
+
 # 환경 변수 로드
 load_dotenv()
 
+# 같은 입력의 렌더링 결과가 달라지는 수정(레이아웃, 테마 렌더링 등)을 하면 올려서 덱 캐시를 무효화
+RENDERER_VERSION = 1
+
 def initialize_gemini_api():
-    """Gemini API를 초기화합니다."""
+    """Gemini API를 초기화합니다.
+
+    키 풀(gemini_pool.json 또는 GEMINI_API_KEYS)이 설정되어 있으면
+    여러 키/모델에 요청을 분산하는 GeminiPool을 반환합니다.
+    """
+    try:
+        pool_config = gemini_pool.load_pool_config()
+        if pool_config:
+            pool = gemini_pool.GeminiPool.from_config(pool_config)
+            print(f"✓ Gemini API 키 풀 초기화 완료 ({len(pool.members)}개 키/모델 조합)")
+            return pool
+    except Exception as e:
+        print(f"❌ Gemini API 키 풀 초기화 실패: {e}")
+        return None
+    
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
         print("⚠ 경고: GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
@@ -28,7 +65,7 @@ def initialize_gemini_api():
     
     try:
         genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
+        model = prompts.SystemInstructionModel(genai.GenerativeModel('gemini-pro'))
         print("✓ Gemini API 초기화 완료")
         return model
     except Exception as e:
@@ -36,89 +73,80 @@ def initialize_gemini_api():
         return None
 
 
-def generate_slides_with_gemini(topic, num_slides=5, model=None):
-    """Gemini API를 사용하여 주제에 맞는 슬라이드 콘텐츠를 생성합니다."""
+def parse_json_response(text):
+    """Gemini 응답 텍스트에서 마크다운 코드 블록을 제거하고 JSON으로 파싱합니다."""
+    content = text.strip()
+    if content.startswith('```'):
+        content = content.split('```')[1]
+        if content.startswith('json'):
+            content = content[4:]
+        content = content.strip()
+    return json.loads(content)
+
+
+def generate_slides_with_gemini(topic, num_slides=5, model=None, run_dir=None, existing_titles=None,
+                                include_notes=False):
+    """Gemini API를 사용하여 주제에 맞는 슬라이드 콘텐츠를 생성합니다.
+
+    run_dir이 주어지면 원본 응답과 파싱 결과를 체크포인트로 저장하고,
+    이미 저장된 응답이 있으면 API를 다시 호출하지 않습니다.
+    existing_titles가 주어지면 이미 있는 슬라이드와 겹치지 않는 슬라이드만 요청합니다.
+    include_notes가 True이면 같은 응답에 발표자 노트(notes)와 이미지 대체 텍스트(alt_text)를 함께 요청합니다.
+    """
     if not model:
         print("⚠ Gemini API가 초기화되지 않았습니다. 기본 모드로 진행합니다.")
         return None
     
-    prompt = f"""
-주제: {topic}
-
-위 주제에 대한 트렌디하고 고퀄리티 프레젠테이션을 위한 {num_slides}개의 슬라이드 콘텐츠를 생성해주세요.
-
-각 슬라이드는 다음 형식의 JSON으로 작성해주세요:
-
-{{
-  "topic": "{topic}",
-  "design_theme": {{
-    "primary_color": "#667eea",
-    "secondary_color": "#764ba2",
-    "accent_color": "#f093fb",
-    "style": "glassmorphism"
-  }},
-  "slides": [
-    {{
-      "title": "슬라이드 제목",
-      "content": [
-        "**핵심 개념**: 설명과 함께",
-        "재미있는 비유: 마치 ~처럼",
-        "구체적인 예시와 수치",
-        "**강조할 포인트**: 중요한 내용"
-      ],
-      "image_prompt": "modern glassmorphism style, gradient background with purple and blue tones, semi-transparent frosted glass elements, subtle blur effects, [구체적인 다이어그램 설명], professional tech illustration, vibrant neon accents, clean minimalist design, soft shadows, depth layers"
-    }}
-  ]
-}}
-
-요구사항:
-1. 총 {num_slides}장의 슬라이드 (논리적 구조: 도입 → 핵심 개념 → 심화 → 응용 → 미래 전망)
-2. 각 슬라이드는 4-6개의 핵심 포인트로 구성
-3. **중요 개념**은 마크다운 굵은 글씨로 표현 (예: **트랜스포머**, **어텐션 메커니즘**)
-4. 학술적 정확성을 유지하면서도 위트있는 비유와 예시를 포함
-   - 예: "마치 ~처럼", "~와 비슷하게", "쉽게 말하면 ~"
-5. 각 슬라이드마다 글라스모피즘 스타일 이미지 프롬프트 생성
-6. 이미지 프롬프트는 반드시 "modern glassmorphism style, gradient background with purple and blue tones..."로 시작
-7. 색상 테마: 보라-파랑-핑크 그라데이션 (#667eea, #764ba2, #f093fb)
-8. 전문적이면서도 흥미롭고 재미있는 톤 유지
-9. 각 포인트는 간결하지만 정보가 풍부하게
-
-JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
-"""
+    # 고정 요구사항과 출력 형식은 system instruction으로 보내고, 프롬프트에는 바뀌는 값만 담음
+    prompt = prompts.build_slides_prompt(topic, num_slides, existing_titles, include_notes)
+    
+    raw_text = None
+    if run_dir:
+        slides_data = run_checkpoint.load_json(run_dir, 'slides.json')
+        if slides_data:
+            print(f"✓ 체크포인트에서 슬라이드 {len(slides_data.get('slides', []))}개 복원 (API 호출 생략)")
+            return slides_data
+        raw_text = run_checkpoint.load_text(run_dir, 'raw/generate.txt')
     
     try:
-        print(f"\n🤖 Gemini API로 '{topic}' 주제의 고퀄리티 슬라이드 생성 중...")
-        print(f"   📊 슬라이드 개수: {num_slides}장")
-        print(f"   🎨 스타일: 글라스모피즘 (보라-파랑 그라데이션)")
-        print(f"   ✨ 특징: 학술적 + 위트있는 콘텐츠")
-        
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.8,  # 창의성을 높여 위트있는 콘텐츠 생성
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=8192,  # 10장 슬라이드를 위해 토큰 수 증가
+        if raw_text is None:
+            print(f"\n🤖 Gemini API로 '{topic}' 주제의 고퀄리티 슬라이드 생성 중...")
+            print(f"   📊 슬라이드 개수: {num_slides}장")
+            print(f"   🎨 스타일: 글라스모피즘 (보라-파랑 그라데이션)")
+            print(f"   ✨ 특징: 학술적 + 위트있는 콘텐츠")
+            
+            response = model.generate_content(
+                prompt,
+                system_instruction=prompts.SLIDES_SYSTEM_INSTRUCTION,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0.8,  # 창의성을 높여 위트있는 콘텐츠 생성
+                    top_p=0.95,
+                    top_k=40,
+                    max_output_tokens=8192,  # 10장 슬라이드를 위해 토큰 수 증가
+                )
             )
-        )
+            prompt_tokens = prompts.record_usage('slides', response)
+            print(f"   📉 입력 {prompt_tokens}토큰")
+            raw_text = response.text
+            if run_dir:
+                run_checkpoint.save_text(run_dir, 'raw/generate.txt', raw_text)
+        else:
+            print("✓ 체크포인트의 원본 응답을 재사용합니다 (API 호출 생략)")
         
         # JSON 파싱
-        content = response.text.strip()
-        # 마크다운 코드 블록 제거
-        if content.startswith('```'):
-            content = content.split('```')[1]
-            if content.startswith('json'):
-                content = content[4:]
-            content = content.strip()
-        
-        slides_data = json.loads(content)
+        slides_data = parse_json_response(raw_text)
+        if run_dir:
+            run_checkpoint.save_json(run_dir, 'slides.json', slides_data)
         print(f"✓ Gemini API로 {len(slides_data.get('slides', []))}개 슬라이드 생성 완료")
         print(f"✓ 디자인 테마: {slides_data.get('design_theme', {}).get('style', 'default')}")
         return slides_data
         
     except json.JSONDecodeError as e:
         print(f"❌ JSON 파싱 오류: {e}")
-        print(f"응답 내용: {response.text[:500]}...")
+        print(f"응답 내용: {raw_text[:500]}...")
+        if run_dir:
+            # 파싱할 수 없는 응답은 재개 시 다시 요청하도록 제거
+            os.remove(os.path.join(run_dir, 'raw', 'generate.txt'))
         return None
     except Exception as e:
         print(f"❌ 슬라이드 생성 실패: {e}")
@@ -126,63 +154,157 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
 
 
 
-def enhance_slide_content_with_gemini(slide_data, model=None):
-    """기존 슬라이드 콘텐츠를 Gemini API로 개선합니다."""
+def enhance_slide_content_with_gemini(slide_data, model=None, run_dir=None, slide_number=None):
+    """기존 슬라이드 콘텐츠를 Gemini API로 개선합니다.
+
+    run_dir이 주어지면 슬라이드별 원본 응답과 개선 결과를 체크포인트로 저장합니다.
+    개선에 실패한 슬라이드는 기록하지 않으므로 재개 시 다시 시도됩니다.
+    """
     if not model:
         return slide_data
     
-    prompt = f"""
-다음 슬라이드 콘텐츠를 더 전문적이고 학술적으로 개선해주세요:
-
-제목: {slide_data['title']}
-콘텐츠:
-{chr(10).join(f"- {point}" for point in slide_data.get('content', []))}
-
-요구사항:
-1. 제목을 더 명확하고 전문적으로 개선
-2. 각 포인트를 더 구체적이고 정보가 풍부하게 작성
-3. 학술적 톤 유지
-4. 3-5개의 핵심 포인트로 정리
-5. 간결하면서도 정보가 풍부하게
-
-다음 JSON 형식으로만 응답해주세요:
-{{
-  "title": "개선된 제목",
-  "content": [
-    "개선된 포인트 1",
-    "개선된 포인트 2",
-    "개선된 포인트 3"
-  ]
-}}
-"""
+    prompt = prompts.build_enhance_prompt(slide_data)
     
     try:
         response = model.generate_content(
             prompt,
+            system_instruction=prompts.ENHANCE_SYSTEM_INSTRUCTION,
             generation_config=genai.types.GenerationConfig(
                 temperature=0.5,  # 더 일관성 있는 개선
                 top_p=0.8,
                 max_output_tokens=1024,
             )
         )
+        prompts.record_usage('enhance', response)
         
-        content = response.text.strip()
-        if content.startswith('```'):
-            content = content.split('```')[1]
-            if content.startswith('json'):
-                content = content[4:]
-            content = content.strip()
+        if run_dir:
+            run_checkpoint.save_text(run_dir, f'raw/enhance_{slide_number:03d}.txt', response.text)
         
-        enhanced = json.loads(content)
-        return {**slide_data, **enhanced}
+        enhanced = parse_json_response(response.text)
+        result = {**slide_data, **enhanced}
+        if run_dir:
+            run_checkpoint.save_json(run_dir, f'enhanced/slide_{slide_number:03d}.json', result)
+        return result
         
     except Exception as e:
         print(f"  ⚠ 콘텐츠 개선 실패: {e}")
         return slide_data
 
 
+def find_reusable_slides(topic):
+    """비슷한 주제로 이전에 만든 덱이 있으면 재사용 여부를 묻습니다.
+
+    사용자가 덱을 고르면 {'deck': 경로, 'design_theme', 'slides': 유지할 슬라이드 목록}을,
+    새로 생성하기로 하면 None을 반환합니다.
+    """
+    index = topic_index.TopicIndex()
+    matches = [m for m in index.query(topic) if os.path.exists(m['deck'])]
+    if not matches:
+        return None
+    
+    print("\n🔎 비슷한 주제로 만든 덱이 있습니다:")
+    for i, match in enumerate(matches, 1):
+        print(f"  {i}. {match['topic']} (유사도 {match['score']:.0%}, {match['deck']})")
+    choice = input("재사용할 덱 번호 (Enter: 새로 생성): ").strip()
+    if not choice.isdigit() or not 1 <= int(choice) <= len(matches):
+        return None
+    
+    deck_path = matches[int(choice) - 1]['deck']
+    deck = load_slides_data(deck_path)
+    if not deck or not deck.get('slides'):
+        return None
+    for i, title, score in index.similar_slides(deck_path, topic):
+        print(f"  {i}. {title} (유사도 {score:.0%})")
+    keep = input("유지할 슬라이드 번호 (예: 1,2,5 / Enter: 전체 유지): ").strip()
+    numbers = [int(n) for n in keep.replace(' ', '').split(',') if n.isdigit()] if keep else []
+    slides = deck['slides']
+    kept = [slides[n - 1] for n in numbers if 1 <= n <= len(slides)] if numbers else slides
+    return {'deck': deck_path, 'design_theme': deck.get('design_theme'), 'slides': kept}
+
+
+def generate_with_reuse(topic, num_slides, model, run_dir, reused, include_notes=False):
+    """재사용할 슬라이드를 유지하고 모자란 슬라이드만 Gemini API로 생성합니다."""
+    kept = reused['slides'][:num_slides]
+    missing = num_slides - len(kept)
+    print(f"♻️  {reused['deck']}에서 슬라이드 {len(kept)}장 재사용, {missing}장 새로 생성")
+    slides_data = {'topic': topic, 'design_theme': reused.get('design_theme'), 'slides': []}
+    if missing > 0:
+        generated = generate_slides_with_gemini(topic, missing, model, run_dir=run_dir,
+                                                existing_titles=[s['title'] for s in kept],
+                                                include_notes=include_notes)
+        if not generated:
+            return None
+        slides_data['design_theme'] = slides_data['design_theme'] or generated.get('design_theme')
+        slides_data['slides'] = generated.get('slides', [])
+    slides_data['slides'] = kept + slides_data['slides']
+    return slides_data
+
+
+def enhance_slides(slides_data, model, run_dir, workers=None):
+    """모든 슬라이드를 개선하고, 개선하지 못한 슬라이드 번호 목록을 반환합니다.
+
+    체크포인트에 이미 개선 결과가 있는 슬라이드는 API를 다시 호출하지 않습니다.
+    슬라이드는 workers개 스레드로 동시에 요청하며, 생략하면 model의 동시성 한도 상한을 사용합니다
+    (실제 동시 요청 수는 adaptive_concurrency가 조절).
+    """
+    slides = slides_data.get('slides', [])
+    pending = []
+    for i, slide in enumerate(slides, 1):
+        cached = run_checkpoint.load_json(run_dir, f'enhanced/slide_{i:03d}.json')
+        if cached:
+            print(f"  슬라이드 {i} 체크포인트 사용 (API 호출 생략)")
+            slides[i-1] = cached
+        else:
+            pending.append(i)
+    
+    def enhance(i):
+        print(f"  슬라이드 {i} 개선 중...")
+        return enhance_slide_content_with_gemini(slides[i-1], model, run_dir=run_dir, slide_number=i)
+    
+    workers = workers or adaptive_concurrency.suggested_workers(model)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending) or 1)),
+                            thread_name_prefix='enhance') as executor:
+        results = list(executor.map(enhance, pending))
+    
+    failed = []
+    for i, enhanced in zip(pending, results):
+        # 실패 시 원본 객체가 그대로 반환됨
+        if enhanced is slides[i-1]:
+            failed.append(i)
+        slides[i-1] = enhanced
+    return failed
+
+
+def save_slides_json(slides_data, kind):
+    """슬라이드 데이터를 slides_<kind>_<시각>.json 파일로 저장하고 경로를 반환합니다."""
+    stem = f"slides_{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    output_json = f"{stem}.json"
+    suffix = 1
+    # 배치 실행에서 같은 초에 저장해도 서로 덮어쓰지 않도록 배타적 생성 모드 사용
+    while True:
+        try:
+            with open(output_json, 'x', encoding='utf-8') as f:
+                json.dump(slides_data, f, ensure_ascii=False, indent=2)
+            return output_json
+        except FileExistsError:
+            output_json = f"{stem}_{suffix}.json"
+            suffix += 1
+
+
 def load_slides_data(json_path='slides.json'):
-    """JSON 파일에서 슬라이드 데이터를 로드합니다."""
+    """JSON 파일에서 슬라이드 데이터를 로드합니다.
+
+    'archive:<덱 ID>' 형식이면 deck_archive 보관소에서 불러옵니다.
+    """
+    if json_path.startswith(deck_archive.ARCHIVE_PREFIX):
+        deck_id = json_path[len(deck_archive.ARCHIVE_PREFIX):]
+        try:
+            data = deck_archive.load_deck(deck_id)
+        except KeyError as e:
+            print(f"❌ 오류: {e.args[0]}")
+            return None
+        print(f"✓ 보관소에서 로드 완료: {len(data.get('slides', []))}개 슬라이드")
+        return data
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -197,9 +319,20 @@ def load_slides_data(json_path='slides.json'):
 
 
 
-def create_title_slide(prs, topic):
-    """타이틀 슬라이드를 생성합니다."""
+def add_theme_background(prs, slide, design_theme, layout):
+    """design_theme 색상으로 렌더링한 글라스모피즘 배경을 슬라이드 맨 뒤에 깔아줍니다."""
+    background = theme_renderer.render_background(design_theme, layout=layout)
+    picture = slide.shapes.add_picture(io.BytesIO(background), 0, 0,
+                                       width=prs.slide_width, height=prs.slide_height)
+    # 장식용 배경이므로 화면 낭독기가 기본 파일 이름(image.jpg)을 읽지 않도록 설명을 비움
+    picture._element.nvPicPr.cNvPr.set('descr', '')
+
+
+def create_title_slide(prs, topic, design_theme=None, build_date=None):
+    """타이틀 슬라이드를 생성합니다. build_date를 생략하면 오늘 날짜를 생성일로 표시합니다."""
     slide = prs.slides.add_slide(prs.slide_layouts[6])  # 빈 레이아웃
+    if design_theme:
+        add_theme_background(prs, slide, design_theme, 'title')
     
     # 제목 추가
     left = Inches(1)
@@ -222,7 +355,7 @@ def create_title_slide(prs, topic):
     subtitle_top = Inches(4.2)
     subtitle_box = slide.shapes.add_textbox(left, subtitle_top, width, Inches(0.5))
     subtitle_frame = subtitle_box.text_frame
-    subtitle_frame.text = f"생성일: {datetime.now().strftime('%Y년 %m월 %d일')}"
+    subtitle_frame.text = f"생성일: {(build_date or datetime.now()).strftime('%Y년 %m월 %d일')}"
     
     subtitle_paragraph = subtitle_frame.paragraphs[0]
     subtitle_paragraph.alignment = PP_ALIGN.CENTER
@@ -232,9 +365,17 @@ def create_title_slide(prs, topic):
     print("✓ 타이틀 슬라이드 생성 완료")
 
 
-def create_content_slide(prs, slide_data, slide_number, images_dir='images'):
-    """콘텐츠 슬라이드를 생성합니다."""
+def create_content_slide(prs, slide_data, slide_number, images_dir='images', image_path=None,
+                         design_theme=None):
+    """콘텐츠 슬라이드를 생성합니다.
+
+    image_path가 없으면 images_dir의 slide_N.png를 사용하고,
+    그마저 없으면 design_theme 색상의 플레이스홀더 이미지를 넣습니다.
+    slide_data의 notes는 슬라이드 노트에, alt_text는 이미지의 대체 텍스트(설명)에 기록합니다.
+    """
     slide = prs.slides.add_slide(prs.slide_layouts[6])  # 빈 레이아웃
+    if design_theme:
+        add_theme_background(prs, slide, design_theme, 'content')
     
     # 제목 추가
     title_left = Inches(0.5)
@@ -252,19 +393,25 @@ def create_content_slide(prs, slide_data, slide_number, images_dir='images'):
     title_paragraph.font.color.rgb = RGBColor(0, 51, 102)
     
     # 이미지 추가 (왼쪽)
-    image_path = os.path.join(images_dir, f'slide_{slide_number}.png')
+    if image_path is None:
+        image_path = os.path.join(images_dir, f'slide_{slide_number}.png')
+    img_left = Inches(0.5)
+    img_top = Inches(1.5)
+    img_width = Inches(4.5)
+    picture = None
     if os.path.exists(image_path):
-        img_left = Inches(0.5)
-        img_top = Inches(1.5)
-        img_width = Inches(4.5)
-        
         try:
-            slide.shapes.add_picture(image_path, img_left, img_top, width=img_width)
+            picture = slide.shapes.add_picture(image_path, img_left, img_top, width=img_width)
             print(f"  ✓ 이미지 추가: {image_path}")
         except Exception as e:
             print(f"  ⚠ 이미지 추가 실패: {e}")
     else:
-        print(f"  ⚠ 이미지 파일 없음: {image_path}")
+        placeholder = theme_renderer.render_placeholder(design_theme, seed=slide_number)
+        picture = slide.shapes.add_picture(io.BytesIO(placeholder), img_left, img_top, width=img_width)
+        print(f"  ⚠ 이미지 파일 없음: {image_path} (플레이스홀더 사용)")
+    if picture is not None and slide_data.get('alt_text'):
+        # python-pptx에 대체 텍스트 API가 없어 <p:cNvPr descr="...">를 직접 설정
+        picture._element.nvPicPr.cNvPr.set('descr', slide_data['alt_text'])
     
     # 콘텐츠 텍스트 추가 (오른쪽)
     content_left = Inches(5.2)
@@ -288,60 +435,197 @@ def create_content_slide(prs, slide_data, slide_number, images_dir='images'):
         p.space_after = Pt(12)
         p.level = 0
     
+    notes = slide_data.get('notes')
+    if notes:
+        if isinstance(notes, list):
+            notes = '\n'.join(notes)
+        slide.notes_slide.notes_text_frame.text = notes
+    
     print(f"✓ 슬라이드 {slide_number} 생성 완료: {slide_data['title']}")
 
 
-def generate_presentation(slides_data, output_dir='output'):
-    """전체 프레젠테이션을 생성합니다."""
+def presentation_filename(topic):
+    """주제로 PPT 파일 이름을 만듭니다."""
+    safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_', '-')).strip()
+    safe_topic = safe_topic.replace(' ', '_')
+    return f'{safe_topic}_presentation.pptx'
+
+
+def deck_inputs(slides_data, images_dir, image_backend, build_date, packaging, max_size):
+    """덱 캐시 키를 만드는 입력: 렌더링 결과를 바꿀 수 있는 모든 값
+
+    이미지는 create_content_slide와 같은 순서로 찾습니다. images_dir의 파일은 내용 해시를,
+    생성할 이미지는 image_generation의 캐시 키를 쓰고, 둘 다 없으면 플레이스홀더(None)입니다.
+    """
+    images = []
+    for i, slide in enumerate(slides_data.get('slides', []), 1):
+        path = os.path.join(images_dir, f'slide_{i}.png')
+        if os.path.exists(path):
+            images.append(reproducible_build.file_digest(path))
+        elif image_backend and slide.get('image_prompt'):
+            images.append(image_generation.image_cache_key(image_backend, slide['image_prompt'],
+                                                           *image_generation.DEFAULT_IMAGE_SIZE))
+        else:
+            images.append(None)
+    return {
+        'renderer': RENDERER_VERSION,
+        'python_pptx': pptx.__version__,
+        'pillow': PIL.__version__,
+        'numpy': np.__version__,  # theme_renderer의 난수와 배열 연산 결과가 numpy 버전에 따라 달라질 수 있음
+        'slides_data': slides_data,
+        'images': images,
+        'build_date': build_date.strftime('%Y-%m-%d'),
+        'packaging': packaging,
+        'max_size': max_size,
+    }
+
+
+def generate_presentation(slides_data, output_dir='output', images_dir='images',
+                          image_backend=None, image_workers=4, filename=None,
+                          packaging=pptx_packaging.DEFAULT_PROFILE, max_size=None,
+                          reproducible=False, build_date=None):
+    """전체 프레젠테이션을 생성합니다.
+
+    image_backend가 주어지면 image_prompt로 이미지를 동시에 생성하면서,
+    각 슬라이드는 자신의 이미지가 준비되는 즉시 렌더링합니다.
+    filename을 생략하면 주제로 파일 이름을 만듭니다.
+    packaging은 pptx_packaging의 저장 프로필(fast/small/default)입니다.
+    max_size(바이트)가 주어지면 저장 전에 이미지를 다시 인코딩해 파일 크기를 한도 안으로 맞춥니다.
+    reproducible이면 날짜(build_date, 생략 시 reproducible_build.resolve_build_date)와 저장 순서를 고정해
+    같은 입력에서 같은 바이트의 파일을 만들고, 입력이 그대로인 덱은 캐시에서 바로 반환합니다.
+    """
     # 출력 디렉토리 생성
     Path(output_dir).mkdir(exist_ok=True)
     
+    topic = slides_data.get('topic', '프레젠테이션')
+    output_path = os.path.join(output_dir, filename or presentation_filename(topic))
+    
+    cache_key = None
+    if reproducible:
+        build_date = reproducible_build.resolve_build_date(slides_data, build_date)
+        cache_key = reproducible_build.deck_cache_key(
+            deck_inputs(slides_data, images_dir, image_backend, build_date, packaging, max_size))
+        if reproducible_build.cached_deck(cache_key, output_path):
+            print(f"✓ 입력이 바뀌지 않아 캐시된 PPT를 사용합니다: {output_path} (키 {cache_key[:12]})")
+            return output_path
+    
     # 새 프레젠테이션 생성
     prs = Presentation()
     prs.slide_width = Inches(10)
     prs.slide_height = Inches(7.5)
     
-    topic = slides_data.get('topic', '프레젠테이션')
+    design_theme = slides_data.get('design_theme')
     
     # 타이틀 슬라이드 생성
-    create_title_slide(prs, topic)
+    create_title_slide(prs, topic, design_theme, build_date=build_date)
     
     # 콘텐츠 슬라이드 생성
     slides = slides_data.get('slides', [])
+    image_jobs = {}
+    if image_backend:
+        image_jobs = image_generation.start_image_generation(
+            slides, image_backend, images_dir, max_workers=image_workers)
+    
     for i, slide_data in enumerate(slides, 1):
-        create_content_slide(prs, slide_data, i)
+        image_path = None
+        if i in image_jobs:
+            try:
+                image_path = image_jobs[i].result()
+            except Exception as e:
+                print(f"  ⚠ 이미지 생성 실패 (슬라이드 {i}): {e}")
+                # 플레이스홀더로 대신한 덱은 다음 실행에서 다시 만들도록 캐시하지 않음
+                cache_key = None
+        create_content_slide(prs, slide_data, i, images_dir, image_path=image_path,
+                             design_theme=design_theme)
     
     # 파일 저장
-    safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_', '-')).strip()
-    safe_topic = safe_topic.replace(' ', '_')
-    output_path = os.path.join(output_dir, f'{safe_topic}_presentation.pptx')
-    
-    prs.save(output_path)
+    if max_size:
+        size_budget.fit_to_budget(prs, max_size, packaging)
+    timestamp = None
+    if reproducible:
+        prs.core_properties.created = prs.core_properties.modified = build_date
+        timestamp = reproducible_build.zip_timestamp(build_date)
+    pptx_packaging.save_presentation(prs, output_path, packaging, timestamp)
+    if cache_key:
+        reproducible_build.store_deck(cache_key, output_path)
     print(f"\n{'='*60}")
     print(f"✅ PPT 생성 완료!")
     print(f"📁 파일 위치: {output_path}")
+    if max_size:
+        size = os.path.getsize(output_path)
+        state = "이내" if size <= max_size else "초과"
+        print(f"📦 파일 크기: {size_budget.format_size(size)} (한도 {size_budget.format_size(max_size)} {state})")
     print(f"📊 총 슬라이드 수: {len(slides) + 1} (타이틀 포함)")
     print(f"{'='*60}\n")
     
     return output_path
 
 
+def print_resume_hint(run_dir):
+    """중단된 실행을 재개하는 방법을 안내합니다."""
+    print(f"   💾 완료된 단계는 체크포인트에 저장되었습니다: {run_dir}")
+    print(f"   재개하려면: python generate_ppt.py --resume {run_dir}")
+
+
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="학술 스타일 PPT 자동 생성")
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='RUN_DIR',
+                        help="중단된 모드 2/3 실행을 이어서 진행 (경로 생략 시 가장 최근 실행)")
+    parser.add_argument('--images', choices=sorted(image_generation.IMAGE_BACKENDS),
+                        default=os.getenv('IMAGE_BACKEND'),
+                        help="image_prompt로 슬라이드 이미지를 생성할 백엔드 (local: 오프라인 대체 이미지)")
+    parser.add_argument('--image-workers', type=int, default=4,
+                        help="동시에 실행할 이미지 생성 요청 수 (기본값: 4)")
+    parser.add_argument('--hedge', action='store_true',
+                        help="응답이 최근 p90보다 늦으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용")
+    parser.add_argument('--hedge-budget', type=float, default=hedging.HEDGE_BUDGET,
+                        help="헤징으로 추가할 수 있는 요청 비율 상한 (기본값: %(default)s)")
+    parser.add_argument('--concurrency', type=adaptive_concurrency.parse_concurrency, default='auto',
+                        help="동시에 보낼 Gemini 요청 수 (auto: 지연 시간과 429에 따라 자동 조절, 숫자: 고정, 기본값: auto)")
+    parser.add_argument('--package-profile', choices=sorted(pptx_packaging.PROFILES),
+                        default=pptx_packaging.DEFAULT_PROFILE,
+                        help="PPTX 저장 프로필 (fast: 이미지 재압축 생략, small: 최대 압축, 기본값: %(default)s)")
+    parser.add_argument('--notes', action='store_true',
+                        help="모드 2에서 발표자 노트와 이미지 대체 텍스트를 같은 요청으로 함께 생성")
+    parser.add_argument('--max-size', type=size_budget.parse_size, metavar='SIZE',
+                        help="PPTX 파일 크기 한도 (예: 20MB). 넘으면 이미지 해상도/품질을 낮춰 맞춤")
+    parser.add_argument('--format', choices=('pptx', 'html', 'both'), default='pptx',
+                        help="출력 형식 (html: 정적 HTML 한 페이지, 웹 공유용, 기본값: %(default)s)")
+    parser.add_argument('--reproducible', action='store_true',
+                        help="날짜와 저장 순서를 고정해 같은 입력이면 같은 파일을 만들고, 입력이 그대로면 캐시된 PPT 사용")
+    parser.add_argument('--build-date', type=reproducible_build.parse_build_date, metavar='YYYY-MM-DD',
+                        help="--reproducible에서 타이틀과 문서 속성에 쓸 날짜 (기본: SOURCE_DATE_EPOCH, JSON의 date, 오늘 순)")
+    args = parser.parse_args()
+    
     print("\n" + "="*60)
     print("🎓 학술 스타일 PPT 자동 생성 시작")
     print("="*60 + "\n")
     
     # Gemini API 초기화
-    gemini_model = initialize_gemini_api()
-    
-    # 사용자 입력 받기
-    print("\n📋 PPT 생성 모드를 선택하세요:")
-    print("1. 기존 slides.json 파일 사용")
-    print("2. Gemini API로 새로운 슬라이드 생성")
-    print("3. 기존 JSON 파일의 콘텐츠를 Gemini API로 개선")
-    
-    mode = input("\n선택 (1/2/3, 기본값: 1): ").strip() or "1"
+    gemini_model = adaptive_concurrency.wrap_model(initialize_gemini_api(), args.concurrency)
+    if gemini_model and args.hedge:
+        gemini_model = hedging.HedgedModel(gemini_model, budget=args.hedge_budget)
+    
+    run_dir = None
+    run_params = {}
+    if args.resume:
+        run_dir = run_checkpoint.find_latest_run() if args.resume == 'latest' else args.resume
+        run_meta = run_checkpoint.load_run_meta(run_dir) if run_dir else None
+        if not run_meta:
+            print("❌ 재개할 실행을 찾을 수 없습니다.")
+            return
+        mode = run_meta['mode']
+        run_params = run_meta.get('params', {})
+        print(f"\n🔁 중단된 실행 재개: {run_dir} (모드 {mode})")
+    else:
+        # 사용자 입력 받기
+        print("\n📋 PPT 생성 모드를 선택하세요:")
+        print("1. 기존 slides.json 파일 사용")
+        print("2. Gemini API로 새로운 슬라이드 생성")
+        print("3. 기존 JSON 파일의 콘텐츠를 Gemini API로 개선")
+        
+        mode = input("\n선택 (1/2/3, 기본값: 1): ").strip() or "1"
     
     slides_data = None
     
@@ -351,25 +635,45 @@ def main():
             print("❌ Gemini API를 사용할 수 없습니다. 모드 1을 사용하세요.")
             return
         
-        topic = input("\n📝 프레젠테이션 주제를 입력하세요: ").strip()
-        if not topic:
-            print("❌ 주제를 입력해야 합니다.")
-            return
-        
-        num_slides = input("📊 생성할 슬라이드 개수 (기본값: 10): ").strip() or "10"
-        try:
-            num_slides = int(num_slides)
-        except ValueError:
-            num_slides = 10
+        if run_dir:
+            topic = run_params['topic']
+            num_slides = run_params['num_slides']
+            include_notes = run_params.get('include_notes', False)
+        else:
+            topic = input("\n📝 프레젠테이션 주제를 입력하세요: ").strip()
+            if not topic:
+                print("❌ 주제를 입력해야 합니다.")
+                return
+            
+            num_slides = input("📊 생성할 슬라이드 개수 (기본값: 10): ").strip() or "10"
+            try:
+                num_slides = int(num_slides)
+            except ValueError:
+                num_slides = 10
+            
+            include_notes = args.notes
+            run_dir = run_checkpoint.create_run_dir(mode, {'topic': topic, 'num_slides': num_slides,
+                                                           'include_notes': include_notes})
+            reused = find_reusable_slides(topic)
+            if reused:
+                run_checkpoint.save_json(run_dir, 'reused.json', reused)
         
-        slides_data = generate_slides_with_gemini(topic, num_slides, gemini_model)
+        # 재개 시에도 처음 고른 재사용 슬라이드를 그대로 사용
+        reused = run_checkpoint.load_json(run_dir, 'reused.json')
+        if reused:
+            slides_data = generate_with_reuse(topic, num_slides, gemini_model, run_dir, reused, include_notes)
+        else:
+            slides_data = generate_slides_with_gemini(topic, num_slides, gemini_model, run_dir=run_dir,
+                                                      include_notes=include_notes)
         
         if slides_data:
             # 생성된 데이터를 파일로 저장
-            output_json = f"slides_generated_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(output_json, 'w', encoding='utf-8') as f:
-                json.dump(slides_data, f, ensure_ascii=False, indent=2)
+            output_json = save_slides_json(slides_data, 'generated')
             print(f"✓ 생성된 슬라이드 데이터 저장: {output_json}")
+            topic_index.register_deck(slides_data, output_json)
+            run_checkpoint.update_run_meta(run_dir, status='done', output_json=output_json)
+        else:
+            print_resume_hint(run_dir)
     
     elif mode == "3":
         # 기존 콘텐츠를 Gemini API로 개선
@@ -377,20 +681,31 @@ def main():
             print("❌ Gemini API를 사용할 수 없습니다. 모드 1을 사용하세요.")
             return
         
-        json_path = input("\n📁 JSON 파일 경로 (기본값: slides.json): ").strip() or "slides.json"
-        slides_data = load_slides_data(json_path)
+        if run_dir:
+            # 재개 시에는 최초 실행 때 저장해 둔 원본 슬라이드를 사용
+            slides_data = run_checkpoint.load_json(run_dir, 'source.json')
+        else:
+            json_path = input("\n📁 JSON 파일 경로 (기본값: slides.json): ").strip() or "slides.json"
+            slides_data = load_slides_data(json_path)
+            if slides_data:
+                run_dir = run_checkpoint.create_run_dir(mode, {'json_path': json_path})
+                run_checkpoint.save_json(run_dir, 'source.json', slides_data)
         
         if slides_data:
             print("\n🔧 Gemini API로 콘텐츠 개선 중...")
-            for i, slide in enumerate(slides_data.get('slides', []), 1):
-                print(f"  슬라이드 {i} 개선 중...")
-                slides_data['slides'][i-1] = enhance_slide_content_with_gemini(slide, gemini_model)
+            failed = enhance_slides(slides_data, gemini_model, run_dir)
             
             # 개선된 데이터를 파일로 저장
-            output_json = f"slides_enhanced_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(output_json, 'w', encoding='utf-8') as f:
-                json.dump(slides_data, f, ensure_ascii=False, indent=2)
+            output_json = save_slides_json(slides_data, 'enhanced')
             print(f"✓ 개선된 슬라이드 데이터 저장: {output_json}")
+            topic_index.register_deck(slides_data, output_json)
+            
+            if failed:
+                print(f"⚠ 개선하지 못한 슬라이드: {', '.join(map(str, failed))}")
+                print_resume_hint(run_dir)
+                run_checkpoint.update_run_meta(run_dir, output_json=output_json)
+            else:
+                run_checkpoint.update_run_meta(run_dir, status='done', output_json=output_json)
     
     else:
         # 기존 JSON 파일 사용
@@ -406,9 +721,31 @@ def main():
         print(f"⚠ 경고: {images_dir} 디렉토리가 없습니다. 이미지 없이 진행합니다.")
         Path(images_dir).mkdir(exist_ok=True)
     
-    # PPT 생성
-    output_path = generate_presentation(slides_data)
+    image_backend = None
+    if args.images:
+        try:
+            image_backend = image_generation.get_image_backend(args.images)
+        except ValueError as e:
+            print(f"⚠ 이미지 백엔드를 사용할 수 없습니다: {e}")
     
+    # PPT 생성
+    if args.format in ('pptx', 'both'):
+        generate_presentation(slides_data, images_dir=images_dir,
+                              image_backend=image_backend,
+                              image_workers=args.image_workers,
+                              packaging=args.package_profile,
+                              max_size=args.max_size,
+                              reproducible=args.reproducible,
+                              build_date=args.build_date)
+    if args.format in ('html', 'both'):
+        # PPTX와 함께 만들 때는 이미지가 이미 캐시에 있으므로 다시 생성하지 않음
+        html_export.export_html(slides_data, images_dir=images_dir,
+                                image_backend=image_backend,
+                                image_workers=args.image_workers)
+    
+    if hasattr(gemini_model, 'print_stats'):
+        gemini_model.print_stats()
+    prompts.print_usage(gemini_model)
     print("✨ 모든 작업이 완료되었습니다!")
 
 
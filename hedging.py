@@ -0,0 +1,133 @@
+"""
+Gemini 요청 헤징(hedged request) 래퍼
+호출이 최근 지연 시간의 p90을 넘도록 응답하지 않으면 같은 요청을 한 번 더 보내
+먼저 도착한 응답을 사용합니다. 느린 호출 하나가 덱 전체의 지연을 결정하는 꼬리 지연을 줄입니다.
+추가 요청은 전체 호출 수 대비 예산(budget) 비율을 넘지 않으며, 늦게 도착한 응답은 버립니다.
+
+임계값은 adaptive_concurrency의 기준 지연 시간처럼 system_instruction(요청 종류)별로 따로 계산합니다.
+짧은 개선 요청이 긴 생성 요청의 p90을 기준으로 기다리거나, 그 반대로 너무 일찍 중복 요청하지 않도록 합니다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import adaptive_concurrency
+
+HEDGE_PERCENTILE = 90
+HEDGE_BUDGET = 0.1  # 전체 호출 대비 추가 요청 비율 상한
+MIN_SAMPLES = 10  # 임계값을 계산하기 전에 모을 지연 시간 표본 수
+LATENCY_WINDOW = 200
+MIN_HEDGE_DELAY = 1.0  # 임계값 하한(초): 짧은 호출까지 중복 요청하지 않도록
+DEFAULT_WORKERS = 16  # 감싼 model에 동시성 한도가 없을 때 쓰는 스레드 수
+
+
+class HedgedModel:
+    """model.generate_content 호출에 헤징을 더하는 model 호환 래퍼
+
+    요청 종류별 표본이 MIN_SAMPLES개 모이기 전에는 initial_delay(None이면 헤징 안 함)를 임계값으로 사용합니다.
+    max_workers는 이 래퍼를 동시에 호출하는 스레드 수에 맞춥니다. 생략하면 안쪽 AdaptiveModel의 한도 상한을 씁니다.
+    원래 요청과 추가 요청은 각자의 스레드 풀에서 돌므로, 추가 요청이 원래 요청 뒤에 줄 서지 않습니다.
+    """
+
+    def __init__(self, model, percentile=HEDGE_PERCENTILE, budget=HEDGE_BUDGET,
+                 initial_delay=None, min_delay=MIN_HEDGE_DELAY, max_workers=None):
+        self.model = model
+        self.percentile = percentile
+        self.budget = budget
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self._latencies = {}  # 요청 종류 → 최근 지연 시간
+        self._lock = threading.Lock()
+        max_workers = max_workers or adaptive_concurrency.suggested_workers(model, DEFAULT_WORKERS)
+        # 진 요청은 취소할 수 없으므로 백그라운드에서 끝나도록 두고 결과만 버림
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='primary')
+        self._hedge_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_skips = 0
+
+    @property
+    def model_name(self):
+        return getattr(self.model, 'model_name', None)
+
+    def hedge_delay(self, kind=None):
+        """요청 종류별 현재 헤징 임계값(초). 아직 정할 수 없으면 None."""
+        with self._lock:
+            samples = self._latencies.get(kind)
+            if not samples or len(samples) < MIN_SAMPLES:
+                return self.initial_delay
+            return max(self.min_delay, adaptive_concurrency.percentile(samples, self.percentile))
+
+    def _record(self, kind, latency):
+        with self._lock:
+            self._latencies.setdefault(kind, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    def _take_budget(self):
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.calls:
+                self.budget_skips += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def _timed_call(self, args, kwargs):
+        start = time.perf_counter()
+        response = self.model.generate_content(*args, **kwargs)
+        self._record(kwargs.get('system_instruction'), time.perf_counter() - start)
+        return response
+
+    def generate_content(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+        delay = self.hedge_delay(kwargs.get('system_instruction'))
+        if delay is None or kwargs.get('stream'):
+            return self._timed_call(args, kwargs)
+
+        primary = self._executor.submit(self._timed_call, args, kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_budget():
+            return primary.result()
+
+        hedge = self._hedge_executor.submit(self._timed_call, args, kwargs)
+        pending = {primary, hedge}
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
+
+    def stats(self):
+        """헤징 발생/승리 횟수와 요청 종류별 현재 임계값을 반환합니다."""
+        with self._lock:
+            kinds = list(self._latencies)
+        thresholds = [delay for delay in map(self.hedge_delay, kinds) if delay is not None]
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'budget_skips': self.budget_skips,
+                'hedge_rate': self.hedges / self.calls if self.calls else 0.0,
+                'win_rate': self.hedge_wins / self.hedges if self.hedges else 0.0,
+                'thresholds': sorted(thresholds),
+            }
+
+    def print_stats(self):
+        s = self.stats()
+        threshold = ', '.join(f"{delay:.2f}초" for delay in s['thresholds']) or "미정"
+        print(f"\n⏱️  헤징: 호출 {s['calls']}회 중 {s['hedges']}회 추가 요청 ({s['hedge_rate']:.0%}), "
+              f"추가 요청이 이긴 횟수 {s['hedge_wins']}회, 예산 초과로 생략 {s['budget_skips']}회 "
+              f"(요청 종류별 임계값 p{self.percentile} = {threshold})")
+        if hasattr(self.model, 'print_stats'):
+            self.model.print_stats()
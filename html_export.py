@@ -0,0 +1,266 @@
+"""
+슬라이드 데이터를 정적 HTML 한 페이지로 내보내는 경량 백엔드
+PPTX를 만든 뒤 변환하지 않고, generate_presentation과 같은 slides 데이터에서 바로 HTML을 씁니다.
+
+- design_theme 색상으로 만든 CSS 글라스모피즘 (배경 이미지 없이 그라데이션 + backdrop-filter)
+- 슬라이드 이미지는 지연 로딩하고, images 디렉토리의 원본으로 폭별 JPEG 파생본을 만들어 srcset으로 제공
+- 문서 전체를 메모리에 만들지 않고 슬라이드 단위로 스트리밍해 씀
+
+사용 예:
+    python html_export.py                           # slides.json → output/<주제>_presentation.html
+    python html_export.py --json archive:477aea --widths 480 960
+"""
+
+import argparse
+import html
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+
+from PIL import Image
+
+import image_generation
+import theme_renderer
+
+RESPONSIVE_WIDTHS = (480, 960, 1440)  # 파생 이미지 폭(px). 원본보다 넓은 폭은 만들지 않음
+DERIVATIVE_QUALITY = 82
+# 슬라이드 폭의 약 45%를 차지하고, 좁은 화면에서는 한 줄 전체를 차지
+IMAGE_SIZES = '(max-width: 800px) 92vw, 45vw'
+
+_BOLD = re.compile(r'\*\*(.+?)\*\*')
+
+STYLE = """
+:root {{ --primary: {primary}; --secondary: {secondary}; --accent: {accent}; }}
+* {{ box-sizing: border-box; }}
+html {{ scroll-snap-type: y mandatory; }}
+body {{
+  margin: 0; color: #1f2340;
+  font-family: 'Pretendard', 'Noto Sans KR', 'Apple SD Gothic Neo', 'Malgun Gothic', sans-serif;
+  background: linear-gradient(135deg, var(--primary), var(--secondary) 55%, var(--accent)) fixed;
+}}
+.slide {{
+  min-height: 100vh; padding: 4vh 5vw; scroll-snap-align: start;
+  display: flex; flex-direction: column; justify-content: center;
+  content-visibility: auto; contain-intrinsic-size: auto 100vh;
+}}
+.glass {{
+  background: rgba(255, 255, 255, 0.28); border: 1px solid rgba(255, 255, 255, 0.45);
+  border-radius: 24px; box-shadow: 0 8px 32px rgba(31, 35, 64, 0.18);
+  -webkit-backdrop-filter: blur(18px) saturate(140%); backdrop-filter: blur(18px) saturate(140%);
+}}
+.title {{ align-items: center; text-align: center; }}
+.title .glass {{ padding: 6vh 6vw; max-width: 1100px; }}
+.title h1 {{ margin: 0 0 1rem; font-size: clamp(2rem, 5vw, 3.4rem); color: #003366; }}
+.title p {{ margin: 0; color: #555; }}
+.slide h2 {{ margin: 0 0 3vh; font-size: clamp(1.5rem, 3.4vw, 2.4rem); color: #003366; }}
+.body {{ display: grid; grid-template-columns: 1fr 1fr; gap: 3vw; align-items: center; }}
+.body figure {{ margin: 0; }}
+.body img, .placeholder {{ width: 100%; height: auto; aspect-ratio: 4 / 3; object-fit: contain;
+  border-radius: 16px; background: rgba(255, 255, 255, 0.5); }}
+.placeholder {{ background: linear-gradient(135deg, var(--primary), var(--accent)); opacity: 0.6; }}
+.body ul {{ margin: 0; padding: 3vh 2.5vw 3vh 4vw; font-size: clamp(1rem, 1.6vw, 1.25rem); line-height: 1.6; }}
+.body li + li {{ margin-top: 0.6em; }}
+.notes {{ margin-top: 2vh; padding: 1rem 1.5rem; font-size: 0.95rem; }}
+.notes summary {{ cursor: pointer; font-weight: 600; }}
+.number {{ align-self: flex-end; margin-top: 2vh; color: rgba(255, 255, 255, 0.85); }}
+@media (max-width: 800px) {{ .body {{ grid-template-columns: 1fr; }} }}
+@media print {{
+  html {{ scroll-snap-type: none; }}
+  .slide {{ break-after: page; min-height: auto; }}
+  .notes {{ display: none; }}
+}}
+"""
+
+
+def html_filename(topic):
+    """주제로 HTML 파일 이름을 만듭니다."""
+    safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_', '-')).strip()
+    safe_topic = safe_topic.replace(' ', '_')
+    return f'{safe_topic}_presentation.html'
+
+
+def _inline(text):
+    """텍스트를 이스케이프하고 **강조**만 <strong>으로 바꿉니다."""
+    return _BOLD.sub(r'<strong>\1</strong>', html.escape(str(text)))
+
+
+def _theme_css(design_theme):
+    primary, secondary, accent = theme_renderer.theme_colors(design_theme)
+    return STYLE.format(**{name: '#%02x%02x%02x' % color for name, color in
+                           (('primary', primary), ('secondary', secondary), ('accent', accent))})
+
+
+def responsive_images(image_path, assets_dir, widths=RESPONSIVE_WIDTHS):
+    """원본 이미지로 폭별 JPEG 파생본을 만들고 [(경로, 폭), ...]과 원본 (폭, 높이)를 반환합니다.
+
+    파생본이 원본보다 새것이면 다시 만들지 않습니다.
+    """
+    source_mtime = os.path.getmtime(image_path)
+    stem = Path(image_path).stem
+    with Image.open(image_path) as image:
+        size = image.size
+        targets = sorted({w for w in widths if w < size[0]} | {min(size[0], max(widths))})
+        variants = []
+        for width in targets:
+            path = os.path.join(assets_dir, f'{stem}-{width}w.jpg')
+            if not (os.path.exists(path) and os.path.getmtime(path) >= source_mtime):
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+                height = round(size[1] * width / size[0])
+                resized = image if width == size[0] else image.resize((width, height), Image.LANCZOS)
+                resized.save(path, 'JPEG', quality=DERIVATIVE_QUALITY, optimize=True, progressive=True)
+            variants.append((path, width))
+    return variants, size
+
+
+def _title_section(topic):
+    return (f'<section class="slide title" id="slide-0">\n'
+            f'  <div class="glass">\n'
+            f'    <h1>{html.escape(topic)}</h1>\n'
+            f'    <p>생성일: {datetime.now().strftime("%Y년 %m월 %d일")}</p>\n'
+            f'  </div>\n'
+            f'</section>\n')
+
+
+def _figure(slide_data, slide_number, image_path, html_dir, assets_dir, widths):
+    alt = html.escape(slide_data.get('alt_text') or slide_data.get('title', ''), quote=True)
+    if not os.path.exists(image_path):
+        print(f"  ⚠ 이미지 파일 없음: {image_path} (플레이스홀더 사용)")
+        return f'<div class="placeholder" role="img" aria-label="{alt}"></div>'
+    try:
+        variants, (width, height) = responsive_images(image_path, assets_dir, widths)
+    except OSError as e:
+        print(f"  ⚠ 이미지 변환 실패: {e}")
+        return f'<div class="placeholder" role="img" aria-label="{alt}"></div>'
+    srcset = ', '.join(f'{Path(os.path.relpath(path, html_dir)).as_posix()} {w}w' for path, w in variants)
+    src = Path(os.path.relpath(variants[-1][0], html_dir)).as_posix()
+    # 첫 화면에 보이는 첫 슬라이드 이미지만 바로 불러오고 나머지는 스크롤할 때 불러옴
+    loading = 'eager' if slide_number == 1 else 'lazy'
+    return (f'<img src="{html.escape(src)}" srcset="{html.escape(srcset)}" sizes="{IMAGE_SIZES}" '
+            f'width="{width}" height="{height}" alt="{alt}" loading="{loading}" decoding="async">')
+
+
+def _content_section(slide_data, slide_number, total, figure):
+    items = '\n'.join(f'      <li>{_inline(point)}</li>' for point in slide_data.get('content', []))
+    notes = slide_data.get('notes')
+    if isinstance(notes, list):
+        notes = '\n'.join(notes)
+    notes_html = ''
+    if notes:
+        notes_html = (f'  <details class="notes glass"><summary>발표자 노트</summary>'
+                      f'<p>{_inline(notes).replace(chr(10), "<br>")}</p></details>\n')
+    return (f'<section class="slide" id="slide-{slide_number}">\n'
+            f'  <h2>{_inline(slide_data["title"])}</h2>\n'
+            f'  <div class="body">\n'
+            f'    <figure>{figure}</figure>\n'
+            f'    <ul class="glass">\n{items}\n    </ul>\n'
+            f'  </div>\n'
+            f'{notes_html}'
+            f'  <div class="number">{slide_number} / {total}</div>\n'
+            f'</section>\n')
+
+
+def iter_html(slides_data, html_dir='output', images_dir='images', assets_dir=None,
+              widths=RESPONSIVE_WIDTHS, image_backend=None, image_workers=4):
+    """HTML 문서를 조각 단위로 내놓습니다 (머리말, 슬라이드마다 하나, 맺음말).
+
+    이미지 파생본은 해당 슬라이드를 내놓기 직전에 만들어 assets_dir에 저장합니다.
+    image_backend가 주어지면 generate_presentation처럼 이미지를 동시에 생성하면서
+    각 슬라이드는 자신의 이미지가 준비되는 즉시 내놓습니다.
+    """
+    topic = slides_data.get('topic', '프레젠테이션')
+    slides = slides_data.get('slides', [])
+    if assets_dir is None:
+        assets_dir = os.path.join(html_dir, Path(html_filename(topic)).stem + '_files')
+    Path(assets_dir).mkdir(parents=True, exist_ok=True)
+    image_jobs = {}
+    if image_backend:
+        image_jobs = image_generation.start_image_generation(
+            slides, image_backend, images_dir, max_workers=image_workers)
+
+    yield ('<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="utf-8">\n'
+           '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+           f'<title>{html.escape(topic)}</title>\n'
+           f'<style>{_theme_css(slides_data.get("design_theme"))}</style>\n'
+           '</head>\n<body>\n<main>\n')
+    yield _title_section(topic)
+    for i, slide_data in enumerate(slides, 1):
+        image_path = os.path.join(images_dir, f'slide_{i}.png')
+        if i in image_jobs:
+            try:
+                image_path = image_jobs[i].result()
+            except Exception as e:
+                print(f"  ⚠ 이미지 생성 실패 (슬라이드 {i}): {e}")
+        figure = _figure(slide_data, i, image_path, html_dir, assets_dir, widths)
+        yield _content_section(slide_data, i, len(slides), figure)
+        print(f"✓ 슬라이드 {i} 내보내기 완료: {slide_data['title']}")
+    yield '</main>\n</body>\n</html>\n'
+
+
+def export_html(slides_data, output_dir='output', images_dir='images', filename=None,
+                widths=RESPONSIVE_WIDTHS, image_backend=None, image_workers=4):
+    """슬라이드 데이터를 HTML 한 페이지로 내보내고 파일 경로를 반환합니다.
+
+    슬라이드 단위로 임시 파일에 쓴 뒤 원자적으로 이름을 바꿉니다.
+    이미지 파생본은 <파일 이름>_files 디렉토리에 저장됩니다.
+    """
+    Path(output_dir).mkdir(exist_ok=True)
+    topic = slides_data.get('topic', '프레젠테이션')
+    output_path = os.path.join(output_dir, filename or html_filename(topic))
+    assets_dir = os.path.join(output_dir, Path(output_path).stem + '_files')
+
+    start = time.perf_counter()
+    tmp_path = f'{output_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in iter_html(slides_data, output_dir, images_dir, assets_dir, widths,
+                                   image_backend, image_workers):
+                f.write(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    assets_size = sum(entry.stat().st_size for entry in os.scandir(assets_dir) if entry.is_file())
+    print(f"\n{'='*60}")
+    print(f"✅ HTML 내보내기 완료! ({(time.perf_counter() - start) * 1000:.0f}ms)")
+    print(f"📁 파일 위치: {output_path}")
+    print(f"📊 총 슬라이드 수: {len(slides_data.get('slides', [])) + 1} (타이틀 포함)")
+    print(f"📦 HTML {os.path.getsize(output_path) / 1024:.1f}KB + 이미지 {assets_size / 1024:.1f}KB")
+    print(f"{'='*60}\n")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="슬라이드 JSON을 정적 HTML 한 페이지로 내보내기")
+    parser.add_argument('--json', default='slides.json',
+                        help="슬라이드 JSON 파일 또는 archive:<덱 ID> (기본값: slides.json)")
+    parser.add_argument('--images', default='images', help="슬라이드 이미지 디렉토리 (기본값: images)")
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--image-backend', choices=sorted(image_generation.IMAGE_BACKENDS),
+                        help="image_prompt로 빠진 슬라이드 이미지를 생성할 백엔드")
+    parser.add_argument('--widths', type=int, nargs='+', default=list(RESPONSIVE_WIDTHS),
+                        help="만들 파생 이미지 폭 (기본값: %(default)s)")
+    args = parser.parse_args()
+    if any(width <= 0 for width in args.widths):
+        parser.error("--widths는 1 이상의 폭(px)이어야 합니다.")
+
+    import generate_ppt
+
+    slides_data = generate_ppt.load_slides_data(args.json)
+    if not slides_data:
+        return
+    image_backend = None
+    if args.image_backend:
+        try:
+            image_backend = image_generation.get_image_backend(args.image_backend)
+        except ValueError as e:
+            print(f"⚠ 이미지 백엔드를 사용할 수 없습니다: {e}")
+    export_html(slides_data, args.output_dir, args.images, widths=args.widths, image_backend=image_backend)
+
+
+if __name__ == '__main__':
+    main()
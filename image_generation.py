@@ -0,0 +1,141 @@
+"""
+슬라이드 이미지 생성 스테이지
+각 슬라이드의 image_prompt를 이미지 백엔드로 보내 이미지를 생성합니다.
+요청은 제한된 크기의 스레드 풀에서 동시에 실행되고, 결과는 프롬프트와 파라미터의 해시로 캐시됩니다.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+IMAGE_CACHE_DIR = os.path.join('.cache', 'images')
+DEFAULT_IMAGE_SIZE = (1024, 768)  # 슬라이드 왼쪽 이미지 영역(4:3)에 맞춘 크기
+
+
+class LocalImageBackend:
+    """오프라인용 대체 백엔드: API 호출 없이 글라스모피즘 이미지를 렌더링합니다."""
+
+    name = 'local'
+    version = 2
+    extension = '.jpg'
+
+    def generate(self, prompt, width, height):
+        import theme_renderer
+
+        # 프롬프트마다 다른 모양이 나오도록 해시를 시드로 사용
+        seed = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+        return theme_renderer.render_placeholder(None, (width, height), seed=seed)
+
+
+class ImagenBackend:
+    """Gemini API(Imagen) REST 엔드포인트를 사용하는 백엔드"""
+
+    name = 'imagen'
+    version = 1
+    extension = '.png'
+    endpoint = 'https://generativelanguage.googleapis.com/v1beta/models/{model}:predict?key={key}'
+
+    def __init__(self, api_key=None, model='imagen-3.0-generate-002', timeout=120):
+        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.model = model
+        self.timeout = timeout
+        if not self.api_key:
+            raise ValueError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+
+    def generate(self, prompt, width, height):
+        body = json.dumps({
+            'instances': [{'prompt': prompt}],
+            'parameters': {'sampleCount': 1, 'aspectRatio': _aspect_ratio(width, height)},
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            self.endpoint.format(model=self.model, key=self.api_key),
+            data=body,
+            headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"이미지 생성 API 오류 {e.code}: {e.read()[:200]!r}") from e
+
+        predictions = result.get('predictions') or []
+        if not predictions:
+            raise RuntimeError("이미지 생성 API가 이미지를 반환하지 않았습니다.")
+        return base64.b64decode(predictions[0]['bytesBase64Encoded'])
+
+
+IMAGE_BACKENDS = {
+    LocalImageBackend.name: LocalImageBackend,
+    ImagenBackend.name: ImagenBackend,
+}
+
+
+def _aspect_ratio(width, height):
+    """Imagen이 지원하는 종횡비 중 가장 가까운 값을 고릅니다."""
+    supported = {'1:1': 1.0, '4:3': 4 / 3, '3:4': 3 / 4, '16:9': 16 / 9, '9:16': 9 / 16}
+    return min(supported, key=lambda k: abs(supported[k] - width / height))
+
+
+def get_image_backend(name):
+    """이름으로 이미지 백엔드를 생성합니다."""
+    if name not in IMAGE_BACKENDS:
+        raise ValueError(f"알 수 없는 이미지 백엔드: {name} (사용 가능: {', '.join(IMAGE_BACKENDS)})")
+    return IMAGE_BACKENDS[name]()
+
+
+def image_cache_key(backend, prompt, width, height):
+    """프롬프트와 생성 파라미터로 캐시 키를 만듭니다."""
+    params = {
+        'backend': backend.name,
+        'version': getattr(backend, 'version', 1),
+        'model': getattr(backend, 'model', None),
+        'prompt': prompt,
+        'size': [width, height],
+    }
+    payload = json.dumps(params, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def generate_image(backend, prompt, width, height, cache_dir=IMAGE_CACHE_DIR):
+    """이미지를 생성하거나 캐시에서 찾아 파일 경로를 반환합니다."""
+    extension = getattr(backend, 'extension', '.png')
+    cache_path = Path(cache_dir) / f'{image_cache_key(backend, prompt, width, height)}{extension}'
+    if cache_path.exists():
+        return str(cache_path)
+
+    data = backend.generate(prompt, width, height)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, cache_path)
+    return str(cache_path)
+
+
+def start_image_generation(slides, backend, images_dir='images', max_workers=4,
+                           size=DEFAULT_IMAGE_SIZE, cache_dir=IMAGE_CACHE_DIR):
+    """슬라이드 이미지 생성을 백그라운드에서 시작합니다.
+
+    images_dir에 직접 넣어 둔 slide_N.png가 있으면 그 슬라이드는 생성하지 않습니다.
+    반환값은 {슬라이드 번호: Future} 딕셔너리로, 각 Future는 이미지 경로를 돌려줍니다.
+    호출자는 슬라이드를 렌더링하면서 해당 Future만 기다리면 됩니다.
+    """
+    width, height = size
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='imagegen')
+    futures = {}
+    for i, slide in enumerate(slides, 1):
+        prompt = slide.get('image_prompt')
+        if not prompt or os.path.exists(os.path.join(images_dir, f'slide_{i}.png')):
+            continue
+        futures[i] = executor.submit(generate_image, backend, prompt, width, height, cache_dir)
+    # 제출된 작업은 계속 실행되며, 모두 끝나면 스레드가 정리됨
+    executor.shutdown(wait=False)
+
+    if futures:
+        print(f"🖼️  이미지 생성 시작: {len(futures)}장 (백엔드: {backend.name}, 동시 요청: {max_workers})")
+    return futures
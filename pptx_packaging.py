@@ -0,0 +1,113 @@
+"""
+PPTX 패키징(zip 저장) 프로필
+python-pptx의 prs.save()는 모든 파트를 같은 deflate 수준으로 압축하므로,
+이미 압축된 PNG/JPEG 이미지도 다시 deflate를 거칩니다. 이미지가 많은 덱에서는 이 시간이 렌더링의 큰 몫을 차지합니다.
+
+프로필:
+- fast: 이미 압축된 미디어는 압축 없이 저장(ZIP_STORED)하고, XML은 낮은 deflate 수준(1)으로 압축
+- small: 모든 파트를 최대 deflate 수준(9)으로 압축
+- default: python-pptx 기본 동작 (deflate 기본 수준)
+
+저장은 같은 디렉토리의 임시 파일에 쓴 뒤 원자적으로 이름을 바꾸므로,
+중간에 실패해도 반쯤 쓰인 .pptx가 남지 않고 기존 파일도 손상되지 않습니다.
+
+timestamp를 주면 재현 가능한 저장: 파트를 이름순으로 쓰고 모든 zip 항목의 시각과 속성을 고정해,
+같은 프레젠테이션은 언제 어디서 저장해도 같은 바이트가 됩니다.
+"""
+
+import os
+import zipfile
+
+from pptx.opc.serialized import PackageWriter
+
+PROFILES = {
+    'fast': {'media': (zipfile.ZIP_STORED, None), 'other': (zipfile.ZIP_DEFLATED, 1)},
+    'small': {'media': (zipfile.ZIP_DEFLATED, 9), 'other': (zipfile.ZIP_DEFLATED, 9)},
+    'default': {'media': (zipfile.ZIP_DEFLATED, None), 'other': (zipfile.ZIP_DEFLATED, None)},
+}
+
+
+def _default_profile():
+    """PPTX_PROFILE 환경 변수의 프로필 (없으면 default). 잘못된 값은 렌더링이 끝난 뒤가 아니라 지금 알림."""
+    profile = os.getenv('PPTX_PROFILE')
+    if not profile:
+        return 'default'
+    if profile not in PROFILES:
+        print(f"⚠ PPTX_PROFILE={profile!r}는 알 수 없는 프로필입니다 ({', '.join(PROFILES)} 중 선택). default로 저장합니다.")
+        return 'default'
+    return profile
+
+
+# fast/small은 --package-profile이나 PPTX_PROFILE로 직접 고를 때만 사용
+DEFAULT_PROFILE = _default_profile()
+
+# 다시 압축해도 거의 줄지 않는 형식
+COMPRESSED_MEDIA = {'.png', '.jpg', '.jpeg', '.gif', '.tif', '.tiff', '.wdp', '.jxr',
+                    '.mp3', '.m4a', '.mp4', '.m4v', '.mov', '.wmv', '.wma', '.zip'}
+
+
+class _ProfiledZipWriter:
+    """python-pptx의 물리 패키지 쓰기 객체와 같은 인터페이스로, 파트마다 압축 방식을 고릅니다."""
+
+    def __init__(self, pkg_file, profile, timestamp=None):
+        self._zipf = zipfile.ZipFile(pkg_file, 'w', strict_timestamps=False)
+        self._profile = profile
+        self._timestamp = timestamp
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._zipf.close()
+
+    def write(self, pack_uri, blob):
+        kind = 'media' if pack_uri.ext and f'.{pack_uri.ext.lower()}' in COMPRESSED_MEDIA else 'other'
+        compression, level = self._profile[kind]
+        member = pack_uri.membername
+        if self._timestamp:
+            # 현재 시각과 실행 환경(OS, 권한)에 따라 바뀌는 항목 속성을 고정
+            member = zipfile.ZipInfo(member, date_time=self._timestamp)
+            member.create_system = 0
+            member.external_attr = 0
+        self._zipf.writestr(member, blob, compress_type=compression, compresslevel=level)
+
+
+class _ProfiledPackageWriter(PackageWriter):
+    def __init__(self, pkg_file, pkg_rels, parts, profile, timestamp=None):
+        super().__init__(pkg_file, pkg_rels, parts)
+        self._profile = profile
+        self._timestamp = timestamp
+
+    def _write(self):
+        with _ProfiledZipWriter(self._pkg_file, self._profile, self._timestamp) as phys_writer:
+            self._write_content_types_stream(phys_writer)
+            self._write_pkg_rels(phys_writer)
+            self._write_parts(phys_writer)
+
+
+def write_package(prs, file, profile=DEFAULT_PROFILE, timestamp=None):
+    """프레젠테이션을 주어진 프로필로 file(경로 또는 파일 객체)에 씁니다.
+
+    timestamp((년, 월, 일, 시, 분, 초))를 주면 재현 가능한 형태로 씁니다.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"알 수 없는 패키징 프로필: {profile} ({', '.join(PROFILES)} 중 선택)")
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+    if timestamp:
+        parts = tuple(sorted(parts, key=lambda part: part.partname))
+    _ProfiledPackageWriter(file, package._rels, parts, PROFILES[profile], timestamp)._write()
+
+
+def save_presentation(prs, output_path, profile=DEFAULT_PROFILE, timestamp=None):
+    """임시 파일에 저장한 뒤 output_path로 원자적으로 이름을 바꿉니다."""
+    tmp_path = f'{output_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            write_package(prs, f, profile, timestamp)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return output_path
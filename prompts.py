@@ -0,0 +1,309 @@
+"""
+Gemini 호출에 쓰는 고정 지시문(system instruction)과 호출별 프롬프트
+요구사항과 출력 형식은 호출마다 바뀌지 않으므로 system_instruction으로 분리하고,
+장황한 JSON 예시 대신 짧은 스키마 설명을 씁니다. 호출마다 보내는 프롬프트에는 주제, 슬라이드 내용 등
+바뀌는 값만 남습니다.
+
+모든 model 호환 객체는 generate_content(..., system_instruction=...)로 지시문을 받습니다.
+- genai.GenerativeModel은 호출 인자로 지시문을 받지 못하므로 SystemInstructionModel로 감싸
+  지시문별 GenerativeModel을 만들어 재사용합니다 (같은 클라이언트 공유).
+- StubGenerativeModel과 스텁 서버는 지시문을 프롬프트 앞에 붙인 것처럼 응답하고 토큰을 셉니다.
+- GeminiPool, HedgedModel 등 래퍼는 인자를 그대로 전달합니다.
+
+record_usage()로 호출별 입력 토큰을 기록하면 print_usage()가 종류별 평균 입력 토큰과
+기존 인라인 프롬프트 대비 절감량(추정)을 출력합니다. 절감량은 기존 프롬프트와 새 지시문+프롬프트의
+고정 부분을 모델의 count_tokens로 세어 비교하고, 셀 수 없으면(스텁 등) 바이트 기준 추정치를 씁니다.
+"""
+
+import json
+import threading
+
+IMAGE_PROMPT_STYLE = ('modern glassmorphism style, gradient background with purple and blue tones, '
+                      'semi-transparent frosted glass elements, subtle blur effects, <구체적인 다이어그램 설명>, '
+                      'professional tech illustration, vibrant neon accents, clean minimalist design, '
+                      'soft shadows, depth layers')
+
+SLIDES_SYSTEM_INSTRUCTION = f"""너는 학술 발표용 슬라이드 콘텐츠를 작성한다. JSON만 반환하고 설명이나 코드 블록은 붙이지 않는다.
+출력 스키마:
+{{"topic": 요청한 주제, "design_theme": {{"primary_color": "#667eea", "secondary_color": "#764ba2", "accent_color": "#f093fb", "style": "glassmorphism"}}, "slides": [{{"title": 문자열, "content": [포인트 4-6개], "image_prompt": 문자열}}]}}
+규칙:
+- 구성: 도입 → 핵심 개념 → 심화 → 응용 → 미래 전망
+- 포인트는 간결하지만 정보가 풍부하게, 중요 개념은 **굵게** (예: **트랜스포머**)
+- 학술적으로 정확하되 위트있는 비유와 예시 포함 ("마치 ~처럼", "쉽게 말하면 ~"), 전문적이면서 재미있는 톤
+- image_prompt 형식: "{IMAGE_PROMPT_STYLE}"
+- 요청하면 각 슬라이드에 notes(포인트를 풀어 설명하는 3-5문장 구어체 대본)와 alt_text(이미지 내용을 설명하는 한국어 한 문장) 필드 추가"""
+
+ENHANCE_SYSTEM_INSTRUCTION = """너는 발표 슬라이드를 더 전문적이고 학술적으로 다듬는다. JSON만 반환한다.
+출력 스키마: {"title": "개선된 제목", "content": ["개선된 포인트", ...]}
+규칙: 제목은 더 명확하고 전문적으로, 포인트는 3-5개로 정리하고 각각 구체적이고 정보가 풍부하되 간결하게, 학술적 톤 유지"""
+
+TRANSLATE_SYSTEM_INSTRUCTION = """너는 발표 슬라이드 문자열을 번역한다. 입력은 JSON 문자열 배열이고, 번역한 JSON 문자열 배열만 반환한다.
+규칙: 배열의 순서와 개수 유지, **굵은 글씨**와 "개념: 설명" 형식 유지, 전문 용어는 해당 언어에서 널리 쓰는 표현, 고유명사(GPT, BERT 등)는 그대로, 발표 슬라이드에 맞게 간결하게"""
+
+SYSTEM_INSTRUCTIONS = {
+    'slides': SLIDES_SYSTEM_INSTRUCTION,
+    'enhance': ENHANCE_SYSTEM_INSTRUCTION,
+    'translate': TRANSLATE_SYSTEM_INSTRUCTION,
+}
+
+# 지시문을 분리하기 전 인라인 프롬프트의 고정 부분 (주제, 슬라이드 내용 등 바뀌는 값은 비움)
+LEGACY_PROMPTS = {
+    'slides': """
+주제: 
+
+위 주제에 대한 트렌디하고 고퀄리티 프레젠테이션을 위한 개의 슬라이드 콘텐츠를 생성해주세요.
+
+각 슬라이드는 다음 형식의 JSON으로 작성해주세요:
+
+{
+  "topic": "",
+  "design_theme": {
+    "primary_color": "#667eea",
+    "secondary_color": "#764ba2",
+    "accent_color": "#f093fb",
+    "style": "glassmorphism"
+  },
+  "slides": [
+    {
+      "title": "슬라이드 제목",
+      "content": [
+        "**핵심 개념**: 설명과 함께",
+        "재미있는 비유: 마치 ~처럼",
+        "구체적인 예시와 수치",
+        "**강조할 포인트**: 중요한 내용"
+      ],
+      "image_prompt": "modern glassmorphism style, gradient background with purple and blue tones, semi-transparent frosted glass elements, subtle blur effects, [구체적인 다이어그램 설명], professional tech illustration, vibrant neon accents, clean minimalist design, soft shadows, depth layers"
+    }
+  ]
+}
+
+요구사항:
+1. 총 장의 슬라이드 (논리적 구조: 도입 → 핵심 개념 → 심화 → 응용 → 미래 전망)
+2. 각 슬라이드는 4-6개의 핵심 포인트로 구성
+3. **중요 개념**은 마크다운 굵은 글씨로 표현 (예: **트랜스포머**, **어텐션 메커니즘**)
+4. 학술적 정확성을 유지하면서도 위트있는 비유와 예시를 포함
+   - 예: "마치 ~처럼", "~와 비슷하게", "쉽게 말하면 ~"
+5. 각 슬라이드마다 글라스모피즘 스타일 이미지 프롬프트 생성
+6. 이미지 프롬프트는 반드시 "modern glassmorphism style, gradient background with purple and blue tones..."로 시작
+7. 색상 테마: 보라-파랑-핑크 그라데이션 (#667eea, #764ba2, #f093fb)
+8. 전문적이면서도 흥미롭고 재미있는 톤 유지
+9. 각 포인트는 간결하지만 정보가 풍부하게
+
+JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
+""",
+    'enhance': """
+다음 슬라이드 콘텐츠를 더 전문적이고 학술적으로 개선해주세요:
+
+제목: 
+콘텐츠:
+
+
+요구사항:
+1. 제목을 더 명확하고 전문적으로 개선
+2. 각 포인트를 더 구체적이고 정보가 풍부하게 작성
+3. 학술적 톤 유지
+4. 3-5개의 핵심 포인트로 정리
+5. 간결하면서도 정보가 풍부하게
+
+다음 JSON 형식으로만 응답해주세요:
+{
+  "title": "개선된 제목",
+  "content": [
+    "개선된 포인트 1",
+    "개선된 포인트 2",
+    "개선된 포인트 3"
+  ]
+}
+""",
+    'translate': """
+다음 JSON 배열의 각 문자열을 로 번역해주세요.
+대상 언어: 
+
+요구사항:
+1. 배열의 순서와 개수를 그대로 유지 (문자열 개)
+2. **굵은 글씨** 마크다운과 "개념: 설명" 형식을 그대로 유지
+3. 전문 용어는 해당 언어에서 널리 쓰는 표현 사용, 고유명사(GPT, BERT 등)는 그대로 유지
+4. 발표 슬라이드에 맞게 간결하게
+
+번역한 JSON 문자열 배열만 반환하고, 다른 설명은 포함하지 마세요.
+번역할 문자열:
+
+""",
+}
+
+
+def estimate_tokens(text):
+    """텍스트의 토큰 수를 대략 추정합니다 (UTF-8 4바이트당 1토큰)."""
+    return max(1, len(text.encode('utf-8')) // 4)
+
+
+def build_slides_prompt(topic, num_slides, existing_titles=None, include_notes=False):
+    """슬라이드 생성 요청에서 호출마다 바뀌는 부분만 담은 프롬프트"""
+    prompt = f"주제: {topic}\n{num_slides}장의 슬라이드를 생성해주세요."
+    if include_notes:
+        prompt += '\n각 슬라이드에 "notes"와 "alt_text"도 포함해주세요.'
+    if existing_titles:
+        prompt += ("\n다음 슬라이드는 이미 있으니, 이어지면서 내용이 겹치지 않는 슬라이드만 생성해주세요:\n"
+                   + '\n'.join(f"- {title}" for title in existing_titles))
+    return prompt
+
+
+def build_enhance_prompt(slide_data):
+    """슬라이드 개선 요청에서 호출마다 바뀌는 부분만 담은 프롬프트"""
+    points = '\n'.join(f"- {point}" for point in slide_data.get('content', []))
+    return f"제목: {slide_data['title']}\n콘텐츠:\n{points}"
+
+
+def build_translate_prompt(strings, language, language_name=None):
+    """번역 요청에서 호출마다 바뀌는 부분만 담은 프롬프트 (스텁은 '대상 언어'와 '번역할 문자열:'을 인식)"""
+    return (f"대상 언어: {language} ({language_name or language}), 문자열 {len(strings)}개\n"
+            f"번역할 문자열:\n{json.dumps(strings, ensure_ascii=False)}")
+
+
+_EMPTY_PROMPTS = {
+    'slides': lambda: build_slides_prompt('', ''),
+    'enhance': lambda: build_enhance_prompt({'title': ''}),
+    'translate': lambda: build_translate_prompt([], ''),
+}
+
+
+def fixed_text(kind):
+    """지시문과 호출별 프롬프트 틀의 고정 부분"""
+    return f"{SYSTEM_INSTRUCTIONS[kind]}\n\n{_EMPTY_PROMPTS[kind]()}"
+
+
+def _token_counter(model):
+    """model을 감싼 래퍼들을 따라가며 count_tokens를 지원하는 모델을 찾습니다. 없으면 None."""
+    for _ in range(10):
+        if model is None or hasattr(model, 'count_tokens'):
+            return model
+        members = getattr(model, 'members', None)  # GeminiPool
+        model = members[0].model if members else getattr(model, 'model', None)
+    return None
+
+
+_savings = {}  # 종류 → (절감 토큰 수, 측정 방법)
+_savings_lock = threading.Lock()
+
+
+def saved_tokens(kind, model=None):
+    """기존 인라인 프롬프트 대비 호출당 줄어든 입력 토큰 수와 측정 방법을 반환합니다.
+
+    바뀌는 값은 두 프롬프트에 똑같이 들어가므로 고정 부분만 비교합니다.
+    모델이 count_tokens를 지원하면 실제 토크나이저로 세고(종류별로 한 번만 호출),
+    아니면 estimate_tokens로 추정합니다. 어느 쪽이든 구분 문자 등 몇 토큰의 오차가 있는 추정치입니다.
+    """
+    with _savings_lock:
+        if kind in _savings:
+            return _savings[kind]
+    counter = _token_counter(model)
+    result = None
+    if counter is not None:
+        try:
+            legacy = counter.count_tokens(LEGACY_PROMPTS[kind]).total_tokens
+            current = counter.count_tokens(fixed_text(kind)).total_tokens
+            result = (legacy - current, 'count_tokens')
+        except Exception as e:
+            print(f"  ⚠ 토큰 수를 셀 수 없어 바이트 기준으로 추정합니다: {e}")
+    if result is None:
+        result = (estimate_tokens(LEGACY_PROMPTS[kind]) - estimate_tokens(fixed_text(kind)), '바이트 기준')
+    with _savings_lock:
+        _savings[kind] = result
+    return result
+
+
+class SystemInstructionModel:
+    """genai.GenerativeModel에 호출별 system_instruction 인자를 더하는 model 호환 래퍼
+
+    지시문마다 GenerativeModel을 한 번만 만들어 재사용합니다. client를 넘기면(gemini_pool의 키별 클라이언트)
+    지시문별 모델도 그 클라이언트로 요청합니다.
+    system_instruction을 지원하지 않는 모델(400 오류)이면 지시문을 프롬프트 앞에 붙여 보냅니다.
+    """
+
+    def __init__(self, model, client=None):
+        self.model = model
+        self.client = client
+        self._variants = {}
+        self._inline = False
+        self._lock = threading.Lock()
+
+    @property
+    def model_name(self):
+        return self.model.model_name
+
+    def _variant(self, instruction):
+        with self._lock:
+            variant = self._variants.get(instruction)
+            if variant is None:
+                import google.generativeai as genai
+
+                variant = genai.GenerativeModel(self.model.model_name, system_instruction=instruction)
+                if self.client is not None:
+                    import gemini_pool
+
+                    gemini_pool.attach_client(variant, self.client)
+                self._variants[instruction] = variant
+            return variant
+
+    def generate_content(self, contents, *args, system_instruction=None, **kwargs):
+        if not system_instruction:
+            return self.model.generate_content(contents, *args, **kwargs)
+        if not self._inline:
+            try:
+                return self._variant(system_instruction).generate_content(contents, *args, **kwargs)
+            except Exception as e:
+                if getattr(e, 'code', None) != 400 or 'instruction' not in str(e).lower():
+                    raise
+                print(f"  ⚠ {self.model_name}은 system instruction을 지원하지 않아 프롬프트에 포함합니다.")
+                self._inline = True
+        if isinstance(contents, str):
+            contents = f"{system_instruction}\n\n{contents}"
+        else:
+            contents = [system_instruction, *contents]
+        return self.model.generate_content(contents, *args, **kwargs)
+
+
+class PromptUsage:
+    """종류별 호출 수와 실제 입력 토큰(usage_metadata)을 모읍니다."""
+
+    def __init__(self):
+        self.kinds = {}  # 종류 → {'calls', 'prompt_tokens', 'cached_tokens'}
+        self._lock = threading.Lock()
+
+    def record(self, kind, response):
+        usage = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(usage, 'prompt_token_count', 0) or 0
+        cached_tokens = getattr(usage, 'cached_content_token_count', 0) or 0
+        with self._lock:
+            entry = self.kinds.setdefault(kind, {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0})
+            entry['calls'] += 1
+            entry['prompt_tokens'] += prompt_tokens
+            entry['cached_tokens'] += cached_tokens
+        return prompt_tokens
+
+    def print_stats(self, model=None):
+        if not self.kinds:
+            return
+        labels = {'slides': '슬라이드 생성', 'enhance': '콘텐츠 개선', 'translate': '번역'}
+        print("\n📉 프롬프트 입력 토큰")
+        for kind, entry in self.kinds.items():
+            calls = entry['calls']
+            saved, method = saved_tokens(kind, model)
+            line = (f"  {labels.get(kind, kind)}: {calls}회, 호출당 입력 {entry['prompt_tokens'] / calls:.0f}토큰, "
+                    f"기존 프롬프트 대비 호출당 약 {saved}토큰 절감 추정 (총 {saved * calls}, {method})")
+            if entry['cached_tokens']:
+                line += f", 캐시 적중 {entry['cached_tokens'] / calls:.0f}토큰"
+            print(line)
+
+
+usage = PromptUsage()
+
+
+def record_usage(kind, response):
+    """응답의 입력 토큰을 기록하고 그 값을 반환합니다."""
+    return usage.record(kind, response)
+
+
+def print_usage(model=None):
+    """종류별 입력 토큰과 절감량 추정을 출력합니다. model이 있으면 그 토크나이저로 절감량을 셉니다."""
+    usage.print_stats(model)
@@ -0,0 +1,93 @@
+"""
+재현 가능한 PPT 빌드와 입력 해시 기반 결과 캐시
+같은 입력으로 두 번 렌더링하면 바이트 단위로 같은 .pptx가 나오도록 날짜를 고정하고,
+입력(슬라이드 데이터, 테마, 이미지, 렌더러 버전, 저장 옵션)의 해시로 완성된 PPTX를 캐시합니다.
+입력이 같으면 렌더링 없이 캐시된 파일을 복사해 돌려주므로, 캐시 디렉토리를 다른 머신과 공유해도 됩니다.
+
+빌드 날짜는 다음 순서로 정합니다.
+1. 명시적으로 지정한 날짜 (--build-date)
+2. SOURCE_DATE_EPOCH 환경 변수 (재현 가능한 빌드의 표준 관례)
+3. 슬라이드 데이터의 "date" 필드 (YYYY-MM-DD)
+4. 오늘 날짜 (같은 날 안에서만 재현됨)
+타이틀 슬라이드의 생성일, 문서 속성(docProps/core.xml), zip 항목의 시각이 모두 이 날짜를 씁니다.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+DECK_CACHE_DIR = os.path.join('.cache', 'decks')
+ZIP_EPOCH = datetime(1980, 1, 1)  # zip 형식이 표현할 수 있는 가장 이른 시각
+
+
+def parse_build_date(value):
+    """'YYYY-MM-DD' 문자열을 datetime(그날 0시)으로 바꿉니다."""
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"날짜 형식이 올바르지 않습니다: {value!r} (예: 2024-05-01)") from None
+
+
+def resolve_build_date(slides_data, build_date=None):
+    """재현 빌드에 쓸 날짜(그날 0시의 datetime)를 정합니다."""
+    if build_date:
+        return build_date if isinstance(build_date, datetime) else parse_build_date(build_date)
+    epoch = os.getenv('SOURCE_DATE_EPOCH')
+    if epoch:
+        moment = datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+        return datetime(moment.year, moment.month, moment.day)
+    if slides_data.get('date'):
+        return parse_build_date(slides_data['date'])
+    today = date.today()
+    return datetime(today.year, today.month, today.day)
+
+
+def zip_timestamp(build_date):
+    """zip 항목에 기록할 (년, 월, 일, 시, 분, 초)"""
+    return max(build_date, ZIP_EPOCH).timetuple()[:6]
+
+
+def file_digest(path):
+    """파일 내용의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def deck_cache_key(inputs):
+    """렌더링 결과를 결정하는 입력 딕셔너리의 해시"""
+    payload = json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def cached_deck(key, output_path, cache_dir=DECK_CACHE_DIR):
+    """캐시에 key의 PPTX가 있으면 output_path로 복사하고 경로를 반환합니다. 없으면 None."""
+    cache_path = Path(cache_dir) / f'{key}.pptx'
+    if not cache_path.exists():
+        return None
+    tmp_path = f'{output_path}.{os.getpid()}.tmp'
+    try:
+        shutil.copyfile(cache_path, tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return output_path
+
+
+def store_deck(key, output_path, cache_dir=DECK_CACHE_DIR):
+    """저장한 PPTX를 캐시에 넣습니다."""
+    cache_path = Path(cache_dir) / f'{key}.pptx'
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # 배치의 렌더 스레드가 같은 덱을 동시에 저장해도 임시 파일이 겹치지 않도록 스레드 ID 포함
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    shutil.copyfile(output_path, tmp_path)
+    os.replace(tmp_path, cache_path)
+    return str(cache_path)
@@ -0,0 +1,103 @@
+"""
+장시간 생성/개선 작업을 위한 체크포인트 유틸리티
+runs/ 아래에 실행별 디렉토리를 만들고 원본 응답, 파싱된 슬라이드, 개선 결과를 단계마다 저장합니다.
+중단된 실행은 --resume 옵션으로 남은 작업만 이어서 진행할 수 있습니다.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+RUNS_DIR = 'runs'
+RUN_META_FILE = 'run.json'
+
+
+def _atomic_write(path, text):
+    """임시 파일에 쓴 뒤 교체하여 중간에 끊겨도 파일이 깨지지 않게 합니다."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def create_run_dir(mode, params, runs_dir=RUNS_DIR):
+    """새 실행 디렉토리를 만들고 실행 정보를 기록합니다."""
+    run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_mode{mode}"
+    Path(runs_dir).mkdir(parents=True, exist_ok=True)
+    run_dir = Path(runs_dir) / run_id
+    suffix = 1
+    # 배치 실행에서 같은 초에 여러 실행이 만들어져도 디렉토리가 겹치지 않도록 mkdir 자체로 확인
+    while True:
+        try:
+            run_dir.mkdir()
+            break
+        except FileExistsError:
+            run_dir = Path(runs_dir) / f"{run_id}_{suffix}"
+            suffix += 1
+
+    meta = {
+        'mode': mode,
+        'params': params,
+        'status': 'running',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    save_json(run_dir, RUN_META_FILE, meta)
+    print(f"✓ 체크포인트 디렉토리: {run_dir}")
+    return str(run_dir)
+
+
+def find_latest_run(runs_dir=RUNS_DIR):
+    """완료되지 않은 가장 최근 실행 디렉토리를 찾습니다."""
+    if not os.path.isdir(runs_dir):
+        return None
+    for name in sorted(os.listdir(runs_dir), reverse=True):
+        meta = load_json(os.path.join(runs_dir, name), RUN_META_FILE)
+        if meta and meta.get('status') != 'done':
+            return os.path.join(runs_dir, name)
+    return None
+
+
+def load_run_meta(run_dir):
+    """실행 정보를 로드합니다."""
+    return load_json(run_dir, RUN_META_FILE)
+
+
+def update_run_meta(run_dir, **fields):
+    """실행 정보의 일부 필드를 갱신합니다."""
+    meta = load_run_meta(run_dir) or {}
+    meta.update(fields)
+    save_json(run_dir, RUN_META_FILE, meta)
+
+
+def save_text(run_dir, name, text):
+    """원본 응답 등 텍스트 체크포인트를 저장합니다."""
+    _atomic_write(Path(run_dir) / name, text)
+
+
+def load_text(run_dir, name):
+    """텍스트 체크포인트를 로드합니다. 없으면 None을 반환합니다."""
+    path = Path(run_dir) / name
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def save_json(run_dir, name, data):
+    """JSON 체크포인트를 저장합니다."""
+    _atomic_write(Path(run_dir) / name, json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def load_json(run_dir, name):
+    """JSON 체크포인트를 로드합니다. 없거나 손상되었으면 None을 반환합니다."""
+    text = load_text(run_dir, name)
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        print(f"  ⚠ 손상된 체크포인트 무시: {Path(run_dir) / name}")
+        return None
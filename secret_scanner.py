@@ -0,0 +1,249 @@
+"""
+비밀 정보(API 키, 토큰, 개인 키) 탐지 엔진
+모든 규칙을 하나의 결합 정규식으로 컴파일하고, 빠른 사전 필터가 찾은 후보 구간에만 적용합니다.
+엔트로피 검사는 정규식이 잡은 후보 값에만 수행합니다.
+"""
+
+import math
+import os
+import re
+import string
+from collections import Counter
+
+# 규칙이나 임계값을 바꾸면 올려서 스캔 캐시를 무효화
+RULES_VERSION = 2
+
+# 키 문자열 앞뒤가 다른 토큰 문자와 붙어 있지 않도록 하는 경계
+_B = r'(?<![A-Za-z0-9_\-])'
+_E = r'(?![A-Za-z0-9_\-])'
+
+# (이름, 패턴, 최소 엔트로피)
+# 패턴에 (?P<value>...) 그룹이 있으면 그 구간만 비밀 값으로 보고 엔트로피를 검사합니다.
+RULES = [
+    ('google_api_key', _B + r'AIza[0-9A-Za-z_\-]{35}' + _E, None),
+    ('google_oauth_token', _B + r'ya29\.[0-9A-Za-z_\-]{20,}', None),
+    ('google_oauth_client_secret', _B + r'GOCSPX-[0-9A-Za-z_\-]{28}' + _E, None),
+    ('aws_access_key_id', _B + r'(?:AKIA|ASIA)[0-9A-Z]{16}' + _E, None),
+    ('aws_secret_access_key',
+     r'(?i:aws_?secret_?access_?key)["\']?\s*[:=]\s*["\']?(?P<value>[A-Za-z0-9/+=]{40})' + _E, 3.5),
+    ('private_key', r'-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----', None),
+    ('github_token', _B + r'gh[pousr]_[A-Za-z0-9]{36,255}' + _E, None),
+    ('github_fine_grained_token', _B + r'github_pat_[A-Za-z0-9_]{82}' + _E, None),
+    ('slack_token', _B + r'xox[abposr]-[A-Za-z0-9\-]{10,}', None),
+    ('stripe_secret_key', _B + r'(?:sk|rk)_live_[0-9A-Za-z]{24,}' + _E, None),
+    ('openai_api_key', _B + r'sk-(?:proj-)?[A-Za-z0-9_\-]{20,}T3BlbkFJ[A-Za-z0-9_\-]{20,}' + _E, None),
+    ('anthropic_api_key', _B + r'sk-ant-[A-Za-z0-9_\-]{32,}' + _E, None),
+    ('jwt', _B + r'eyJ[A-Za-z0-9_\-]{10,}\.eyJ[A-Za-z0-9_\-]{10,}\.[A-Za-z0-9_\-]{10,}' + _E, None),
+    ('generic_secret_assignment',
+     r'(?i:api_?key|secret|token|passw(?:or)?d|credential)[A-Za-z0-9_]*["\']?\s*[:=]\s*["\']'
+     r'(?P<value>[A-Za-z0-9/+_=\-.]{16,})["\']', 3.5),
+    ('high_entropy_string', r'["\'](?P<value>[A-Za-z0-9+/_\-]{32,}={0,2})["\']', 4.5),
+]
+
+# 일반 규칙(컨텍스트/엔트로피 기반)이 특정 서비스 키를 감싸고 있으면 구체적인 규칙으로 보고
+_GENERIC_RULES = {'generic_secret_assignment', 'high_entropy_string'}
+
+
+# 사전 필터: 비밀 값은 대부분 토큰 문자가 MIN_TOKEN_RUN개 이상 이어진 구간이므로
+# bytes.translate로 토큰 문자를 1, 나머지를 0으로 바꾼 뒤 C 수준의 find로 그런 구간만 찾음
+TOKEN_CHARS = string.ascii_letters + string.digits + '_+/=.-'
+MIN_TOKEN_RUN = 16
+_TOKEN_TABLE = bytes(1 if chr(i) in TOKEN_CHARS else 0 for i in range(256))
+_TOKEN_RUN = b'\x01' * MIN_TOKEN_RUN
+# 토큰 구간이 없는 규칙(개인 키 헤더)은 리터럴로 찾음
+LITERAL_ANCHORS = [b'PRIVATE KEY']
+# 후보 구간 앞쪽으로 같은 줄에서 키워드(api_key = ...)를 찾아볼 최대 거리
+MAX_LOOKBACK = 256
+
+# 파일 스트리밍 검사 설정
+CHUNK_SIZE = 1024 * 1024
+# 청크 경계에 걸친 값을 찾기 위한 겹침 (가장 긴 비밀 값 + 키워드 문맥보다 길어야 함)
+CHUNK_OVERLAP = 4096
+MAX_FILE_SIZE = 20 * 1024 * 1024
+BINARY_SNIFF_SIZE = 8192
+# 텍스트로 취급하는 바이트 (탭/개행 등 일부 제어 문자 + 출력 가능한 ASCII + 8비트 바이트(UTF-8))
+_TEXT_BYTES = bytes([7, 8, 9, 10, 12, 13, 27]) + bytes(range(0x20, 0x7f)) + bytes(range(0x80, 0x100))
+
+
+def _compile_rules(rules):
+    """규칙들을 이름 있는 그룹의 하나의 교대(alternation) 정규식으로 합칩니다."""
+    parts = []
+    for index, (_, pattern, _) in enumerate(rules):
+        pattern = pattern.replace('(?P<value>', f'(?P<v{index}>')
+        parts.append(f'(?P<r{index}>{pattern})')
+    return re.compile('|'.join(parts).encode('ascii'))
+
+
+COMBINED_PATTERN = _compile_rules(RULES)
+SPECIFIC_PATTERN = _compile_rules([rule for rule in RULES if rule[0] not in _GENERIC_RULES])
+_SPECIFIC_NAMES = [rule[0] for rule in RULES if rule[0] not in _GENERIC_RULES]
+
+# 실제 키가 아닌 자리 표시자는 무시
+_PLACEHOLDER = re.compile(rb'(?i)your_|example|placeholder|dummy|xxxx|changeme')
+
+
+def shannon_entropy(value):
+    """문자(바이트) 단위 섀넌 엔트로피(문자당 비트)를 계산합니다."""
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum(n / length * math.log2(n / length) for n in Counter(value).values())
+
+
+def mask_secret(secret):
+    """발견된 값을 앞뒤 일부만 남기고 가립니다. 캐시와 출력에는 가린 값만 남깁니다."""
+    if isinstance(secret, bytes):
+        secret = secret.decode('utf-8', errors='replace')
+    keep = min(10, len(secret) // 4)
+    return secret[:keep] + '...' + secret[-4:]
+
+
+def candidate_windows(data, start=0, end=None):
+    """결합 정규식을 적용할 후보 구간 [(시작, 끝)]을 찾습니다.
+
+    긴 토큰 구간과 리터럴 앵커 주변만 남기고, 키워드를 볼 수 있도록 같은 줄의 앞부분까지 넓힙니다.
+    """
+    end = len(data) if end is None else end
+    mask = data.translate(_TOKEN_TABLE)
+    spans = []
+    pos = mask.find(_TOKEN_RUN, start, end)
+    while pos != -1:
+        run_end = mask.find(b'\x00', pos, end)
+        run_end = end if run_end == -1 else run_end
+        spans.append((pos, run_end))
+        pos = mask.find(_TOKEN_RUN, run_end, end)
+    for anchor in LITERAL_ANCHORS:
+        pos = data.find(anchor, start, end)
+        while pos != -1:
+            spans.append((pos, pos + len(anchor)))
+            pos = data.find(anchor, pos + 1, end)
+    spans.sort()
+
+    windows = []
+    for span_start, span_end in spans:
+        floor = max(start, span_start - MAX_LOOKBACK)
+        window_start = max(floor, data.rfind(b'\n', floor, span_start) + 1)
+        # 닫는 따옴표와 개인 키 헤더 끝('-----')까지 포함
+        window_end = min(end, span_end + 8)
+        if windows and window_start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], window_end)
+        else:
+            windows.append([window_start, window_end])
+    return windows
+
+
+def iter_matches(data, start=0, end=None):
+    """(규칙 이름, 비밀 값, 시작 오프셋)을 차례로 반환합니다."""
+    for window_start, window_end in candidate_windows(data, start, end):
+        for match in COMBINED_PATTERN.finditer(data, window_start, window_end):
+            index = int(match.lastgroup[1:])
+            name, _, min_entropy = RULES[index]
+            value_group = f'v{index}'
+            if value_group in COMBINED_PATTERN.groupindex:
+                value, offset = match.group(value_group), match.start(value_group)
+            else:
+                value, offset = match.group(), match.start()
+
+            if name in _GENERIC_RULES:
+                # 감싼 구간 안에 구체적인 서비스 키가 있으면 그 규칙으로 보고
+                specific = SPECIFIC_PATTERN.search(data, match.start(), match.end())
+                if specific:
+                    yield (_SPECIFIC_NAMES[int(specific.lastgroup[1:])],
+                           specific.group(), specific.start())
+                    continue
+                if _PLACEHOLDER.search(value):
+                    continue
+
+            # 엔트로피는 정규식이 잡은 후보 값에만 계산
+            if min_entropy is not None and shannon_entropy(value) < min_entropy:
+                continue
+            yield name, value, offset
+
+
+def _count_lines(data, matches, line_base=0):
+    """(규칙, 값, 오프셋) 목록에 줄 번호를 붙여 발견 항목으로 만듭니다."""
+    findings = []
+    line, last_offset = line_base + 1, 0
+    for name, value, offset in matches:
+        line += data.count(b'\n', last_offset, offset)
+        last_offset = offset
+        findings.append({'rule': name, 'secret': mask_secret(value), 'line': line})
+    return findings
+
+
+def scan_bytes(data):
+    """바이트열에서 비밀 정보를 찾아 [{'rule', 'secret'(가린 값), 'line'}] 목록으로 반환합니다."""
+    return _count_lines(data, iter_matches(data))
+
+
+def scan_text(text):
+    """문자열에서 비밀 정보를 찾습니다. scan_bytes와 같은 형식으로 반환합니다."""
+    return scan_bytes(text.encode('utf-8'))
+
+
+def is_binary(header):
+    """파일 앞부분만 보고 바이너리인지 판단합니다 (NUL 바이트 또는 제어 문자 비율)."""
+    if not header:
+        return False
+    if b'\x00' in header:
+        return True
+    control = header.translate(None, _TEXT_BYTES)
+    return len(control) / len(header) > 0.3
+
+
+def scan_stream(stream, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP, hasher=None):
+    """파일 객체를 고정 크기 청크로 읽으며 비밀 정보를 찾습니다.
+
+    청크 사이에 overlap 바이트를 겹쳐 경계에 걸친 값도 찾고,
+    값의 시작 오프셋 기준으로 한 번만 보고합니다. 메모리는 chunk_size + overlap 정도만 사용합니다.
+    hasher가 주어지면 읽은 내용을 그대로 흘려 넣습니다.
+    """
+    if chunk_size <= overlap:
+        raise ValueError("chunk_size는 overlap보다 커야 합니다.")
+    findings = []
+    buffer = b''
+    buffer_offset = 0   # buffer[0]의 파일 내 절대 위치
+    accept_from = 0     # 이 절대 위치 이전의 값은 이전 청크에서 이미 보고함
+    line_base = 0       # buffer 앞쪽에서 잘라낸 줄 수
+    while True:
+        chunk = stream.read(chunk_size)
+        if hasher is not None:
+            hasher.update(chunk)
+        buffer += chunk
+        eof = len(chunk) < chunk_size
+        # 마지막 청크가 아니면 끝부분 overlap 구간에서 시작하는 값은 다음 청크로 미룸
+        limit = len(buffer) if eof else len(buffer) - overlap
+        matches = [
+            (name, value, offset) for name, value, offset in iter_matches(buffer)
+            if accept_from - buffer_offset <= offset < limit
+        ]
+        findings.extend(_count_lines(buffer, matches, line_base))
+        if eof:
+            return findings
+
+        accept_from = buffer_offset + limit
+        # 미룬 값의 키워드를 볼 수 있도록 MAX_LOOKBACK만큼 앞부분도 남김
+        cut = max(0, limit - MAX_LOOKBACK)
+        line_base += buffer.count(b'\n', 0, cut)
+        buffer = buffer[cut:]
+        buffer_offset += cut
+
+
+def scan_file(path, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP, max_size=MAX_FILE_SIZE, hasher=None):
+    """파일을 스트리밍으로 검사해 {'findings', 'skipped'}를 반환합니다.
+
+    skipped는 검사하지 않은 이유('binary', 'too_large')이거나 None입니다.
+    """
+    size = os.path.getsize(path)
+    if max_size is not None and size > max_size:
+        return {'findings': [], 'skipped': 'too_large'}
+    with open(path, 'rb') as f:
+        header = f.read(BINARY_SNIFF_SIZE)
+        if is_binary(header):
+            if hasher is not None:
+                hasher.update(header)
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    hasher.update(chunk)
+            return {'findings': [], 'skipped': 'binary'}
+        f.seek(0)
+        return {'findings': scan_stream(f, chunk_size, overlap, hasher), 'skipped': None}
@@ -0,0 +1,238 @@
+"""
+용량 한도에 맞춘 PPTX 저장
+저장하기 전에 패키지의 XML 파트와 이미지 파트 크기로 최종 파일 크기를 추정하고,
+한도를 넘으면 이미지마다 해상도와 JPEG 품질을 골라 한 번씩만 다시 인코딩합니다.
+저장 결과를 보고 다시 줄이는 반복 저장은 하지 않습니다.
+
+이미지 크기 예측: 목표 해상도로 줄인 이미지에서 가로 띠 몇 개(SAMPLE_STRIPES × SAMPLE_HEIGHT 픽셀)만
+잘라 품질별로 인코딩해 픽셀당 바이트를 재고, 전체 픽셀 수를 곱합니다.
+예측이 빗나가도 한도를 지키도록, 이미지를 하나 인코딩할 때마다 실제 크기를 반영해
+아직 인코딩하지 않은 이미지의 단계를 다시 정합니다 (이미지마다 인코딩은 한 번뿐).
+
+크기 단위(KB, MB, GB)는 10진수(1MB = 1,000,000바이트)로 해석하므로, 업로드 한도가 MiB 기준이어도 넘지 않습니다.
+"""
+
+import io
+import re
+import zipfile
+import zlib
+
+from PIL import Image
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import PackURI
+from pptx.opc.serialized import _ContentTypesItem
+
+import pptx_packaging
+
+# 크기가 큰 것부터 작은 것 순서의 (긴 변 최대 픽셀, JPEG 품질) 단계
+LEVELS = [(2048, 90), (1600, 85), (1280, 85), (1280, 75), (1024, 75), (1024, 65),
+          (800, 65), (800, 55), (640, 55), (640, 45), (480, 45)]
+SAMPLE_STRIPES = 4
+SAMPLE_HEIGHT = 32
+SAFETY_MARGIN = 0.02  # 추정 오차를 감안해 한도에서 남겨 두는 비율
+RESAMPLE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'bmp', 'gif', 'tif', 'tiff'}
+
+# zip 항목마다 붙는 로컬 헤더(30바이트)와 중앙 디렉토리 항목(46바이트), 그리고 끝 레코드(22바이트)
+_ZIP_ENTRY_OVERHEAD = 30 + 46
+_ZIP_END_RECORD = 22
+
+_SIZE = re.compile(r'^\s*([\d.]+)\s*([KMG]?)B?\s*$', re.IGNORECASE)
+_UNITS = {'': 1, 'K': 1000, 'M': 1000 ** 2, 'G': 1000 ** 3}
+
+
+def parse_size(value):
+    """'20MB', '500K', '1.5G', 20000000 같은 값을 바이트 수로 바꿉니다."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _SIZE.match(str(value))
+    if not match:
+        raise ValueError(f"크기를 해석할 수 없습니다: {value!r} (예: 20MB, 500KB)")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def format_size(size):
+    return f"{size / 1000 ** 2:.2f}MB" if size >= 1000 ** 2 else f"{size / 1000:.0f}KB"
+
+
+def _deflated_size(data, level):
+    return len(zlib.compress(data, 6 if level is None else level)) - 6  # zlib 헤더/체크섬 제외
+
+
+def _stored_size(membername, data, compression):
+    """zip 항목 하나가 차지할 바이트 수"""
+    compress_type, level = compression
+    size = len(data) if compress_type == zipfile.ZIP_STORED else _deflated_size(data, level)
+    return size + _ZIP_ENTRY_OVERHEAD + 2 * len(membername.encode('utf-8'))
+
+
+def _is_image(part):
+    return part.content_type.startswith('image/') and part.partname.ext.lower() in RESAMPLE_EXTENSIONS
+
+
+class _ImageCandidate:
+    """이미지 파트 하나와 단계별 예상 크기"""
+
+    def __init__(self, part):
+        self.part = part
+        self.original_size = len(part.blob)
+        self.options = []  # [(예상 크기, (폭, 높이), 품질)], 크기가 줄어드는 단계만
+        with Image.open(io.BytesIO(part.blob)) as image:
+            self.dimensions = image.size
+            image = _flatten(image)
+            samples = {}
+            current = self.original_size
+            for max_side, quality in LEVELS:
+                dimensions = _fit(self.dimensions, max_side)
+                if dimensions not in samples:
+                    resized = image if dimensions == image.size else image.resize(dimensions, Image.LANCZOS)
+                    samples[dimensions] = _sample_stripes(resized)
+                predicted = _predict_jpeg_size(samples[dimensions], dimensions, quality)
+                if predicted < current:
+                    self.options.append((predicted, dimensions, quality))
+                    current = predicted
+        self.level = -1  # -1이면 원본 유지
+
+    @property
+    def size(self):
+        return self.original_size if self.level < 0 else self.options[self.level][0]
+
+    def next_saving(self):
+        if self.level + 1 >= len(self.options):
+            return 0
+        return self.size - self.options[self.level + 1][0]
+
+
+def _sample_stripes(image):
+    """이미지 높이에 고르게 퍼진 가로 띠들을 세로로 이어 붙인 표본 이미지를 만듭니다."""
+    width, height = image.size
+    stripe = min(SAMPLE_HEIGHT, height)
+    count = min(SAMPLE_STRIPES, max(1, height // stripe))
+    sample = Image.new('RGB', (width, stripe * count))
+    for i in range(count):
+        top = (height - stripe) * (2 * i + 1) // (2 * count)
+        sample.paste(image.crop((0, top, width, top + stripe)), (0, i * stripe))
+    return sample
+
+
+def _jpeg_size(image, quality):
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    return len(buffer.getvalue())
+
+
+def _predict_jpeg_size(sample, dimensions, quality):
+    """표본의 픽셀당 바이트로 전체 이미지의 JPEG 크기를 예측합니다 (헤더 크기는 따로 계산)."""
+    header = _jpeg_size(Image.new('RGB', (8, 8)), quality)
+    per_pixel = max(0, _jpeg_size(sample, quality) - header) / (sample.width * sample.height)
+    return int(per_pixel * dimensions[0] * dimensions[1]) + header
+
+
+def _fit(dimensions, max_side):
+    width, height = dimensions
+    scale = min(1.0, max_side / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _flatten(image):
+    """투명 배경은 흰색으로 채워 JPEG로 저장할 수 있는 RGB 이미지를 만듭니다."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def estimate_package(prs, profile=pptx_packaging.DEFAULT_PROFILE):
+    """저장될 파일 크기를 추정합니다. (이미지 외 파트 크기, [_ImageCandidate]) 를 반환합니다."""
+    settings = pptx_packaging.PROFILES[profile]
+    package = prs.part.package
+    parts = list(package.iter_parts())
+    fixed = _ZIP_END_RECORD
+    content_types = serialize_part_xml(_ContentTypesItem.xml_for(parts))
+    fixed += _stored_size('[Content_Types].xml', content_types, settings['other'])
+    fixed += _stored_size('_rels/.rels', package._rels.xml, settings['other'])
+    images = []
+    for part in parts:
+        if part.rels:
+            fixed += _stored_size(part.partname.rels_uri.membername, part.rels.xml, settings['other'])
+        if _is_image(part):
+            images.append(_ImageCandidate(part))
+            # 이미지 항목의 zip 머리 부분은 다시 인코딩해도 거의 같으므로 고정 크기로 계산
+            fixed += _ZIP_ENTRY_OVERHEAD + 2 * len(part.partname.membername)
+            continue
+        kind = 'media' if f'.{part.partname.ext.lower()}' in pptx_packaging.COMPRESSED_MEDIA else 'other'
+        fixed += _stored_size(part.partname.membername, part.blob, settings[kind])
+    return fixed, images
+
+
+def plan_images(images, image_budget):
+    """이미지 예상 크기 합계가 image_budget 이하가 될 때까지, 한 단계 낮췄을 때 가장 많이 줄어드는 이미지부터 낮춥니다.
+
+    한도를 맞출 수 있으면 True를 반환합니다. 맞출 수 없으면 모든 이미지가 가장 낮은 단계가 됩니다.
+    """
+    total = sum(image.size for image in images)
+    while total > image_budget:
+        candidate = max(images, key=lambda image: image.next_saving(), default=None)
+        if candidate is None or candidate.next_saving() <= 0:
+            return False
+        total -= candidate.next_saving()
+        candidate.level += 1
+    return True
+
+
+def _reencode(package, candidate):
+    """계획한 해상도와 품질로 이미지 파트를 JPEG로 바꿉니다. 실제 바이트 수를 반환합니다."""
+    _, dimensions, quality = candidate.options[candidate.level]
+    part = candidate.part
+    with Image.open(io.BytesIO(part.blob)) as image:
+        image = _flatten(image)
+        if image.size != dimensions:
+            image = image.resize(dimensions, Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    part._blob = buffer.getvalue()
+    if part.partname.ext.lower() not in ('jpg', 'jpeg'):
+        part.partname = PackURI(package.next_image_partname('jpeg'))
+    # content_type은 처음 읽을 때 캐시되므로 캐시도 함께 지움
+    part._content_type = 'image/jpeg'
+    part.__dict__.pop('content_type', None)
+    return len(part._blob)
+
+
+def fit_to_budget(prs, max_size, profile=pptx_packaging.DEFAULT_PROFILE):
+    """저장 전에 프레젠테이션의 이미지를 다시 인코딩해 예상 파일 크기를 max_size 이하로 맞춥니다.
+
+    바꾼 내용을 출력하고, 다시 인코딩한 뒤의 예상 파일 크기를 반환합니다.
+    """
+    fixed, images = estimate_package(prs, profile)
+    original_total = fixed + sum(image.original_size for image in images)
+    budget = int(max_size * (1 - SAFETY_MARGIN))
+    if original_total <= budget:
+        print(f"📦 예상 크기 {format_size(original_total)} (한도 {format_size(max_size)} 이내, 이미지 변경 없음)")
+        return original_total
+
+    print(f"📦 예상 크기 {format_size(original_total)}가 한도 {format_size(max_size)}를 넘어 이미지를 다시 인코딩합니다")
+    package = prs.part.package
+    pending = list(images)
+    encoded_total = 0
+    fits = True
+    while True:
+        # 이미 인코딩한 이미지의 실제 크기를 빼고 남은 예산으로 나머지 이미지의 단계를 다시 정함
+        fits = plan_images(pending, budget - fixed - encoded_total)
+        planned = [image for image in pending if image.level >= 0]
+        if not planned:
+            break
+        image = max(planned, key=lambda image: image.original_size)
+        pending.remove(image)
+        old_name = image.part.partname
+        actual = _reencode(package, image)
+        encoded_total += actual
+        _, (width, height), quality = image.options[image.level]
+        print(f"  {old_name}: {image.dimensions[0]}x{image.dimensions[1]} {format_size(image.original_size)} → "
+              f"{width}x{height} JPEG q{quality} {format_size(actual)}")
+    total = fixed + encoded_total + sum(image.original_size for image in pending)
+    print(f"  이미지 {len(images) - len(pending)}/{len(images)}개 변경, 예상 크기 {format_size(total)}")
+    if not fits:
+        print("  ⚠ 이미지를 가장 낮은 단계로 줄여도 한도를 맞출 수 없습니다")
+    return total
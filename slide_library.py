@@ -0,0 +1,261 @@
+"""
+생성된 슬라이드를 검색하고 재조합하는 SQLite FTS5 라이브러리
+모드 2/3이 만든 slides_generated_*.json, slides_enhanced_*.json을 색인해
+주제, 제목, 본문, 이미지 프롬프트, 테마로 검색하고,
+검색 결과로 새 덱을 조립해 Gemini 호출 없이 바로 PPT로 렌더링합니다.
+
+사용 예:
+    python slide_library.py ingest                         # slides_*.json 색인 (변경된 파일만)
+    python slide_library.py search "트랜스포머 어텐션"
+    python slide_library.py compose "어텐션" --topic "어텐션 특강" -n 8 --images local
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+import image_generation
+
+LIBRARY_FILE = 'slide_library.db'
+DEFAULT_PATTERNS = ('slides_generated_*.json', 'slides_enhanced_*.json')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    topic TEXT,
+    design_theme TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS slides (
+    id INTEGER PRIMARY KEY,
+    deck_id INTEGER NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS slides_deck ON slides(deck_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS slides_fts USING fts5(
+    topic, title, bullets, image_prompt, theme, tokenize='unicode61'
+);
+"""
+
+# 검색어에서 FTS5 문법으로 해석될 수 있는 문자를 제거할 때 사용
+_QUERY_TERM = re.compile(r'\w+')
+
+
+def connect(path=LIBRARY_FILE):
+    """라이브러리 DB에 연결하고 스키마를 준비합니다."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _theme_text(design_theme):
+    return ' '.join(str(v) for v in (design_theme or {}).values())
+
+
+def _delete_deck(conn, deck_id):
+    conn.execute('DELETE FROM slides_fts WHERE rowid IN (SELECT id FROM slides WHERE deck_id = ?)', (deck_id,))
+    conn.execute('DELETE FROM decks WHERE id = ?', (deck_id,))
+
+
+def ingest_file(conn, path):
+    """JSON 파일 하나를 색인합니다. 마지막 색인 이후 바뀌지 않았으면 건너뛰고 False를 반환합니다."""
+    st = os.stat(path)
+    row = conn.execute('SELECT id, size, mtime_ns FROM decks WHERE path = ?', (path,)).fetchone()
+    if row and row['size'] == st.st_size and row['mtime_ns'] == st.st_mtime_ns:
+        return False
+
+    with open(path, 'r', encoding='utf-8') as f:
+        slides_data = json.load(f)
+    if row:
+        _delete_deck(conn, row['id'])
+
+    topic = slides_data.get('topic', '')
+    design_theme = slides_data.get('design_theme')
+    deck_id = conn.execute(
+        'INSERT INTO decks (path, topic, design_theme, size, mtime_ns, ingested_at) VALUES (?, ?, ?, ?, ?, ?)',
+        (path, topic, json.dumps(design_theme, ensure_ascii=False), st.st_size, st.st_mtime_ns,
+         datetime.now().isoformat(timespec='seconds')),
+    ).lastrowid
+    theme = _theme_text(design_theme)
+    for position, slide in enumerate(slides_data.get('slides', []), 1):
+        slide_id = conn.execute('INSERT INTO slides (deck_id, position, data) VALUES (?, ?, ?)',
+                                (deck_id, position, json.dumps(slide, ensure_ascii=False))).lastrowid
+        conn.execute(
+            'INSERT INTO slides_fts (rowid, topic, title, bullets, image_prompt, theme) VALUES (?, ?, ?, ?, ?, ?)',
+            (slide_id, topic, slide.get('title', ''), '\n'.join(slide.get('content', [])),
+             slide.get('image_prompt', ''), theme),
+        )
+    return True
+
+
+def ingest(paths=None, db_path=LIBRARY_FILE, conn=None):
+    """slides_*.json 파일들을 색인하고 (새로 색인한 파일 수, 전체 파일 수)를 반환합니다.
+
+    사라진 파일의 슬라이드는 라이브러리에서도 제거합니다.
+    """
+    own_conn = conn is None
+    conn = conn or connect(db_path)
+    if paths is None:
+        paths = sorted(p for pattern in DEFAULT_PATTERNS for p in glob.glob(pattern))
+    updated = 0
+    with conn:
+        for path in paths:
+            try:
+                updated += ingest_file(conn, path)
+            except (OSError, json.JSONDecodeError, AttributeError) as e:
+                print(f"  ⚠ 색인 실패: {path} - {e}")
+        for row in conn.execute('SELECT id, path FROM decks').fetchall():
+            if not os.path.exists(row['path']):
+                _delete_deck(conn, row['id'])
+    if own_conn:
+        conn.close()
+    return updated, len(paths)
+
+
+def to_match_query(text):
+    """자연어 검색어를 FTS5 질의로 바꿉니다.
+
+    한국어는 조사가 단어 뒤에 붙으므로("트랜스포머와") 각 단어를 접두어 검색으로 만듭니다.
+    """
+    return ' AND '.join(f'"{term}"*' for term in _QUERY_TERM.findall(text))
+
+
+def search(conn, query, limit=20, raw=False):
+    """슬라이드를 검색해 관련도 순으로 반환합니다.
+
+    반환 항목: {'deck', 'topic', 'position', 'slide', 'design_theme', 'snippet', 'score'}
+    raw=True이면 query를 FTS5 문법 그대로 사용합니다 (예: 'title:GPT OR bullets:어텐션*').
+    """
+    match = query if raw else to_match_query(query)
+    if not match:
+        return []
+    rows = conn.execute(
+        """
+        SELECT decks.path, decks.topic, decks.design_theme, slides.position, slides.data,
+               snippet(slides_fts, -1, '[', ']', '…', 12) AS snippet,
+               bm25(slides_fts, 2.0, 4.0, 1.0, 0.5, 0.2) AS score
+        FROM slides_fts
+        JOIN slides ON slides.id = slides_fts.rowid
+        JOIN decks ON decks.id = slides.deck_id
+        WHERE slides_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        (match, limit),
+    ).fetchall()
+    return [{
+        'deck': row['path'],
+        'topic': row['topic'],
+        'position': row['position'],
+        'slide': json.loads(row['data']),
+        'design_theme': json.loads(row['design_theme']) if row['design_theme'] else None,
+        'snippet': row['snippet'],
+        'score': -row['score'],
+    } for row in rows]
+
+
+def compose_deck(hits, topic, design_theme=None, limit=10):
+    """검색 결과로 새 덱(slides_data)을 조립합니다. 제목이 같은 슬라이드는 한 번만 넣습니다."""
+    slides, seen = [], set()
+    for hit in hits:
+        title = hit['slide'].get('title', '')
+        if title in seen:
+            continue
+        seen.add(title)
+        slides.append(hit['slide'])
+        if len(slides) >= limit:
+            break
+    if design_theme is None:
+        design_theme = next((hit['design_theme'] for hit in hits if hit['design_theme']), None)
+    slides_data = {'topic': topic, 'slides': slides}
+    if design_theme:
+        slides_data['design_theme'] = design_theme
+    return slides_data
+
+
+def print_hits(hits):
+    for hit in hits:
+        print(f"{hit['score']:6.2f}  {hit['slide'].get('title', '')}  "
+              f"({hit['topic']} #{hit['position']}, {hit['deck']})")
+        print(f"        {hit['snippet']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="생성된 슬라이드 검색 및 재조합")
+    parser.add_argument('--db', default=LIBRARY_FILE, help=f"라이브러리 DB 경로 (기본: {LIBRARY_FILE})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help="slides_*.json 파일 색인")
+    ingest_parser.add_argument('paths', nargs='*', help="색인할 JSON 파일 (생략 시 slides_generated/enhanced_*.json)")
+
+    for name, help_text in (('search', "슬라이드 검색"), ('compose', "검색 결과로 새 덱 조립 후 렌더링")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument('query', help="검색어 (단어는 접두어로 검색)")
+        sub.add_argument('-n', '--limit', type=int, default=10)
+        sub.add_argument('--raw', action='store_true', help="검색어를 FTS5 문법 그대로 사용")
+        sub.add_argument('--no-ingest', action='store_true', help="검색 전에 새 파일을 색인하지 않음")
+        if name == 'compose':
+            sub.add_argument('--topic', help="새 덱의 주제 (기본: 검색어)")
+            sub.add_argument('--json', metavar='PATH', help="조립한 slides 데이터를 JSON으로 저장")
+            sub.add_argument('--output-dir', default='output')
+            sub.add_argument('--images', choices=sorted(image_generation.IMAGE_BACKENDS),
+                             help="image_prompt로 이미지를 생성할 백엔드")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == 'ingest':
+        updated, total = ingest(args.paths or None, conn=conn)
+        count = conn.execute('SELECT COUNT(*) FROM slides').fetchone()[0]
+        print(f"✓ 색인 완료: 파일 {total}개 중 {updated}개 갱신, 라이브러리 슬라이드 {count}장")
+        return
+
+    if not args.no_ingest:
+        ingest(conn=conn)
+    start = time.perf_counter()
+    # 같은 슬라이드가 여러 덱(생성본과 개선본 등)에 있을 수 있으므로 조립할 때는 넉넉히 검색
+    try:
+        hits = search(conn, args.query, limit=args.limit * 10 if args.command == 'compose' else args.limit,
+                      raw=args.raw)
+    except sqlite3.OperationalError as e:
+        print(f"❌ 검색어를 해석할 수 없습니다: {e}")
+        return
+    if args.command == 'search':
+        print_hits(hits)
+        print(f"\n검색 결과 {len(hits)}건 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+        return
+
+    if not hits:
+        print("❌ 검색 결과가 없어 덱을 조립할 수 없습니다.")
+        return
+    slides_data = compose_deck(hits, args.topic or args.query, limit=args.limit)
+    print(f"✓ 슬라이드 {len(slides_data['slides'])}장으로 덱 조립 완료 "
+          f"({(time.perf_counter() - start) * 1000:.1f}ms, API 호출 없음)")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(slides_data, f, ensure_ascii=False, indent=2)
+        print(f"✓ 조립한 슬라이드 데이터 저장: {args.json}")
+
+    import generate_ppt
+
+    image_backend = None
+    if args.images:
+        try:
+            image_backend = image_generation.get_image_backend(args.images)
+        except ValueError as e:
+            print(f"⚠ 이미지 백엔드를 사용할 수 없습니다: {e}")
+    generate_ppt.generate_presentation(slides_data, output_dir=args.output_dir, image_backend=image_backend)
+
+
+if __name__ == '__main__':
+    main()
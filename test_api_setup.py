@@ -1,11 +1,25 @@
 """
 Gemini API 설정 테스트 스크립트
 API 키가 올바르게 설정되었는지 확인합니다.
+--probe 옵션을 주면 여러 요청을 동시에 보내 지연 시간과 처리량을 측정합니다.
 """
 
+import argparse
+import json
 import os
+import socket
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
 from dotenv import load_dotenv
 
+GEMINI_API_BASE = 'https://generativelanguage.googleapis.com/v1beta'
+PROBE_MODEL = 'gemini-pro'
+PROBE_PROMPT = "안녕하세요! 짧게 인사해주세요."
+PROBE_OUTPUT = 'probe_results.json'
+
 def test_env_file():
     """환경 변수 파일 확인"""
     print("\n" + "="*60)
@@ -128,8 +142,183 @@ def test_api_connection():
         return False
 
 
+def _probe_request(base_url, model, api_key, prompt, max_tokens, timeout):
+    """스트리밍 요청 하나를 보내 지연 시간, 첫 토큰 시간, 출력 토큰 수를 측정합니다."""
+    url = f"{base_url}/models/{model}:streamGenerateContent?alt=sse"
+    if api_key:
+        url += f"&key={api_key}"
+    body = json.dumps({
+        'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+        'generationConfig': {'temperature': 0.5, 'maxOutputTokens': max_tokens},
+    }).encode('utf-8')
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+
+    sample = {'latency': None, 'ttft': None, 'output_tokens': 0, 'chunks': 0, 'error': None}
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            for line in response:
+                if not line.startswith(b'data:'):
+                    continue
+                if sample['ttft'] is None:
+                    sample['ttft'] = time.perf_counter() - start
+                sample['chunks'] += 1
+                chunk = json.loads(line[5:])
+                usage = chunk.get('usageMetadata')
+                if usage:
+                    sample['output_tokens'] = usage.get('candidatesTokenCount', 0)
+        sample['latency'] = time.perf_counter() - start
+    except urllib.error.HTTPError as e:
+        sample['error'] = str(e.code)
+    except (socket.timeout, TimeoutError):
+        sample['error'] = 'timeout'
+    except urllib.error.URLError as e:
+        sample['error'] = 'timeout' if isinstance(e.reason, socket.timeout) else 'connection'
+    except Exception as e:
+        sample['error'] = type(e).__name__
+    return sample
+
+
+def percentile(values, pct):
+    """정렬된 값에서 nearest-rank 방식으로 백분위수를 구합니다."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def _latency_summary(values):
+    values = sorted(values)
+    if not values:
+        return None
+    return {
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'mean': sum(values) / len(values),
+        'max': values[-1],
+    }
+
+
+def run_probe(base_url=GEMINI_API_BASE, model=PROBE_MODEL, api_key=None, requests=20,
+              concurrency=4, prompt=PROBE_PROMPT, max_tokens=256, timeout=60):
+    """requests개의 요청을 concurrency개씩 동시에 보내고 측정 결과를 반환합니다."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_probe_request, base_url, model, api_key, prompt, max_tokens, timeout)
+                   for _ in range(requests)]
+        samples = [future.result() for future in futures]
+    wall_time = time.perf_counter() - start
+
+    succeeded = [s for s in samples if s['error'] is None]
+    errors = {}
+    for s in samples:
+        if s['error'] is not None:
+            errors[s['error']] = errors.get(s['error'], 0) + 1
+    output_tokens = sum(s['output_tokens'] for s in succeeded)
+    # 요청별 생성 속도: 첫 토큰 이후 스트리밍 구간의 토큰/초 (청크가 하나뿐이면 측정 불가)
+    decode_rates = [s['output_tokens'] / (s['latency'] - s['ttft']) for s in succeeded
+                    if s['chunks'] > 1 and s['latency'] > s['ttft']]
+
+    return {
+        'config': {'base_url': base_url, 'model': model, 'requests': requests,
+                   'concurrency': concurrency, 'max_tokens': max_tokens},
+        'summary': {
+            'succeeded': len(succeeded),
+            'failed': len(samples) - len(succeeded),
+            'errors': errors,
+            'wall_time': wall_time,
+            'requests_per_second': len(succeeded) / wall_time if wall_time else None,
+            'tokens_per_second': output_tokens / wall_time if wall_time else None,
+            'per_request_tokens_per_second': (sum(decode_rates) / len(decode_rates)
+                                              if decode_rates else None),
+            'latency': _latency_summary([s['latency'] for s in succeeded]),
+            'ttft': _latency_summary([s['ttft'] for s in succeeded if s['ttft'] is not None]),
+        },
+        'samples': samples,
+    }
+
+
+def print_probe_report(report):
+    """측정 결과 요약을 출력합니다."""
+    config, summary = report['config'], report['summary']
+    print("\n" + "="*60)
+    print("📈 지연 시간/처리량 측정 결과")
+    print("="*60)
+    print(f"대상: {config['base_url']} ({config['model']})")
+    print(f"요청: {config['requests']}개, 동시 요청: {config['concurrency']}개")
+    print(f"성공: {summary['succeeded']}개, 실패: {summary['failed']}개 "
+          f"(소요 시간 {summary['wall_time']:.2f}초)")
+
+    for label, key in (("전체 지연", 'latency'), ("첫 토큰(TTFT)", 'ttft')):
+        stats = summary[key]
+        if stats:
+            print(f"{label}: p50 {stats['p50'] * 1000:.0f}ms / p95 {stats['p95'] * 1000:.0f}ms / "
+                  f"p99 {stats['p99'] * 1000:.0f}ms")
+    if summary['succeeded']:
+        print(f"처리량: {summary['requests_per_second']:.2f} 요청/초, "
+              f"{summary['tokens_per_second']:.1f} 토큰/초")
+    if summary['per_request_tokens_per_second']:
+        print(f"요청별 생성 속도: 평균 {summary['per_request_tokens_per_second']:.1f} 토큰/초")
+    if summary['errors']:
+        breakdown = ', '.join(f"{code}: {count}개" for code, count in sorted(summary['errors'].items()))
+        print(f"❌ 오류: {breakdown}")
+    print("="*60 + "\n")
+
+
+def probe_main(args):
+    """--probe 모드: 실제 API나 로컬 스텁 서버를 대상으로 부하를 측정합니다."""
+    server = None
+    api_key = None
+    base_url = args.base_url
+    if args.stub:
+        import gemini_stub
+
+        server, base_url = gemini_stub.start_stub_server(error_rate=args.stub_error_rate)
+        print(f"🧪 로컬 스텁 서버 사용: {base_url}")
+    elif base_url == GEMINI_API_BASE:
+        load_dotenv()
+        api_key = os.getenv('GEMINI_API_KEY')
+        if not api_key or api_key == "your_api_key_here":
+            print("❌ GEMINI_API_KEY가 설정되지 않아 측정할 수 없습니다. (--stub 으로 로컬 측정 가능)")
+            return False
+
+    print(f"🚀 {args.requests}개 요청 전송 중 (동시 {args.concurrency}개)...")
+    try:
+        report = run_probe(base_url, args.model, api_key, args.requests, args.concurrency,
+                           args.prompt, args.max_tokens, args.timeout)
+    finally:
+        if server:
+            server.shutdown()
+
+    print_probe_report(report)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✓ 측정 결과 저장: {args.output}")
+    return report['summary']['succeeded'] > 0
+
+
 def main():
     """메인 테스트 함수"""
+    parser = argparse.ArgumentParser(description="Gemini API 설정 테스트")
+    parser.add_argument('--probe', action='store_true', help="지연 시간/처리량 측정 모드")
+    parser.add_argument('-n', '--requests', type=int, default=20, help="보낼 요청 수 (기본: 20)")
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help="동시 요청 수 (기본: 4)")
+    parser.add_argument('--model', default=PROBE_MODEL)
+    parser.add_argument('--prompt', default=PROBE_PROMPT)
+    parser.add_argument('--max-tokens', type=int, default=256)
+    parser.add_argument('--timeout', type=float, default=60, help="요청별 타임아웃(초)")
+    parser.add_argument('--base-url', default=GEMINI_API_BASE,
+                        help="API 기본 URL (예: 스텁 서버 http://127.0.0.1:8765/v1beta)")
+    parser.add_argument('--stub', action='store_true', help="내장 스텁 서버를 띄워 로컬에서 측정")
+    parser.add_argument('--stub-error-rate', type=float, default=0.0, help="스텁 서버의 오류 비율 (0~1)")
+    parser.add_argument('-o', '--output', default=PROBE_OUTPUT, help=f"결과 JSON 경로 (기본: {PROBE_OUTPUT})")
+    args = parser.parse_args()
+
+    if args.probe:
+        probe_main(args)
+        return
+    
     print("\n" + "="*60)
     print("🧪 Gemini API 설정 테스트")
     print("="*60)
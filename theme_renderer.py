@@ -0,0 +1,176 @@
+"""
+design_theme 기반 글라스모피즘 배경/플레이스홀더 이미지 렌더러
+그라데이션, 블러, 노이즈를 모두 NumPy 벡터 연산으로 처리하며
+결과 이미지는 테마 색상과 크기별로 메모이즈됩니다.
+"""
+
+import io
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_THEME = {
+    'primary_color': '#667eea',
+    'secondary_color': '#764ba2',
+    'accent_color': '#f093fb',
+    'style': 'glassmorphism',
+}
+
+# 96 DPI 기준 10 x 7.5 인치 슬라이드
+SLIDE_SIZE = (960, 720)
+PLACEHOLDER_SIZE = (864, 648)
+IMAGE_QUALITY = 90
+NOISE_TILE = 256
+
+# 레이아웃별 유리 패널 위치 (슬라이드 크기 대비 비율: left, top, right, bottom)
+PANEL_BOXES = {
+    'title': (0.08, 0.30, 0.92, 0.64),
+    'content': (0.51, 0.18, 0.96, 0.82),
+}
+
+
+def hex_to_rgb(value):
+    """'#667eea' 형식의 색상을 (R, G, B) 튜플로 변환합니다."""
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def theme_colors(design_theme):
+    """design_theme에서 (primary, secondary, accent) 색상을 꺼냅니다. 빠진 값은 기본 테마로 채웁니다."""
+    theme = {**DEFAULT_THEME, **(design_theme or {})}
+    return tuple(hex_to_rgb(theme[k]) for k in ('primary_color', 'secondary_color', 'accent_color'))
+
+
+def _diagonal_gradient(width, height, stops):
+    """좌상단에서 우하단으로 흐르는 다중 색상 그라데이션을 만듭니다."""
+    # 대각선 방향 색상은 x + y 에만 의존하므로 1차원 색상표를 만든 뒤 인덱싱
+    diagonal = np.linspace(0.0, 1.0, width + height - 1, dtype=np.float32)
+    positions = [p for p, _ in stops]
+    lut = np.stack([np.interp(diagonal, positions, [color[c] for _, color in stops])
+                    for c in range(3)], axis=-1).astype(np.float32)
+    index = np.arange(height)[:, None] + np.arange(width)[None, :]
+    return lut[index]
+
+
+def _add_glow(image, center, radius, color, strength):
+    """가우시안 형태의 부드러운 빛 번짐을 더합니다."""
+    height, width, _ = image.shape
+    y = np.arange(height, dtype=np.float32)[:, None] - center[1] * height
+    x = np.arange(width, dtype=np.float32)[None, :] - center[0] * width
+    r = radius * max(width, height)
+    # exp(-(x²+y²)) = exp(-x²)·exp(-y²) 이므로 두 1차원 벡터의 외적으로 계산
+    alpha = (strength * np.exp(-(y * y) / (r * r)) * np.exp(-(x * x) / (r * r)))[..., None]
+    image += alpha * (np.asarray(color, dtype=np.float32) - image)
+
+
+def _blur_axis(image, radius, axis):
+    """누적합으로 한 축 방향 박스 블러를 계산합니다 (반경과 무관하게 O(N))."""
+    pad = [(0, 0)] * image.ndim
+    pad[axis] = (radius + 1, radius)
+    summed = np.cumsum(np.pad(image, pad, mode='edge'), axis=axis, dtype=np.float32)
+
+    n = image.shape[axis]
+    upper = [slice(None)] * image.ndim
+    lower = [slice(None)] * image.ndim
+    upper[axis] = slice(2 * radius + 1, 2 * radius + 1 + n)
+    lower[axis] = slice(0, n)
+    return (summed[tuple(upper)] - summed[tuple(lower)]) / (2 * radius + 1)
+
+
+def box_blur(image, radius, passes=3):
+    """분리형 박스 블러를 여러 번 적용해 가우시안 블러에 근사합니다."""
+    if radius < 1:
+        return image
+    for _ in range(passes):
+        image = _blur_axis(image, radius, 0)
+        image = _blur_axis(image, radius, 1)
+    return image
+
+
+def _rounded_box_sdf(height, width, radius):
+    """둥근 사각형에 대한 부호 있는 거리장(내부 음수)을 계산합니다."""
+    y = np.arange(height, dtype=np.float32)[:, None] + 0.5 - height / 2
+    x = np.arange(width, dtype=np.float32)[None, :] + 0.5 - width / 2
+    qx = np.abs(x) - (width / 2 - radius)
+    qy = np.abs(y) - (height / 2 - radius)
+    outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+    inside = np.minimum(np.maximum(qx, qy), 0)
+    return outside + inside - radius
+
+
+def _frosted_panel(image, box, opacity=0.35):
+    """지정 영역을 흐리게 하고 밝게 덮어 반투명 유리 패널을 만듭니다."""
+    height, width, _ = image.shape
+    x0, y0 = int(box[0] * width), int(box[1] * height)
+    x1, y1 = int(box[2] * width), int(box[3] * height)
+    region = image[y0:y1, x0:x1]
+    panel_h, panel_w, _ = region.shape
+
+    scale = min(width, height)
+    frosted = box_blur(region, max(1, scale // 40))
+    frosted = frosted * (1.0 - opacity) + 255.0 * opacity
+
+    sdf = _rounded_box_sdf(panel_h, panel_w, scale * 0.04)
+    mask = np.clip(0.5 - sdf, 0.0, 1.0)[..., None]
+    border_width = max(1.0, scale * 0.004)
+    border = (np.clip(1.0 - np.abs(sdf + border_width) / border_width, 0.0, 1.0) * 0.6)[..., None]
+
+    frosted = frosted * (1.0 - border) + 255.0 * border
+    image[y0:y1, x0:x1] = region * (1.0 - mask) + frosted * mask
+
+
+def _add_noise(image, amount, seed):
+    """무채색 그레인 노이즈를 더해 유리 질감을 표현합니다."""
+    rng = np.random.default_rng(seed)
+    height, width, _ = image.shape
+    # 작은 노이즈 타일을 반복해 난수 생성 비용을 줄임 (그레인 크기에서는 반복이 보이지 않음)
+    tile = rng.standard_normal(size=(NOISE_TILE, NOISE_TILE, 1), dtype=np.float32) * amount
+    reps = (-(-height // NOISE_TILE), -(-width // NOISE_TILE), 1)
+    image += np.tile(tile, reps)[:height, :width]
+
+
+def _encode_jpeg(image):
+    # 그레인이 섞인 그라데이션은 PNG보다 JPEG가 인코딩이 훨씬 빠르고 작음
+    pixels = np.clip(image, 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, 'RGB').save(buffer, format='JPEG', quality=IMAGE_QUALITY)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=64)
+def _render_background(colors, width, height, layout):
+    primary, secondary, accent = colors
+    # 텍스트 가독성을 위해 배경은 흰색 쪽으로 밝게 섞은 파스텔 톤 사용
+    pastel = [tuple(c + (255 - c) * 0.78 for c in color) for color in (primary, secondary, accent)]
+    image = _diagonal_gradient(width, height, [(0.0, pastel[0]), (0.55, pastel[1]), (1.0, pastel[2])])
+    _add_glow(image, (0.12, 0.85), 0.35, accent, 0.25)
+    _add_glow(image, (0.9, 0.1), 0.3, primary, 0.2)
+    _frosted_panel(image, PANEL_BOXES[layout], opacity=0.45)
+    _add_noise(image, 2.0, seed=height * width)
+    return _encode_jpeg(image)
+
+
+@lru_cache(maxsize=64)
+def _render_placeholder(colors, width, height, seed):
+    primary, secondary, accent = colors
+    image = _diagonal_gradient(width, height, [(0.0, primary), (0.6, secondary), (1.0, accent)])
+    rng = np.random.default_rng(seed)
+    for color in (accent, primary, (255, 255, 255)):
+        center = rng.uniform(0.15, 0.85, size=2)
+        _add_glow(image, center, rng.uniform(0.15, 0.3), color, 0.45)
+    _frosted_panel(image, (0.15, 0.2, 0.85, 0.8), opacity=0.25)
+    _add_noise(image, 3.0, seed=seed)
+    return _encode_jpeg(image)
+
+
+def render_background(design_theme=None, size=SLIDE_SIZE, layout='content'):
+    """슬라이드 전체 배경 JPEG 바이트를 반환합니다 (테마·크기·레이아웃별 메모이즈)."""
+    return _render_background(theme_colors(design_theme), size[0], size[1], layout)
+
+
+def render_placeholder(design_theme=None, size=PLACEHOLDER_SIZE, seed=0):
+    """이미지가 없는 슬라이드에 넣을 플레이스홀더 JPEG 바이트를 반환합니다."""
+    return _render_placeholder(theme_colors(design_theme), size[0], size[1], seed)
@@ -0,0 +1,282 @@
+"""
+이전에 생성한 주제와 슬라이드 제목의 유사도 색인
+문자 n-gram의 MinHash 서명과 LSH 버킷으로 비슷한 주제를 빠르게 찾습니다.
+띄어쓰기와 조사가 달라도 음절 단위 n-gram이 겹치므로 한국어 주제에도 잘 동작합니다.
+예: "트랜스포머와 GPT" ↔ "어텐션과 트랜스포머, 그리고 GPT"
+라틴 문자와 숫자는 대소문자를 무시한 단어 단위로 비교하므로 "GPT"와 "gpt"는 같고,
+"GPT"가 "GPT4"의 일부로 일치하지는 않습니다. 표기가 다른 외래어("Transformer" ↔ "트랜스포머")는
+같은 단어로 보지 않습니다.
+
+SIMILARITY_THRESHOLD는 CALIBRATION_PAIRS(같은 덱을 원할 주제 쌍과 아닌 쌍)로 정했습니다.
+비슷한 덱을 찾으면 재사용할지 묻기만 하므로(Enter로 건너뜀), 오탐보다 놓치는 쪽(전체 생성)이
+비싸다고 보고, 외래어 표기만 다른 쌍을 빼면 같은 주제 쌍을 모두 찾는 가장 높은 값을 씁니다. 확인: python topic_index.py --calibrate
+
+색인은 .cache/topic_index.json에 저장되며, 덱마다 원본 JSON 경로와 주제, 슬라이드 제목을 기록합니다.
+사용 예:
+    python topic_index.py "트랜스포머와 GPT"      # 비슷한 덱 검색
+    python topic_index.py --rebuild              # slides_*.json으로 색인 다시 만들기
+    python topic_index.py --calibrate            # 기준 주제 쌍으로 임계값별 재현율/오탐 확인
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+INDEX_FILE = os.path.join('.cache', 'topic_index.json')
+INDEX_VERSION = 2  # shingle 방식이 바뀌면 올림 (이전 버전의 서명은 불러올 때 다시 계산)
+NGRAM_SIZES = (2, 3)
+NUM_PERM = 64
+LSH_ROWS = 2  # 밴드당 행 수: 32개 밴드 × 2행이면 자카드 유사도 0.25에서 후보에 들 확률이 약 87%, 0.3에서 약 95%
+LSH_BANDS = NUM_PERM // LSH_ROWS
+SIMILARITY_THRESHOLD = 0.25
+
+# 임계값을 정하는 데 쓴 기준 주제 쌍: (같은 덱을 재사용할 만한지, 주제 A, 주제 B)
+CALIBRATION_PAIRS = [
+    (True, "트랜스포머와 GPT", "어텐션과 트랜스포머, 그리고 GPT"),
+    (True, "Transformer와 GPT", "GPT와 transformer 아키텍처"),
+    (True, "기후 변화의 원인과 영향", "기후변화 원인 분석"),
+    (True, "양자 컴퓨팅 입문", "양자컴퓨팅 기초 입문"),
+    (True, "딥러닝 기초", "딥러닝의 기초 개념"),
+    (True, "React 상태 관리", "react의 상태관리 패턴"),
+    (True, "블록체인 기술의 이해", "블록체인 기술 이해하기"),
+    (True, "강화학습과 알파고", "알파고로 보는 강화학습"),
+    (True, "Kubernetes 입문", "쿠버네티스(Kubernetes) 입문 가이드"),
+    (True, "파이썬 데이터 분석", "Python 데이터 분석 입문"),
+    (True, "Transformer와 GPT", "어텐션과 트랜스포머, 그리고 GPT"),  # 외래어 표기가 달라 찾지 못함
+    (False, "트랜스포머와 GPT", "트랜스 지방과 건강"),
+    (False, "기후 변화의 원인과 영향", "경제 변화의 원인"),
+    (False, "딥러닝 기초", "회계 기초"),
+    (False, "양자 컴퓨팅 입문", "클라우드 컴퓨팅 입문"),
+    (False, "블록체인 기술의 이해", "인공지능 기술의 이해"),
+    (False, "GPT와 BERT 비교", "GPT로 이메일 쓰기"),
+    (False, "React 상태 관리", "Vue 상태 관리"),
+    (False, "한국 근대사", "한국 현대 미술"),
+    (False, "Transformer와 GPT", "Transformer 회로 설계"),
+]
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240101)  # 색인 파일의 서명과 호환되도록 고정 시드 사용
+_PERM_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+# 배치 실행에서 여러 작업이 동시에 색인 파일을 갱신하지 않도록 보호
+_index_lock = threading.Lock()
+
+
+_LATIN_WORD = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """소문자로 바꾸고 글자·숫자만 남깁니다 (띄어쓰기, 문장 부호, 마크다운 제거)."""
+    return ''.join(c for c in text.lower() if c.isalnum())
+
+
+def _ngrams(text):
+    return {text[i:i + n] for n in NGRAM_SIZES for i in range(len(text) - n + 1)}
+
+
+def shingles(text):
+    """텍스트의 shingle 집합
+
+    라틴 문자·숫자 단어는 단어 전체로만 일치하되, 한글 부분에 묻히지 않도록 같은 길이의 한글이
+    만들 n-gram 수만큼의 shingle로 셉니다. 나머지(한글 등)는 띄어쓰기를 없앤 음절 n-gram입니다.
+    """
+    text = text.lower()
+    grams = set()
+    for word in _LATIN_WORD.findall(text):
+        weight = max(1, len(_ngrams(word)))
+        grams.update(f'{word}#{i}' for i in range(weight))
+    for segment in _LATIN_WORD.split(text):
+        grams |= _ngrams(normalize(segment))
+    text = normalize(text)
+    return grams or ({text} if text else set())
+
+
+def jaccard(text_a, text_b):
+    """두 텍스트의 shingle 자카드 유사도 (MinHash가 추정하는 값)"""
+    a, b = shingles(text_a), shingles(text_b)
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def calibrate(pairs=CALIBRATION_PAIRS, thresholds=None):
+    """기준 주제 쌍으로 임계값별 [(임계값, 찾은 같은 주제 쌍 수, 오탐 수)]를 계산합니다."""
+    scores = [(same, jaccard(a, b)) for same, a, b in pairs]
+    thresholds = thresholds or [t / 100 for t in range(10, 55, 5)]
+    return [(t, sum(1 for same, score in scores if same and score >= t),
+             sum(1 for same, score in scores if not same and score >= t)) for t in thresholds]
+
+
+def signature(text):
+    """MinHash 서명 (NUM_PERM개의 정수)"""
+    grams = shingles(text)
+    if not grams:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(g.encode('utf-8')) & _PRIME for g in grams),
+                         dtype=np.uint64, count=len(grams))
+    # (a·x + b) mod p 를 모든 해시 함수에 대해 한 번에 계산하고 n-gram 축으로 최솟값
+    return ((hashes[:, None] * _PERM_A + _PERM_B) % _PRIME).min(axis=0)
+
+
+def similarity(sig_a, sig_b):
+    """두 서명이 일치하는 비율 (자카드 유사도 추정치)"""
+    return float(np.mean(np.asarray(sig_a) == np.asarray(sig_b)))
+
+
+def _band_keys(sig):
+    sig = np.asarray(sig, dtype=np.uint64)
+    return [(band, sig[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()) for band in range(LSH_BANDS)]
+
+
+class TopicIndex:
+    """덱 주제와 슬라이드 제목에 대한 MinHash/LSH 색인"""
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.decks = {}
+        self._items = []  # (덱 경로, 종류, 텍스트, 서명)
+        self._buckets = {}
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        current = data.get('version') == INDEX_VERSION
+        for deck_path, deck in data.get('decks', {}).items():
+            self._add(deck_path, deck, deck.get('signatures') if current else None)
+
+    def _add(self, deck_path, deck, signatures=None):
+        texts = [('topic', deck['topic'])] + [('slide', title) for title in deck['titles']]
+        if signatures is None or len(signatures) != len(texts):
+            signatures = [signature(text).tolist() for _, text in texts]
+        self.decks[deck_path] = {**deck, 'signatures': signatures}
+        for (kind, text), sig in zip(texts, signatures):
+            item_id = len(self._items)
+            self._items.append((deck_path, kind, text, sig))
+            for key in _band_keys(sig):
+                self._buckets.setdefault(key, []).append(item_id)
+
+    def _rebuild_buckets(self):
+        decks = self.decks
+        self.decks, self._items, self._buckets = {}, [], {}
+        for deck_path, deck in decks.items():
+            self._add(deck_path, deck, deck.get('signatures'))
+
+    def add_deck(self, slides_data, deck_path):
+        """생성된 덱을 색인에 추가합니다. 같은 경로의 기존 항목은 교체합니다."""
+        deck = {
+            'topic': slides_data.get('topic', ''),
+            'titles': [slide.get('title', '') for slide in slides_data.get('slides', [])],
+            'added_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        if deck_path in self.decks:
+            del self.decks[deck_path]
+            self._rebuild_buckets()
+        self._add(deck_path, deck)
+
+    def query(self, text, threshold=SIMILARITY_THRESHOLD, limit=5):
+        """text와 비슷한 주제나 슬라이드 제목을 가진 덱을 유사도 순으로 반환합니다.
+
+        반환 항목: {'deck': 경로, 'topic', 'score', 'matched': 가장 비슷한 주제/제목, 'kind'}
+        """
+        sig = signature(text)
+        candidates = set()
+        for key in _band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+
+        best = {}
+        for item_id in candidates:
+            deck_path, kind, item_text, item_sig = self._items[item_id]
+            score = similarity(sig, item_sig)
+            if score >= threshold and score > best.get(deck_path, {}).get('score', -1):
+                best[deck_path] = {'deck': deck_path, 'topic': self.decks[deck_path]['topic'],
+                                   'score': score, 'matched': item_text, 'kind': kind}
+        return sorted(best.values(), key=lambda m: m['score'], reverse=True)[:limit]
+
+    def similar_slides(self, deck_path, text):
+        """덱의 슬라이드별로 text와의 유사도를 반환합니다 [(슬라이드 번호, 제목, 유사도)]."""
+        sig = signature(text)
+        deck = self.decks[deck_path]
+        return [(i, title, similarity(sig, slide_sig))
+                for i, (title, slide_sig) in enumerate(zip(deck['titles'], deck['signatures'][1:]), 1)]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'decks': self.decks}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def register_deck(slides_data, deck_path, index_path=INDEX_FILE):
+    """생성이 끝난 덱을 색인에 추가하고 저장합니다. 실패해도 생성 흐름은 계속됩니다."""
+    try:
+        with _index_lock:
+            index = TopicIndex(index_path)
+            index.add_deck(slides_data, deck_path)
+            index.save()
+    except Exception as e:
+        print(f"  ⚠ 주제 색인 갱신 실패: {e}")
+
+
+def rebuild_index(pattern='slides_*.json', index_path=INDEX_FILE):
+    """작업 디렉토리의 slides_*.json 파일로 색인을 새로 만듭니다."""
+    index = TopicIndex(None)
+    index.path = index_path
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                slides_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if slides_data.get('slides'):
+            index.add_deck(slides_data, path)
+    index.save()
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이전에 생성한 덱에서 비슷한 주제 검색")
+    parser.add_argument('query', nargs='?', help="검색할 주제")
+    parser.add_argument('--rebuild', action='store_true', help="slides_*.json 파일로 색인 다시 만들기")
+    parser.add_argument('--threshold', type=float, default=SIMILARITY_THRESHOLD)
+    parser.add_argument('--calibrate', action='store_true', help="기준 주제 쌍으로 임계값별 재현율/오탐 출력")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        same = sum(1 for label, _, _ in CALIBRATION_PAIRS if label)
+        different = len(CALIBRATION_PAIRS) - same
+        for same_pairs, a, b in CALIBRATION_PAIRS:
+            print(f"{'같음' if same_pairs else '다름'}  {jaccard(a, b):.2f}  {a} ↔ {b}")
+        print()
+        for threshold, found, false_hits in calibrate():
+            mark = '  ← 현재 기본값' if abs(threshold - SIMILARITY_THRESHOLD) < 1e-9 else ''
+            print(f"임계값 {threshold:.2f}: 같은 주제 {found}/{same}쌍, 오탐 {false_hits}/{different}쌍{mark}")
+        return
+
+    if args.rebuild:
+        index = rebuild_index()
+        print(f"✓ 주제 색인 재생성 완료: 덱 {len(index.decks)}개 → {index.path}")
+    else:
+        index = TopicIndex()
+    if args.query:
+        matches = index.query(args.query, args.threshold)
+        if not matches:
+            print("비슷한 주제의 덱이 없습니다.")
+        for m in matches:
+            print(f"{m['score']:.2f}  {m['topic']}  ({m['deck']}, 일치: {m['matched']})")
+
+
+if __name__ == '__main__':
+    main()